@@ -1,14 +1,103 @@
-"""``on_startup`` function will be called when server trying to start."""
+"""``on_startup`` function will be called when server trying to start.
 
+``on_shutdown`` function will be called when server is stopping.
+"""
 
-async def on_startup():
+from dependency_injector.wiring import Provide, inject
+
+from app.internal.pkg.middlewares.metrics import mark_process_dead
+from app.internal.pkg.password.hasher import PasswordHasher
+from app.internal.repository.cached import CachedUserRepository
+from app.internal.repository.postgresql.invalidation import InvalidationBus
+from app.internal.repository.postgresql.role_cache import RoleCache
+from app.internal.services import Services
+from app.internal.services.session_reaper import SessionReaper
+from app.pkg.connectors import Connectors
+from app.pkg.connectors.http_request import HttpRequests
+from app.pkg.connectors.postgresql import Postgresql
+from app.pkg.jwt import access_security, refresh_security
+from app.pkg.settings import settings
+from app.pkg.tracing import shutdown_tracing
+
+__all__ = ["on_startup", "on_shutdown"]
+
+
+@inject
+async def on_startup(
+    postgresql: Postgresql = Provide[Connectors.postgresql],
+    session_reaper: SessionReaper = Provide[Services.session_reaper],
+    role_cache: RoleCache = Provide[Services.repositories.role_cache],
+    invalidation_bus: InvalidationBus = Provide[Services.repositories.invalidation_bus],
+    user_repository: CachedUserRepository = Provide[Services.user_repository],
+):
     """Run code on server startup.
 
     Warnings:
         **Don't use this function for insert default data in database.
         For this action we have scripts/migrate.py.**
 
+    Args:
+        postgresql: Shared postgresql connector.
+        session_reaper: Background maintenance of refresh tokens.
+        role_cache: Map of ``user_roles`` shared by user repositories.
+        invalidation_bus: Listener of changes made by other workers.
+        user_repository: Repository with in-process cache of users.
+
+    Returns:
+        None
+    """
+    await postgresql.create_pool()
+    await role_cache.load()
+    await session_reaper.ensure_partitions()
+    session_reaper.start()
+    if settings.CACHE_INVALIDATION_ENABLED:
+        _subscribe(invalidation_bus, role_cache, user_repository)
+        invalidation_bus.start()
+
+
+@inject
+async def on_shutdown(
+    postgresql: Postgresql = Provide[Connectors.postgresql],
+    password_hasher: PasswordHasher = Provide[Services.password_hasher],
+    session_reaper: SessionReaper = Provide[Services.session_reaper],
+    invalidation_bus: InvalidationBus = Provide[Services.repositories.invalidation_bus],
+):
+    """Run code on server shutdown.
+
+    Args:
+        postgresql: Shared postgresql connector.
+        password_hasher: Shared executor of bcrypt.
+        session_reaper: Background deletion of expired refresh tokens.
+        invalidation_bus: Listener of changes made by other workers.
+
     Returns:
         None
     """
-    pass
+    await invalidation_bus.stop()
+    await session_reaper.stop()
+    password_hasher.shutdown()
+    await HttpRequests.close_all()
+    await postgresql.close_pool()
+    mark_process_dead()
+    shutdown_tracing()
+
+
+def _subscribe(
+    invalidation_bus: InvalidationBus,
+    role_cache: RoleCache,
+    user_repository: CachedUserRepository,
+) -> None:
+    """Evict in-process caches by messages of ``invalidation_bus``."""
+
+    def evict_tokens(digests):
+        for security in (access_security, refresh_security):
+            if (cache := security.verified_cache) is None:
+                continue
+            if digests is None:
+                cache.clear()
+            for digest in digests or ():
+                cache.evict(digest)
+
+    invalidation_bus.subscribe("user", user_repository.evict_local)
+    invalidation_bus.subscribe("role", lambda keys: role_cache.invalidate())
+    invalidation_bus.subscribe("token", evict_tokens)
@@ -4,13 +4,16 @@ from typing import TypeVar
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette_prometheus import PrometheusMiddleware, metrics
 
 from app.internal.pkg.middlewares.handle_http_exceptions import handle_api_exceptions
+from app.internal.pkg.middlewares.metrics import MetricsMiddleware, metrics
+from app.internal.pkg.middlewares.timing import TimingMiddleware
 from app.internal.routes import __routes__
 from app.pkg.models.base import BaseException
+from app.pkg.settings import settings
+from app.pkg.tracing import configure_tracing, get_exporter
 
-from .events import on_startup
+from .events import on_shutdown, on_startup
 from .logger import EndpointFilter
 
 __all__ = ["Server"]
@@ -31,6 +34,7 @@ class Server:
         self._register_middlewares(app)
         self._register_http_exceptions(app)
         self._register_jwt(app)
+        self._register_tracing()
 
     def get_app(self) -> FastAPIInstance:
         """Get current application instance.
@@ -41,7 +45,7 @@ class Server:
 
     @staticmethod
     def _register_events(app: FastAPIInstance):
-        """Register on startup events.
+        """Register on startup and on shutdown events.
 
         Args:
             app: ``FastAPI`` application instance.
@@ -50,6 +54,7 @@ class Server:
         """
 
         app.on_event("startup")(on_startup)
+        app.on_event("shutdown")(on_shutdown)
 
     @staticmethod
     def _register_routes(app: FastAPIInstance) -> None:
@@ -104,10 +109,19 @@ class Server:
         """Register prometheus middleware."""
 
         metrics_endpoint = "/metrics"
-        app.add_middleware(PrometheusMiddleware)
+        app.add_middleware(MetricsMiddleware)
         app.add_route(metrics_endpoint, metrics)
         self.__filter_logs(metrics_endpoint)
 
+    @staticmethod
+    def __register_timing(app: FastAPIInstance):
+        """Register breakdown of request latency by phases."""
+
+        app.add_middleware(
+            TimingMiddleware,
+            server_timing_header=settings.SERVER_TIMING_HEADER,
+        )
+
     @staticmethod
     def _register_jwt(app: FastAPIInstance):
         """Register jwt handler to fast api context.
@@ -127,10 +141,25 @@ class Server:
         )
         app.jwt = jwt
 
+    @staticmethod
+    def _register_tracing():
+        """Register exporter of spans of routes, services and repositories.
+
+        Returns: None
+        """
+        configure_tracing(
+            get_exporter(
+                settings.TRACING_EXPORTER,
+                file_path=settings.TRACING_FILE_PATH,
+                service_name=settings.TRACING_SERVICE_NAME,
+            ),
+        )
+
     def _register_middlewares(self, app):
         """Apply routes middlewares."""
 
         self.__register_cors_origins(app)
+        self.__register_timing(app)
         self.__register_prometheus(app)
 
     @staticmethod
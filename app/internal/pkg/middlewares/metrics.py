@@ -0,0 +1,214 @@
+"""HTTP metrics by route template, merged over all workers of the server.
+
+Metrics keep names and labels of ``starlette_prometheus``, so dashboards
+work unchanged, but paths that match no route are labelled ``<unmatched>``
+instead of the raw path, so scans of random urls don't create new series.
+
+Several workers report to one scrape in multiprocess mode of
+``prometheus_client``. It is enabled by ``PROMETHEUS_MULTIPROC_DIR`` env
+variable, which must point to an empty directory before workers start::
+
+    rm -rf /tmp/metrics && mkdir /tmp/metrics
+    PROMETHEUS_MULTIPROC_DIR=/tmp/metrics uvicorn app:create_app --workers 4
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+__all__ = ["MetricsMiddleware", "mark_process_dead", "metrics"]
+
+#: Label of requests which match no route.
+UNMATCHED = "<unmatched>"
+
+#: Methods labelled as is, the rest are labelled ``OTHER``.
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+_requests = Counter(
+    "starlette_requests_total",
+    "Total count of requests by method and path.",
+    ["method", "path_template"],
+)
+_responses = Counter(
+    "starlette_responses_total",
+    "Total count of responses by method, path and status codes.",
+    ["method", "path_template", "status_code"],
+)
+_processing_time = Histogram(
+    "starlette_requests_processing_time_seconds",
+    "Histogram of requests processing time by path (in seconds)",
+    ["method", "path_template"],
+)
+_exceptions = Counter(
+    "starlette_exceptions_total",
+    "Total count of exceptions raised by path and exception type",
+    ["method", "path_template", "exception_type"],
+)
+_in_progress = Gauge(
+    "starlette_requests_in_progress",
+    "Gauge of requests by method and path currently being processed",
+    ["method", "path_template"],
+    multiprocess_mode="livesum",
+)
+
+
+class _RouteMetrics:
+    """Label children of one method and route, created once."""
+
+    __slots__ = (
+        "method",
+        "path_template",
+        "requests",
+        "processing_time",
+        "in_progress",
+        "responses",
+    )
+
+    def __init__(self, method: str, path_template: str):
+        self.method = method
+        self.path_template = path_template
+        self.requests = _requests.labels(method, path_template)
+        self.processing_time = _processing_time.labels(method, path_template)
+        self.in_progress = _in_progress.labels(method, path_template)
+        self.responses: Dict[int, Counter] = {}
+
+    def response(self, status_code: int) -> Counter:
+        if (child := self.responses.get(status_code)) is None:
+            child = _responses.labels(self.method, self.path_template, str(status_code))
+            self.responses[status_code] = child
+        return child
+
+
+class _RouteTemplates:
+    """Find template of route matching a path, like the router does.
+
+    Paths of routes without parameters are looked up in a dict, only the
+    rest are matched by regex.
+    """
+
+    def __init__(self, routes: List[BaseRoute]):
+        self.static: Dict[str, str] = {}
+        self.dynamic: List[Tuple[Pattern, str]] = []
+        for route in routes:
+            regex: Optional[Pattern] = getattr(route, "path_regex", None)
+            path: Optional[str] = getattr(route, "path", None)
+            if regex is None or path is None:
+                continue
+            if regex.groups:
+                self.dynamic.append((regex, path))
+            elif not any(earlier.match(path) for earlier, _ in self.dynamic):
+                # A path caught by an earlier route never reaches this one.
+                self.static.setdefault(path, path)
+
+    def match(self, path: str) -> str:
+        if (template := self.static.get(path)) is not None:
+            return template
+        for regex, template in self.dynamic:
+            if regex.match(path):
+                return template
+        return UNMATCHED
+
+
+class MetricsMiddleware:
+    """Pure ASGI replacement of ``starlette_prometheus.PrometheusMiddleware``.
+
+    Routes of application are indexed on the first request, when label
+    children of all their methods are created. So a request costs a couple of
+    dict lookups, a few counter increments and one histogram observation.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.__templates: Optional[_RouteTemplates] = None
+        self.__metrics: Dict[Tuple[str, str], _RouteMetrics] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self.__route_metrics(scope)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        route.requests.inc()
+        route.in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as e:
+            _exceptions.labels(
+                route.method,
+                route.path_template,
+                type(e).__name__,
+            ).inc()
+            raise
+        else:
+            route.processing_time.observe(time.perf_counter() - started_at)
+        finally:
+            route.response(status_code).inc()
+            route.in_progress.dec()
+
+    def __route_metrics(self, scope: Scope) -> _RouteMetrics:
+        if self.__templates is None:
+            self.__index(scope["app"].routes)
+
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        path_template = self.__templates.match(scope["path"])
+        key = (method, path_template)
+        if (route := self.__metrics.get(key)) is None:
+            route = self.__metrics[key] = _RouteMetrics(method, path_template)
+        return route
+
+    def __index(self, routes: List[BaseRoute]) -> None:
+        """Index templates and create children of every route and its methods."""
+        self.__templates = _RouteTemplates(routes)
+        for route in routes:
+            path_template = getattr(route, "path", None)
+            for method in getattr(route, "methods", None) or ():
+                if path_template is not None and method in METHODS:
+                    key = (method, path_template)
+                    self.__metrics[key] = _RouteMetrics(method, path_template)
+
+
+def _multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get(
+        "prometheus_multiproc_dir",
+    )
+
+
+def metrics(request: Request) -> Response:
+    """Metrics of all workers in multiprocess mode, of this process otherwise."""
+    _ = request
+
+    registry = REGISTRY
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead() -> None:
+    """Drop live gauges of this worker from multiprocess metrics on shutdown."""
+    if _multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,140 @@
+"""Breakdown of request latency by phases.
+
+``TimingMiddleware`` starts ``RequestTimings`` of every request and reports
+them to ``http_request_phase_seconds`` histogram by route and phase. Routes
+of ``TimedRoute`` class add their path template and ``serialize`` phase:
+time from return of endpoint to the built response.
+
+Examples:
+    Phases of slow ``/auth/login`` in prometheus::
+
+        histogram_quantile(0.99, sum by (phase, le) (
+            rate(http_request_phase_seconds_bucket{route="/auth/login"}[5m])
+        ))
+
+    With ``SERVER_TIMING_HEADER`` enabled the same phases of a single request
+    are shown by browser devtools from ``Server-Timing`` header.
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Coroutine
+
+from fastapi.routing import APIRoute
+from prometheus_client import Histogram
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.pkg.timing import current_timings, record, start_timings
+from app.pkg.tracing import SpanKind, parse_traceparent, start_span
+
+__all__ = ["TimedRoute", "TimingMiddleware"]
+
+_phase_seconds = Histogram(
+    "http_request_phase_seconds",
+    "Time of request spent in each phase by route.",
+    ["route", "method", "phase"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware, so timings live in the context of endpoint."""
+
+    def __init__(self, app: ASGIApp, server_timing_header: bool = False):
+        """
+        Args:
+            app: Wrapped application.
+            server_timing_header: Add ``Server-Timing`` header to responses.
+        """
+        self.app = app
+        self.server_timing_header = server_timing_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_timings()
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", timings.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(
+                scope,
+                receive,
+                send_with_header if self.server_timing_header else send,
+            )
+        finally:
+            route = timings.route or "unmatched"
+            method = scope["method"]
+            for phase, seconds in timings.items():
+                _phase_seconds.labels(route=route, method=method, phase=phase).observe(
+                    seconds,
+                )
+            _phase_seconds.labels(route=route, method=method, phase="total").observe(
+                timings.elapsed(),
+            )
+
+
+class TimedRoute(APIRoute):
+    """Route which reports its path and ``serialize`` phase to timings.
+
+    Each call also runs in a server span of tracing, the root of spans of
+    services and repositories, or a child of ``traceparent`` header.
+
+    Examples:
+        ::
+
+            router = APIRouter(prefix="/user", route_class=TimedRoute)
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Request handler looks ``call`` up on every request, so the end of
+        # endpoint is marked without copying the handler of fastapi.
+        if asyncio.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = _mark_endpoint_end(self.dependant.call)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        path = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            timings = current_timings()
+            if timings is not None:
+                timings.route = path
+
+            with start_span(
+                f"{request.method} {path}",
+                kind=SpanKind.SERVER,
+                attributes={"http.method": request.method, "http.route": path},
+                parent=parse_traceparent(request.headers.get("traceparent")),
+            ) as span:
+                response = await handler(request)
+                span.set_attribute("http.status_code", response.status_code)
+
+            if timings is not None and timings.endpoint_returned_at is not None:
+                record("serialize", timings.endpoint_returned_at)
+            return response
+
+        return timed_handler
+
+
+def _mark_endpoint_end(endpoint: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
+    @functools.wraps(endpoint)
+    async def inner(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            if (timings := current_timings()) is not None:
+                timings.endpoint_returned_at = time.perf_counter()
+
+    return inner
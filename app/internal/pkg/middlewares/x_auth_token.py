@@ -1,10 +1,12 @@
+import secrets
+
 from fastapi import Security
 from fastapi.security import APIKeyHeader
 
 from app.pkg.models.exceptions.x_auth_token import InvalidCredentials
 from app.pkg.settings import settings
 
-__all__ = ["get_x_token_key"]
+__all__ = ["get_x_token_key", "get_profiler_token_key"]
 
 x_api_key_header = APIKeyHeader(name="X-ACCESS-TOKEN")
 
@@ -15,3 +17,15 @@ async def get_x_token_key(
     value = settings.X_API_TOKEN.get_secret_value()
     if api_key_header != value:
         raise InvalidCredentials
+
+
+async def get_profiler_token_key(
+    api_key_header: str = Security(x_api_key_header),
+):
+    """Guard of profiler, rejects every request when ``PROFILER_X_TOKEN`` is unset."""
+    token = settings.PROFILER_X_TOKEN
+    if token is None or not secrets.compare_digest(
+        api_key_header.encode(),
+        token.get_secret_value().encode(),
+    ):
+        raise InvalidCredentials
@@ -0,0 +1,106 @@
+"""Asynchronous wrapper around ``password`` module.
+
+bcrypt is CPU bound and takes hundreds of milliseconds, so calling it inside
+a coroutine blocks the event loop. ``PasswordHasher`` runs it in a bounded pool
+of workers instead and rejects new work when the pool is saturated.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Literal, Optional, TypeVar
+
+from pydantic import SecretBytes
+
+from app.internal.pkg.password import password
+from app.pkg.models.exceptions.password import PasswordHasherUnavailable
+from app.pkg.timing import measure
+from app.pkg.tracing import traced
+
+__all__ = ["PasswordHasher"]
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Run ``crypt_password`` and ``check_password`` in a bounded executor.
+
+    Examples:
+        ::
+
+            hasher = PasswordHasher(max_workers=4, queue_size=32)
+            hashed = await hasher.crypt_password(b"strong password")
+            assert await hasher.check_password(raw, hashed)
+    """
+
+    executor_type: Literal["thread", "process"]
+    max_workers: int
+    queue_size: int
+
+    def __init__(
+        self,
+        executor_type: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        queue_size: int = 64,
+    ):
+        """
+        Args:
+            executor_type: ``thread`` or ``process`` pool. bcrypt releases the GIL,
+                so threads are enough in most cases.
+            max_workers: Max count of passwords hashed at the same time.
+            queue_size: Max count of calls waiting for a free worker. When it is
+                exceeded, ``PasswordHasherUnavailable`` is raised.
+        """
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.__executor: Optional[Executor] = None
+        self.__pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Count of calls which are running or waiting for a worker."""
+        return self.__pending
+
+    @traced
+    async def crypt_password(self, raw_password: bytes) -> bytes:
+        """Asynchronous version of ``password.crypt_password``."""
+        return await self.__submit(password.crypt_password, raw_password)
+
+    @traced
+    async def check_password(self, raw_password: SecretBytes, hashed: SecretBytes) -> bool:
+        """Asynchronous version of ``password.check_password``."""
+        return await self.__submit(password.check_password, raw_password, hashed)
+
+    def shutdown(self) -> None:
+        """Stop workers of executor."""
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+    def __get_executor(self) -> Executor:
+        if self.__executor is None:
+            if self.executor_type == "process":
+                self.__executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher",
+                )
+        return self.__executor
+
+    async def __submit(self, fn: Callable[..., T], *args: object) -> T:
+        # The executor has its own unbounded queue, so the bound is kept here.
+        if self.__pending >= self.max_workers + self.queue_size:
+            raise PasswordHasherUnavailable
+
+        self.__pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            with measure("hash"):
+                return await loop.run_in_executor(
+                    self.__get_executor(),
+                    functools.partial(fn, *args),
+                )
+        finally:
+            self.__pending -= 1
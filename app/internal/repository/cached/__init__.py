@@ -0,0 +1,5 @@
+"""Repositories which cache results of other repositories."""
+
+from .user import CachedUserRepository, SharedUser, decode_user, encode_user
+
+__all__ = ["CachedUserRepository", "SharedUser", "decode_user", "encode_user"]
@@ -0,0 +1,146 @@
+"""Read-through cache in front of ``UserRepository``."""
+
+import json
+from typing import AsyncIterator, List, Optional, Sequence
+
+from app.internal.repository.postgresql import UserRepository
+from app.internal.repository.repository import Repository
+from app.pkg import models
+from app.pkg.cache import TwoTierCache
+from app.pkg.models.types import EncryptedSecretBytes
+
+__all__ = ["CachedUserRepository", "SharedUser", "encode_user", "decode_user"]
+
+
+class SharedUser(models.User):
+    """User read from remote tier of cache, which never holds password hash."""
+
+    password: Optional[EncryptedSecretBytes] = None
+
+
+def encode_user(user: models.User) -> str:
+    """Serialize user without password hash for remote tier of cache."""
+    return json.dumps(user.to_dict(exclude={"password"}))
+
+
+def decode_user(raw: str) -> SharedUser:
+    return SharedUser.parse_raw(raw)
+
+
+class CachedUserRepository(Repository):
+    """``UserRepository`` which caches users by id.
+
+    ``usernames`` cache maps username to user id. A user found through it is
+    checked to still have this username, so renamed users are never returned
+    by their old name. ``update`` and ``delete`` evict the user, other workers
+    evict it from their in-process tier by ``evict_local``.
+
+    Password hashes are kept in the in-process tier only. Users of the remote
+    tier are ``SharedUser`` with ``password=None``: ``read`` may return them,
+    but ``read_by_username``, which serves login, reads such users again from
+    ``repository``.
+    """
+
+    repository: UserRepository
+    users: TwoTierCache
+    usernames: TwoTierCache
+
+    def __init__(
+        self,
+        repository: UserRepository,
+        users: TwoTierCache,
+        usernames: TwoTierCache,
+    ):
+        """
+        Args:
+            repository: Source of users.
+            users: Cache of ``User`` by ``str(id)``.
+            usernames: Cache of user id by username.
+        """
+        self.repository = repository
+        self.users = users
+        self.usernames = usernames
+
+    async def create(self, cmd: models.CreateUserCommand) -> models.User:
+        user = await self.repository.create(cmd=cmd)
+        await self.__remember(user)
+        return user
+
+    async def read(self, query: models.ReadUserByIdQuery) -> models.User:
+        if (user := await self.users.get(str(query.id))) is not None:
+            return user
+
+        user = await self.repository.read(query=query)
+        await self.__remember(user)
+        return user
+
+    async def read_by_username(
+        self,
+        query: models.ReadUserByUserNameQuery,
+    ) -> Optional[models.User]:
+        if (user_id := await self.usernames.get(query.username)) is not None:
+            user = await self.users.get(str(user_id))
+            if (
+                user is not None
+                and user.username == query.username
+                and user.password is not None
+            ):
+                return user
+
+        user = await self.repository.read_by_username(query=query)
+        if user is not None:
+            await self.__remember(user)
+        return user
+
+    async def read_all(self) -> List[models.User]:
+        return await self.repository.read_all()
+
+    async def read_page(self, query: models.ReadUsersPageQuery) -> List[models.User]:
+        return await self.repository.read_page(query=query)
+
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[models.User]:
+        return self.repository.stream_all(batch_size=batch_size)
+
+    async def update(self, cmd: models.UpdateUserCommand) -> models.User:
+        await self.invalidate(cmd.id)
+        user = await self.repository.update(cmd=cmd)
+        await self.invalidate(user.id, user.username)
+        return user
+
+    async def delete(self, cmd: models.DeleteUserCommand) -> models.User:
+        user = await self.repository.delete(cmd=cmd)
+        await self.invalidate(user.id, user.username)
+        return user
+
+    async def invalidate(self, user_id: int, username: Optional[str] = None) -> None:
+        """Evict user and its username from cache."""
+        usernames = [username] if username is not None else []
+        if (cached := await self.users.get(str(user_id))) is not None:
+            usernames.append(cached.username)
+
+        await self.users.delete(str(user_id))
+        if usernames:
+            await self.usernames.delete(*usernames)
+
+    def evict_local(self, keys: Optional[Sequence[str]]) -> None:
+        """Evict user from in-process tier after it was changed by other worker.
+
+        Handler of ``user`` topic of ``InvalidationBus``.
+
+        Args:
+            keys: Id of user followed by its usernames. None evicts all users.
+        """
+        if keys is None:
+            self.users.clear_local()
+            self.usernames.clear_local()
+            return
+
+        user_id, *usernames = keys
+        if (cached := self.users.get_local(user_id)) is not None:
+            usernames.append(cached.username)
+        self.users.evict_local(user_id)
+        self.usernames.evict_local(*usernames)
+
+    async def __remember(self, user: models.User) -> None:
+        await self.users.set(str(user.id), user)
+        await self.usernames.set(user.username, user.id)
@@ -1,11 +1,32 @@
 from dependency_injector import containers, providers
 
+from app.pkg.settings import settings
+
 from .access_tokens import AccessTokenRepository
+from .invalidation import InvalidationBus
 from .refresh_tokens import RefreshTokenRepository
+from .role_cache import RoleCache
 from .user import UserRepository
 
 
 class Repositories(containers.DeclarativeContainer):
-    user_repository = providers.Factory(UserRepository)
-    refresh_token_repository = providers.Factory(RefreshTokenRepository)
-    access_token_repository = providers.Factory(AccessTokenRepository)
+    configuration = providers.Configuration(
+        name="settings",
+        pydantic_settings=[settings],
+    )
+
+    #: Roles are shared by all user repositories of the process.
+    role_cache = providers.Singleton(RoleCache)
+
+    #: Listener of invalidation messages sent by repositories of all workers.
+    invalidation_bus = providers.Singleton(InvalidationBus)
+
+    user_repository = providers.Factory(UserRepository, role_cache=role_cache)
+    refresh_token_repository = providers.Factory(
+        RefreshTokenRepository,
+        retention_days=configuration.SESSION_RETENTION_DAYS,
+    )
+    access_token_repository = providers.Factory(
+        AccessTokenRepository,
+        retention_days=configuration.SESSION_RETENTION_DAYS,
+    )
@@ -1,57 +1,80 @@
 from typing import List
 
-from app.pkg.models.access_token import AccessToken
+from app.pkg.models.access_token import AccessToken, StoredAccessToken
 from .connection import get_connection
+from .digest import digest_tokens
 from app.internal.repository.repository import Repository
 from .handlers.collect_response import collect_response
 
 
 class AccessTokenRepository(Repository):
+    """Access tokens, partitioned like their refresh tokens.
+
+    ``refresh_createdat`` is the partition key, so lookups are limited to
+    refresh tokens created during the last ``retention_days``.
+    """
+
+    retention_days: int
+
+    def __init__(self, retention_days: int = 32):
+        self.retention_days = retention_days
 
     @collect_response
-    async def create(self, cmd: AccessToken) -> AccessToken:
+    async def create(self, cmd: AccessToken) -> StoredAccessToken:
         query = """
-                INSERT INTO access_tokens(refresh_id, access_token)
-                    VALUES (%(refresh_id)s, %(access_token)s)
-                RETURNING *;
+                INSERT INTO access_tokens(refresh_id, refresh_createdat, access_token)
+                    SELECT id, createdat, %(access_token)s FROM refresh_tokens
+                    WHERE id = %(refresh_id)s
+                        AND createdat between now() - make_interval(days => %(retention_days)s) and now()
+                RETURNING refresh_id, access_token;
                 """
+        params = digest_tokens(self.__params(cmd), "access_token")
         async with get_connection() as cur:
-            await cur.execute(query, cmd.to_dict(show_secrets=True))
+            await cur.execute(query, params)
             return await cur.fetchone()
 
     @collect_response
-    async def read(self, query: AccessToken) -> AccessToken:
+    async def read(self, query: AccessToken) -> StoredAccessToken:
         q = """
             SELECT refresh_id, access_token from access_tokens
-            WHERE access_token = %(access_token)s and refresh_id = %(refresh_id)s;
+            WHERE access_token = %(access_token)s and refresh_id = %(refresh_id)s
+                AND refresh_createdat between now() - make_interval(days => %(retention_days)s) and now();
             """
-        async with get_connection() as cur:
-            await cur.execute(q, query.to_dict(show_secrets=True))
+        params = digest_tokens(self.__params(query), "access_token")
+        async with get_connection(read_only=True) as cur:
+            await cur.execute(q, params)
             return await cur.fetchone()
 
-    async def read_all(self) -> List[AccessToken]:
+    async def read_all(self) -> List[StoredAccessToken]:
         raise NotImplementedError
 
     @collect_response
-    async def update(self, cmd: AccessToken) -> AccessToken:
+    async def update(self, cmd: AccessToken) -> StoredAccessToken:
         q = """
             UPDATE access_tokens SET access_token = %(access_token)s
                 WHERE refresh_id = %(refresh_id)s
-            RETURNING *;
+                    AND refresh_createdat between now() - make_interval(days => %(retention_days)s) and now()
+            RETURNING refresh_id, access_token;
             """
 
+        params = digest_tokens(self.__params(cmd), "access_token")
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
+            await cur.execute(q, params)
             return await cur.fetchone()
 
     @collect_response
-    async def delete(self, cmd: AccessToken) -> AccessToken:
+    async def delete(self, cmd: AccessToken) -> StoredAccessToken:
         q = """
             DELETE FROM access_tokens
                 WHERE refresh_id = %(refresh_id)s
-            RETURNING *;
+                    AND refresh_createdat between now() - make_interval(days => %(retention_days)s) and now()
+            RETURNING refresh_id, access_token;
             """
 
+        params = digest_tokens(self.__params(cmd), "access_token")
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
+            await cur.execute(q, params)
             return await cur.fetchone()
+
+    def __params(self, model: AccessToken) -> dict:
+        return {**model.to_dict(show_secrets=True), "retention_days": self.retention_days}
@@ -1,4 +1,7 @@
+import time
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
 
 from aiopg.connection import Cursor
 from dependency_injector.wiring import Provide, inject
@@ -6,16 +9,89 @@ from psycopg2.extras import RealDictCursor
 
 from app.pkg.connectors import Connectors
 from app.pkg.connectors.postgresql import Postgresql
+from app.pkg.timing import record
 
-__all__ = ["get_connection"]
+__all__ = ["get_connection", "transaction"]
+
+#: Cursor of the unit of work opened by ``transaction`` in the current context.
+_transaction_cursor: ContextVar[Optional[Cursor]] = ContextVar(
+    "transaction_cursor",
+    default=None,
+)
+
+#: Monotonic time until which reads of the current request go to primary.
+_primary_sticky_until: ContextVar[float] = ContextVar(
+    "primary_sticky_until",
+    default=0.0,
+)
 
 
 @asynccontextmanager
 @inject
 async def get_connection(
+    read_only: bool = False,
     postgresql: Postgresql = Provide[Connectors.postgresql],
 ) -> Cursor:
-    """Get async connection to postgresql of pool."""
-    async with postgresql.get_connect() as connection:
-        async with (await connection.cursor(cursor_factory=RealDictCursor)) as cur:
+    """Get async connection to postgresql of pool.
+
+    Inside ``transaction`` the cursor of the transaction is returned, so all
+    repositories called by a service share one connection and one commit.
+
+    Read only queries go to a replica, unless the same request wrote to
+    primary during the last ``sticky_primary_ms``, so it reads its own writes.
+    Each request runs in its own context, so stickiness doesn't leak between
+    requests.
+
+    Args:
+        read_only: the query doesn't write and may read a lagging replica.
+        postgresql: shared connector.
+    """
+    if (cur := _transaction_cursor.get()) is not None:
+        yield cur
+        return
+
+    use_replica = read_only and time.monotonic() >= _primary_sticky_until.get()
+    acquire_started_at = time.perf_counter()
+    try:
+        async with postgresql.get_connect(read_only=use_replica) as connection:
+            record("db_acquire", acquire_started_at)
+            async with (await connection.cursor(cursor_factory=RealDictCursor)) as cur:
+                yield cur
+    finally:
+        if not read_only and postgresql.sticky_primary_ms:
+            _primary_sticky_until.set(
+                time.monotonic() + postgresql.sticky_primary_ms / 1000,
+            )
+
+
+@asynccontextmanager
+async def transaction() -> Cursor:
+    """Unit of work shared by all repositories called inside it.
+
+    Commits when the block exits normally and rolls back on any exception.
+    Nested calls join the outer transaction.
+
+    Examples:
+        ::
+
+            async with transaction():
+                token = await refresh_token_repository.read(query=query)
+                await refresh_token_repository.delete(cmd=cmd)
+                await refresh_token_repository.create(cmd=new)
+    """
+    if (cur := _transaction_cursor.get()) is not None:
+        yield cur
+        return
+
+    async with get_connection() as cur:
+        await cur.execute("begin;")
+        token = _transaction_cursor.set(cur)
+        try:
             yield cur
+        except BaseException:
+            await cur.execute("rollback;")
+            raise
+        else:
+            await cur.execute("commit;")
+        finally:
+            _transaction_cursor.reset(token)
@@ -0,0 +1,26 @@
+"""Tokens are stored as SHA-256 digests instead of raw JWT text.
+
+Digest has fixed 32 bytes length, so unique indexes on token columns stay
+small and comparisons are cheap. It is computed here rather than in SQL, so
+raw tokens never reach the database or its statement logs.
+"""
+
+import hashlib
+from typing import Any, Dict
+
+__all__ = ["sha256_digest", "digest_tokens"]
+
+
+def sha256_digest(token: str) -> bytes:
+    """Digest of token as stored in ``bytea`` token columns.
+
+    Same as ``sha256(convert_to(token, 'UTF8'))`` in postgresql.
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
+def digest_tokens(params: Dict[str, Any], *fields: str) -> Dict[str, Any]:
+    """Replace ``fields`` of query parameters by their digests."""
+    for field in fields:
+        params[field] = sha256_digest(params[field])
+    return params
@@ -1,82 +1,274 @@
 import functools
+import inspect
+import time
+from enum import Enum
 from functools import wraps
-from typing import Union, List
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+)
 
 import pydantic
+from prometheus_client import Histogram
 from psycopg2.extras import RealDictRow
+from pydantic.fields import SHAPE_SINGLETON, ModelField
 
 from app.internal.repository.exceptions import EmptyResult
 from app.internal.repository.postgresql.handlers.handle_exception import handle_exception
+from app.pkg.logger import get_logger
 from app.pkg.models.base import Model
+from app.pkg.timing import measure, record
+from app.pkg.tracing import SpanKind, current_span, start_span
+
+__all__ = ["collect_response", "collect_stream", "compile_converter"]
+
+Converter = Callable[[Any], Any]
+
+_query_seconds = Histogram(
+    "repository_query_seconds",
+    "Latency of repository methods, with waiting for a connection.",
+    ["repository", "method"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+_query_rows = Histogram(
+    "repository_query_rows",
+    "Rows returned by repository methods.",
+    ["repository", "method"],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000),
+)
 
 
 def collect_response(
     fn=None,
     convert_to_pydantic=True,
     nullable=False,
+    trusted_rows=True,
 ):
+    """Convert rows returned by repository method to its return annotation.
+
+    Annotation of ``fn`` is analysed once, when the method is decorated.
+
+    Args:
+        fn: Repository method.
+        convert_to_pydantic: Return raw rows if False.
+        nullable: Return None instead of raising ``EmptyResult`` on empty row.
+        trusted_rows: Build models from rows without full pydantic validation.
+            Rows come from our own schema, so only cheap per-field coercion
+            (``memoryview`` to bytes, secrets wrapping, enums) is applied.
+    """
     # fn is None when params for decorator are provided
     if fn is None:
         return functools.partial(
             collect_response,
             convert_to_pydantic=convert_to_pydantic,
             nullable=nullable,
+            trusted_rows=trusted_rows,
         )
 
+    return_class = fn.__annotations__.get("return")
+    returns_list = _is_list(return_class)
+    converter: Optional[Converter] = None
+    if convert_to_pydantic and return_class is not None:
+        converter = compile_converter(return_class, trusted_rows=trusted_rows)
+
+    repository, _, method = fn.__qualname__.rpartition(".")
+    query_seconds = _query_seconds.labels(repository=repository, method=method)
+    query_rows = _query_rows.labels(repository=repository, method=method)
+
     @wraps(fn)
-    @handle_exception
+    @handle_exception(span_name=f"{repository}.{method}")
     async def inner(*args: object, **kwargs: object) -> Union[List[Model], Model, None]:
-        response = await fn(*args, **kwargs)
+        started_at = time.perf_counter()
+        try:
+            response = await fn(*args, **kwargs)
+        finally:
+            query_seconds.observe(time.perf_counter() - started_at)
+            record("db", started_at)
+        rows = len(response) if isinstance(response, list) else int(bool(response))
+        query_rows.observe(rows)
+        if (span := current_span()) is not None:
+            span.set_attribute("db.rows", rows)
         if not response:
             # some responses are empty lists we should allow them.
-            # isinstance cannot digest List[int], only List, so __origin__ is used
-
-            if "return" in fn.__annotations__:
-                return_class = fn.__annotations__["return"]
-                if hasattr(return_class, "__origin__"):
-                    return_class = return_class.__origin__
-                if isinstance([], return_class):
-                    return []
-                if nullable:
-                    return None
+            if returns_list:
+                return []
+            if nullable and return_class is not None:
+                return None
 
             raise EmptyResult
 
-        if convert_to_pydantic:
-            return pydantic.parse_obj_as(
-                (ann := fn.__annotations__["return"]),
-                await __convert_response(response=response, annotations=str(ann)),
-            )
+        if converter is not None:
+            with measure("convert"):
+                return converter(response)
 
         return response
 
     return inner
 
 
-async def __convert_response(response: RealDictRow, annotations: str):
+def collect_stream(fn: Callable[..., AsyncIterator[Model]]):
+    """Measure and trace repository method yielding models one by one.
+
+    Counterpart of ``collect_response`` for async generators. Time of the whole
+    stream, including time its consumer spends between items, is observed in
+    ``repository_query_seconds``. Items are counted in ``repository_query_rows``.
+
+    Status of a streaming response is sent before the first item, so an error
+    of the database or of the connection can't be turned into an error
+    response anymore. It is logged and the stream just ends.
+
+    Args:
+        fn: Repository method, an async generator.
     """
-    Converts the response of the request to a List of models or to a single model.
+    repository, _, method = fn.__qualname__.rpartition(".")
+    span_name = f"{repository}.{method}"
+    query_seconds = _query_seconds.labels(repository=repository, method=method)
+    query_rows = _query_rows.labels(repository=repository, method=method)
+
+    @wraps(fn)
+    async def inner(*args: object, **kwargs: object) -> AsyncIterator[Model]:
+        started_at = time.perf_counter()
+        rows = 0
+        stream = fn(*args, **kwargs)
+        try:
+            with start_span(span_name, kind=SpanKind.CLIENT) as span:
+                try:
+                    async for item in stream:
+                        rows += 1
+                        yield item
+                finally:
+                    span.set_attribute("db.rows", rows)
+                    # Consumer may stop early, its cursor is closed right away.
+                    await stream.aclose()
+        except Exception:
+            get_logger("repository").exception(
+                "Stream of %s is interrupted after %s rows", span_name, rows,
+            )
+        finally:
+            query_seconds.observe(time.perf_counter() - started_at)
+            query_rows.observe(rows)
+
+    return inner
+
+
+def compile_converter(annotation: Any, trusted_rows: bool = True) -> Converter:
+    """Build function converting aiopg rows to ``annotation``.
+
     Args:
-        response: Response of aiopg query.
-        annotations: Annotations of `fn`.
+        annotation: Model class or ``List`` of model classes.
+        trusted_rows: See ``collect_response``.
 
-    Returns: List[`Model`] if List is specified in the type annotations,
-            or a single `Model` if `Model` is specified in the type annotations.
+    Returns:
+        Callable accepting single row or list of rows.
     """
-    r = response.copy()
-    if annotations.replace("typing.", "").startswith("List"):
-        return [await __convert_memory_viewer(item) for item in r]
-    return await __convert_memory_viewer(r)
+    if _is_list(annotation):
+        (item_annotation,) = get_args(annotation) or (Any,)
+        convert_item = compile_converter(item_annotation, trusted_rows=trusted_rows)
+        return lambda rows: [convert_item(row) for row in rows]
+
+    if inspect.isclass(annotation) and issubclass(annotation, pydantic.BaseModel):
+        if trusted_rows and (convert := _compile_trusted_model(annotation)):
+            return convert
+        return lambda row: annotation.parse_obj(_convert_memory_viewer(row))
+
+    return lambda row: pydantic.parse_obj_as(annotation, _convert_memory_viewer(row))
+
+
+def _is_list(annotation: Any) -> bool:
+    return annotation is list or get_origin(annotation) is list
+
+
+def _compile_trusted_model(model: Any) -> Optional[Converter]:
+    """Build converter of row to ``model`` which skips validation.
+
+    ``construct`` doesn't check required fields, so a row missing any of them,
+    e.g. when a query doesn't select it, goes through full validation and
+    fails it.
+
+    Returns:
+        None if some field of model can not be built without validation.
+    """
+    fields = []
+    for name, field in model.__fields__.items():
+        convert = _compile_trusted_field(field, model.__config__)
+        if convert is None:
+            return None
+        fields.append((name, convert))
+
+    required = frozenset(
+        name for name, field in model.__fields__.items() if field.required
+    )
+    construct = model.construct
 
+    def convert_row(row: RealDictRow):
+        if not required.issubset(row.keys()):
+            return model.parse_obj(_convert_memory_viewer(row))
 
-async def __convert_memory_viewer(r: RealDictRow):
+        values = {}
+        for name, convert_value in fields:
+            if name in row:
+                value = row[name]
+                values[name] = None if value is None else convert_value(value)
+        return construct(**values)
+
+    return convert_row
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, str):
+        return value.encode()
+    return value
+
+
+def _compile_trusted_field(field: ModelField, config: Any) -> Optional[Converter]:
+    if field.shape != SHAPE_SINGLETON or field.sub_fields:
+        return None
+
+    type_ = field.type_
+    if not inspect.isclass(type_):
+        return None
+    if issubclass(type_, pydantic.SecretBytes):
+        return lambda value: type_(_to_bytes(value))
+    if issubclass(type_, pydantic.SecretStr):
+        return type_
+    if issubclass(type_, Enum):
+        if config.use_enum_values:
+            return lambda value: type_(value).value
+        return type_
+    if issubclass(type_, bytes):
+        if type_ is bytes:
+            return _to_bytes
+        return lambda value: type_(_to_bytes(value))
+    if issubclass(type_, float):
+        return float
+    if issubclass(type_, (bool, int, str)) or type_.__module__ == "datetime":
+        return _identity
+    return None
+
+
+def _convert_memory_viewer(r: Union[RealDictRow, List[RealDictRow]]):
     """
     Convert memory viewer in bytes.
 
     Notes: aiopg returns memory viewer in query response,
         when in database type of cell `bytes`.
     """
-    for key, value in r.items():
-        if isinstance(value, memoryview):
-            r[key] = value.tobytes()
-    return r
+    if isinstance(r, list):
+        return [_convert_memory_viewer(item) for item in r]
+
+    return {
+        key: value.tobytes() if isinstance(value, memoryview) else value
+        for key, value in r.items()
+    }
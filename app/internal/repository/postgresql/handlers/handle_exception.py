@@ -1,19 +1,33 @@
-from typing import Callable
+import functools
+from typing import Callable, Optional
 
 from psycopg2 import Error as QueryError
 from psycopg2 import errorcodes
 
+try:
+    from asyncpg import PostgresError as AsyncpgQueryError
+except ImportError:
+    #: Nothing is caught when asyncpg connector is not installed.
+    AsyncpgQueryError = ()
+
 from app.pkg.models.base import Model
 from app.pkg.models.exceptions.repository import DriverError, UniqueViolation
+from app.pkg.tracing import SpanKind, start_span
 
 __all__ = ["handle_exception"]
 
 
-def handle_exception(func: Callable[..., Model]):
+def handle_exception(
+    func: Optional[Callable[..., Model]] = None,
+    span_name: Optional[str] = None,
+):
     """Decorator Catching Postgresql Query Exceptions.
 
+    Every call runs in a client span of tracing.
+
     Args:
         func: callable function object.
+        span_name: Name of span, qualified name of ``func`` by default.
 
     Returns:
         Result of call function.
@@ -23,13 +37,26 @@ def handle_exception(func: Callable[..., Model]):
         DriverError: Invalid database query/
     """
 
+    # func is None when params for decorator are provided
+    if func is None:
+        return functools.partial(handle_exception, span_name=span_name)
+
+    span_name = span_name or func.__qualname__
+
+    @functools.wraps(func)
     async def wrapper(*args: object, **kwargs: object) -> Model:
         try:
-            return await func(*args, **kwargs)
+            with start_span(span_name, kind=SpanKind.CLIENT):
+                return await func(*args, **kwargs)
         except QueryError as e:
             if e.pgcode == errorcodes.UNIQUE_VIOLATION:
                 raise UniqueViolation
 
             raise DriverError(message=e.pgerror)
+        except AsyncpgQueryError as e:
+            if e.sqlstate == errorcodes.UNIQUE_VIOLATION:
+                raise UniqueViolation
+
+            raise DriverError(message=str(e))
 
     return wrapper
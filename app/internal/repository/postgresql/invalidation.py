@@ -0,0 +1,142 @@
+"""Invalidation of in-process caches of all workers by postgresql ``NOTIFY``.
+
+Repositories send ``pg_notify(INVALIDATION_CHANNEL, payload)`` in the same
+statement as the write, so the message is delivered on commit and only if the
+write is committed. Payload is a json object::
+
+    {"topic": "user", "keys": ["1", "admin"]}
+
+Every worker keeps one dedicated connection which ``LISTEN``\\s on the channel
+and passes keys to handlers subscribed to the topic.
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, List, Optional
+
+import aiopg
+from dependency_injector.wiring import Provide, inject
+from prometheus_client import Counter
+
+from app.pkg.connectors import Connectors
+from app.pkg.connectors.postgresql import Postgresql
+from app.pkg.logger import get_logger
+
+__all__ = ["INVALIDATION_CHANNEL", "InvalidationBus", "InvalidationHandler"]
+
+#: Channel of ``LISTEN``/``NOTIFY`` shared by all workers.
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+#: Called with keys of message or with None when any key may be stale.
+InvalidationHandler = Callable[[Optional[List[str]]], Any]
+
+_received_messages = Counter(
+    "cache_invalidation_messages_total",
+    "Invalidation messages received from postgresql by topic.",
+    ["topic"],
+)
+
+
+class InvalidationBus:
+    """Listen for invalidation messages on a connection out of the pool.
+
+    Messages sent while the connection is lost can not be received, so after
+    reconnect every handler is called with None and must drop all its keys.
+
+    Examples:
+        ::
+
+            bus = InvalidationBus()
+            bus.subscribe("role", lambda keys: role_cache.invalidate())
+            bus.start()
+    """
+
+    postgresql: Postgresql
+    channel: str
+    reconnect_interval: float
+
+    @inject
+    def __init__(
+        self,
+        channel: str = INVALIDATION_CHANNEL,
+        reconnect_interval: float = 1.0,
+        postgresql: Postgresql = Provide[Connectors.postgresql],
+    ):
+        """
+        Args:
+            channel: Channel to listen.
+            reconnect_interval: Seconds between attempts to reconnect.
+            postgresql: Shared connector, only its dsn is used.
+        """
+        self.postgresql = postgresql
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        self.logger = get_logger("invalidation_bus")
+        self.__handlers: DefaultDict[str, List[InvalidationHandler]] = defaultdict(list)
+        self.__task: Optional[asyncio.Task] = None
+
+    def subscribe(self, topic: str, handler: InvalidationHandler) -> None:
+        self.__handlers[topic].append(handler)
+
+    def start(self) -> None:
+        """Listen in background task of current event loop."""
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run_forever())
+
+    async def stop(self) -> None:
+        """Cancel background task and wait for it."""
+        if self.__task is None:
+            return
+
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    def dispatch(self, payload: str) -> None:
+        """Pass keys of message to handlers of its topic."""
+        try:
+            message = json.loads(payload)
+            topic, keys = message["topic"], [str(key) for key in message["keys"]]
+        except (ValueError, TypeError, KeyError):
+            self.logger.warning("Malformed invalidation message %r", payload)
+            return
+
+        _received_messages.labels(topic=topic).inc()
+        for handler in self.__handlers.get(topic, ()):
+            self.__call(handler, keys)
+
+    def reset(self) -> None:
+        """Tell all handlers that any of their keys may be stale."""
+        for handlers in self.__handlers.values():
+            for handler in handlers:
+                self.__call(handler, None)
+
+    async def __run_forever(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                async with aiopg.connect(dsn=self.postgresql.get_dsn()) as conn:
+                    async with conn.cursor() as cur:
+                        await cur.execute(f'listen "{self.channel}";')
+                    if connected_before:
+                        self.reset()
+                    connected_before = True
+
+                    while True:
+                        message = await conn.notifies.get()
+                        self.dispatch(message.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger.exception("Lost connection of invalidation bus")
+            await asyncio.sleep(self.reconnect_interval)
+
+    def __call(self, handler: InvalidationHandler, keys: Optional[List[str]]) -> None:
+        try:
+            handler(keys)
+        except Exception:
+            self.logger.exception("Invalidation handler %r failed", handler)
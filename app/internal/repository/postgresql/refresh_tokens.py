@@ -1,10 +1,13 @@
-from typing import List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
 
 from app.internal.repository.postgresql.handlers.collect_response import collect_response
+from app.internal.repository.postgresql.handlers.handle_exception import handle_exception
 from app.internal.repository.repository import Repository
 from app.pkg.models.base import Model
 from app.pkg.models.refresh_token import (
     CreateJWTTokenCommand,
+    CreateSessionCommand,
     DeleteJWTTokenCommand,
     JWTToken,
     ReadJWTTokenQuery,
@@ -13,28 +16,90 @@ from app.pkg.models.refresh_token import (
 )
 
 from .connection import get_connection
+from .digest import digest_tokens
+from .invalidation import INVALIDATION_CHANNEL
 
 
 class RefreshTokenRepository(Repository):
+    """Refresh tokens in weekly partitions of ``refresh_tokens`` by ``createdat``.
+
+    Every lookup is limited to tokens created during the last ``retention_days``,
+    so only partitions which may hold live tokens are scanned.
+    """
+
+    retention_days: int
+
+    def __init__(self, retention_days: int = 32):
+        """
+        Args:
+            retention_days: Max lifetime of refresh token in days. Partitions
+                older than it are dropped by ``drop_expired_partitions``.
+        """
+        self.retention_days = retention_days
+
     @collect_response
     async def create(self, cmd: CreateJWTTokenCommand) -> JWTToken:
         q = """
-                insert into refresh_tokens(user_id, refresh_token, fingerprint, expiresat)
-                    values (%(user_id)s, %(refresh_token)s, %(fingerprint)s, %(expiresat)s)
+                insert into refresh_tokens(
+                    user_id, refresh_token, fingerprint, expiresat, expires_at
+                ) values (
+                    %(user_id)s, %(refresh_token)s, %(fingerprint)s, %(expiresat)s,
+                    now() + make_interval(secs => %(expiresat)s::bigint)
+                )
                 returning *;
             """
+        params = digest_tokens(cmd.to_dict(show_secrets=True), "refresh_token")
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
+            await cur.execute(q, params)
+            return await cur.fetchone()
+
+    @collect_response
+    async def create_session(self, cmd: CreateSessionCommand) -> JWTToken:
+        """Replace refresh token of device and store its access token.
+
+        Previous refresh token of the same ``user_id`` and ``fingerprint`` is
+        deleted together with its access tokens (``on delete cascade``), so the
+        whole login is one statement and one round trip.
+        """
+        q = """
+                with deleted as (
+                    delete from refresh_tokens
+                        where user_id = %(user_id)s and fingerprint = %(fingerprint)s
+                            and createdat between now() - make_interval(days => %(retention_days)s) and now()
+                ), created as (
+                    insert into refresh_tokens(
+                        user_id, refresh_token, fingerprint, expiresat, expires_at
+                    ) values (
+                        %(user_id)s, %(refresh_token)s, %(fingerprint)s, %(expiresat)s,
+                        now() + make_interval(secs => %(expiresat)s::bigint)
+                    )
+                    returning id, user_id, refresh_token, fingerprint, expiresat, createdat
+                ), access as (
+                    insert into access_tokens(refresh_id, refresh_createdat, access_token)
+                        select id, createdat, %(access_token)s from created
+                )
+                select id, user_id, refresh_token, fingerprint, expiresat from created;
+            """
+        params = digest_tokens(
+            self.__params(cmd),
+            "refresh_token",
+            "access_token",
+        )
+        async with get_connection() as cur:
+            await cur.execute(q, params)
             return await cur.fetchone()
 
     @collect_response
     async def read(self, query: ReadJWTTokenQuery) -> JWTToken:
         q = """
                 select id, user_id, refresh_token, fingerprint, expiresat from refresh_tokens
-                where user_id = %(user_id)s and refresh_token = %(refresh_token)s;
+                where user_id = %(user_id)s and refresh_token = %(refresh_token)s
+                    and createdat between now() - make_interval(days => %(retention_days)s) and now()
+                for update;
             """
+        params = digest_tokens(self.__params(query), "refresh_token")
         async with get_connection() as cur:
-            await cur.execute(q, query.to_dict(show_secrets=True))
+            await cur.execute(q, params)
             return await cur.fetchone()
 
     @collect_response
@@ -43,34 +108,134 @@ class RefreshTokenRepository(Repository):
         query: ReadJWTTokenQueryByFingerprint,
     ) -> JWTToken:
         q = """
-                select user_id, refresh_token, fingerprint from refresh_tokens
-                where user_id = %(user_id)s and fingerprint = %(fingerprint)s;
+                select id, user_id, refresh_token, fingerprint, expiresat from refresh_tokens
+                where user_id = %(user_id)s and fingerprint = %(fingerprint)s
+                    and createdat between now() - make_interval(days => %(retention_days)s) and now();
             """
-        async with get_connection() as cur:
-            await cur.execute(q, query.to_dict(show_secrets=True))
+        async with get_connection(read_only=True) as cur:
+            await cur.execute(q, self.__params(query))
             return await cur.fetchone()
 
     async def read_all(self) -> List[Model]:
         raise NotImplementedError
 
+    @handle_exception
+    async def delete_expired(self, batch_size: int) -> int:
+        """Delete at most ``batch_size`` expired refresh tokens.
+
+        Expired rows are found by index on ``expires_at``, so a batch reads only
+        rows it deletes. Rows locked by running logins or refreshes are skipped,
+        so the delete never waits for them.
+
+        Returns:
+            Count of deleted refresh tokens.
+        """
+        q = """
+                delete from refresh_tokens
+                    where (id, createdat) in (
+                        select id, createdat from refresh_tokens
+                            where expires_at < now()
+                        limit %(batch_size)s
+                        for update skip locked
+                    );
+            """
+        async with get_connection() as cur:
+            await cur.execute(q, {"batch_size": batch_size})
+            return cur.rowcount
+
+    @asynccontextmanager
+    async def reaper_lock(self) -> AsyncIterator[bool]:
+        """Hold advisory lock of session reaper for the block.
+
+        The lock belongs to the connection, so it is kept for the whole block
+        and released when the block exits.
+
+        Yields:
+            ``False`` when the reaper of another worker holds the lock.
+        """
+        async with get_connection() as cur:
+            await cur.execute(
+                "select pg_try_advisory_lock(hashtext('session_reaper')) as locked;",
+            )
+            locked = (await cur.fetchone())["locked"]
+            try:
+                yield locked
+            finally:
+                if locked:
+                    await cur.execute(
+                        "select pg_advisory_unlock(hashtext('session_reaper'));",
+                    )
+
+    @handle_exception
+    async def ensure_partitions(self, weeks_ahead: int) -> None:
+        """Create partitions for current week and ``weeks_ahead`` next weeks."""
+        q = """
+                select create_token_partitions(
+                    now(),
+                    now() + make_interval(weeks => %(weeks_ahead)s)
+                );
+            """
+        async with get_connection() as cur:
+            await cur.execute(q, {"weeks_ahead": weeks_ahead})
+
+    @handle_exception
+    async def drop_expired_partitions(self) -> int:
+        """Drop partitions which ended more than ``retention_days`` ago.
+
+        Returns:
+            Estimated count of dropped refresh tokens.
+        """
+        q = """
+                select drop_expired_token_partitions(
+                    make_interval(days => %(retention_days)s)
+                ) as dropped;
+            """
+        async with get_connection() as cur:
+            await cur.execute(q, {"retention_days": self.retention_days})
+            return (await cur.fetchone())["dropped"]
+
     @collect_response
     async def update(self, cmd: UpdateJWTTokenCommand) -> JWTToken:
         q = """
                 update refresh_tokens set refresh_token = %(refresh_token)s
                     where user_id = %(user_id)s and fingerprint = %(fingerprint)s
+                        and createdat between now() - make_interval(days => %(retention_days)s) and now()
                 returning *;
             """
+        params = digest_tokens(self.__params(cmd), "refresh_token")
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
+            await cur.execute(q, params)
             return await cur.fetchone()
 
     @collect_response
     async def delete(self, cmd: DeleteJWTTokenCommand) -> JWTToken:
+        """Delete refresh token of device with its access tokens.
+
+        Digests of deleted tokens are sent to ``InvalidationBus`` of all workers
+        with topic ``token``, in hex as ``token_digest`` of jwt caches.
+        """
         q = """
-                delete from refresh_tokens
-                    where user_id = %(user_id)s and fingerprint = %(fingerprint)s
-                returning *;
+                with deleted as (
+                    delete from refresh_tokens
+                        where user_id = %(user_id)s and fingerprint = %(fingerprint)s
+                            and createdat between now() - make_interval(days => %(retention_days)s) and now()
+                    returning *
+                )
+                select deleted.* from deleted cross join lateral (
+                    select pg_notify(%(channel)s, json_build_object(
+                        'topic', 'token',
+                        'keys', array(
+                            select encode(access_token, 'hex') from access_tokens
+                            where refresh_id = deleted.id
+                                and refresh_createdat = deleted.createdat
+                        ) || encode(deleted.refresh_token, 'hex')
+                    )::text)
+                ) notified;
             """
+        params = {**self.__params(cmd), "channel": INVALIDATION_CHANNEL}
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
+            await cur.execute(q, params)
             return await cur.fetchone()
+
+    def __params(self, model: Model) -> dict:
+        return {**model.to_dict(show_secrets=True), "retention_days": self.retention_days}
@@ -0,0 +1,55 @@
+"""In-process map of ``user_roles`` ids and names.
+
+The table holds a couple of rows which are not changed at runtime, so user
+queries store and read ``role_id`` and roles are resolved here, without
+joins and subselects on ``user_roles``.
+"""
+
+from typing import Dict, Optional
+
+from app.internal.repository.postgresql.connection import get_connection
+from app.internal.repository.postgresql.handlers.handle_exception import handle_exception
+
+__all__ = ["RoleCache"]
+
+
+class RoleCache:
+    """Role id to name map, loaded on first use and reloaded on a miss."""
+
+    def __init__(self):
+        self.__ids: Dict[str, int] = {}
+        self.__names: Dict[int, str] = {}
+
+    @handle_exception
+    async def load(self) -> None:
+        """Read all roles from ``user_roles``."""
+        q = """
+            select id, role_name from user_roles;
+        """
+        async with get_connection(read_only=True) as cur:
+            await cur.execute(q)
+            rows = await cur.fetchall()
+
+        self.__ids = {row["role_name"]: row["id"] for row in rows}
+        self.__names = {row["id"]: row["role_name"] for row in rows}
+
+    def invalidate(self) -> None:
+        """Forget all roles, they are read again on next use."""
+        self.__ids = {}
+        self.__names = {}
+
+    async def get_id(self, role_name: Optional[str]) -> Optional[int]:
+        """Id of role by its name or None if there is no such role."""
+        if role_name is None:
+            return None
+        if role_name not in self.__ids:
+            await self.load()
+        return self.__ids.get(role_name)
+
+    async def get_name(self, role_id: Optional[int]) -> Optional[str]:
+        """Name of role by its id or None if there is no such role."""
+        if role_id is None:
+            return None
+        if role_id not in self.__names:
+            await self.load()
+        return self.__names.get(role_id)
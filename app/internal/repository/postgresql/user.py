@@ -1,14 +1,34 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-from app.internal.repository.postgresql.handlers.collect_response import collect_response
+from app.internal.repository.postgresql.handlers.collect_response import (
+    collect_response,
+    collect_stream,
+    compile_converter,
+)
 from app.internal.repository.postgresql.connection import get_connection
+from app.internal.repository.postgresql.invalidation import INVALIDATION_CHANNEL
+from app.internal.repository.postgresql.role_cache import RoleCache
 from app.internal.repository.repository import Repository
 from app.pkg import models
+from app.pkg.models.base import Model
 
 __all__ = ["UserRepository"]
 
+_convert_user = compile_converter(models.User)
+
 
 class UserRepository(Repository):
+    """Users with ``role_id`` resolved to ``role_name`` by ``RoleCache``.
+
+    ``update`` and ``delete`` notify ``InvalidationBus`` of all workers with
+    topic ``user`` and keys ``[id, username, ...]``.
+    """
+
+    role_cache: RoleCache
+
+    def __init__(self, role_cache: Optional[RoleCache] = None):
+        self.role_cache = role_cache or RoleCache()
+
     @collect_response
     async def create(self, cmd: models.CreateUserCommand) -> models.User:
         q = """
@@ -17,29 +37,23 @@ class UserRepository(Repository):
             ) values (
                 %(username)s,
                 %(password)s::bytea,
-                (select id from user_roles where role_name = %(role_name)s)
+                %(role_id)s
             )
-            returning id, username, password, (select role_name from user_roles where role_name = %(role_name)s);
+            returning id, username, password, role_id;
         """
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
-            return await cur.fetchone()
+            await cur.execute(q, await self.__with_role_id(cmd))
+            return await self.__with_role_name(await cur.fetchone())
 
     @collect_response
     async def read(self, query: models.ReadUserByIdQuery) -> models.User:
         q = """
-            select
-                users.id,
-                username,
-                password,
-                ur.role_name
-            from users
-                left join user_roles ur on ur.id = users.role_id
-            where users.id = %(id)s;
+            select id, username, password, role_id from users
+            where id = %(id)s;
         """
-        async with get_connection() as cur:
+        async with get_connection(read_only=True) as cur:
             await cur.execute(q, query.to_dict(show_secrets=True))
-            return await cur.fetchone()
+            return await self.__with_role_name(await cur.fetchone())
 
     @collect_response(nullable=True)
     async def read_by_username(
@@ -47,61 +61,125 @@ class UserRepository(Repository):
         query: models.ReadUserByUserNameQuery,
     ) -> models.User:
         q = """
-            select
-                users.id, username, password, ur.role_name as role_name
-            from users
-                left join user_roles ur on ur.id = users.role_id
+            select id, username, password, role_id from users
             where username = %(username)s
         """
-        async with get_connection() as cur:
+        async with get_connection(read_only=True) as cur:
             await cur.execute(q, query.to_dict(show_secrets=True))
-            return await cur.fetchone()
+            return await self.__with_role_name(await cur.fetchone())
 
     @collect_response(nullable=True)
     async def read_all(self) -> List[models.User]:
         q = """
-            select
-                users.id,
-                username,
-                password,
-                ur.role_name as role_name
-            from users
-                left join user_roles ur on ur.id = users.role_id;
+            select id, username, password, role_id from users;
         """
-        async with get_connection() as cur:
+        async with get_connection(read_only=True) as cur:
             await cur.execute(q)
-            return await cur.fetchall()
+            return await self.__with_role_name(await cur.fetchall())
+
+    @collect_response
+    async def read_page(self, query: models.ReadUsersPageQuery) -> List[models.User]:
+        """Read users with id greater than ``after_id`` ordered by id."""
+        q = """
+            select id, username, password, role_id from users
+            where id > %(after_id)s
+            order by id
+            limit %(limit)s;
+        """
+        async with get_connection(read_only=True) as cur:
+            await cur.execute(q, query.to_dict(show_secrets=True))
+            return await self.__with_role_name(await cur.fetchall())
+
+    @collect_stream
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[models.User]:
+        """Iterate over all users through server side cursor.
+
+        Only ``batch_size`` rows are held in memory at once. The cursor lives in
+        its own read only transaction, so don't call it inside ``transaction``.
+        An error of the database ends the stream early, see ``collect_stream``.
+        """
+        q = """
+            declare users_stream no scroll cursor for
+            select id, username, password, role_id from users
+            order by id;
+        """
+        async with get_connection(read_only=True) as cur:
+            await cur.execute("begin read only;")
+            try:
+                await cur.execute(q)
+                while True:
+                    # FETCH takes no bind parameters in protocol of asyncpg.
+                    await cur.execute(
+                        f"fetch forward {int(batch_size)} from users_stream;",
+                    )
+                    rows = await cur.fetchall()
+                    if not rows:
+                        break
+                    for row in await self.__with_role_name(rows):
+                        yield _convert_user(row)
+            finally:
+                await cur.execute("rollback;")
 
     @collect_response
     async def update(self, cmd: models.UpdateUserCommand) -> models.User:
         q = """
-            with ur as (
-                select id, role_name from user_roles where role_name = %(role_name)s
+            with updated as (
+                update users
+                    set
+                        username = %(username)s,
+                        password = %(password)s,
+                        role_id = %(role_id)s,
+                        password_updated_at = current_timestamp
+                    from (select id, username from users where id = %(id)s for update) old
+                    where users.id = old.id
+                returning users.id, users.username, users.password, users.role_id,
+                    old.username as old_username
             )
-            update users
-                set
-                    username = %(username)s,
-                    password = %(password)s,
-                    role_id = (select id from ur),
-                    password_updated_at = current_timestamp
-                where id = %(id)s
-            returning
-                id, username, password,
-                (select role_name from ur);
+            select updated.id, updated.username, updated.password, updated.role_id
+            from updated cross join lateral (
+                select pg_notify(%(channel)s, json_build_object(
+                    'topic', 'user',
+                    'keys', json_build_array(
+                        updated.id, updated.username, updated.old_username
+                    )
+                )::text)
+            ) notified;
         """
+        params = await self.__with_role_id(cmd)
+        params["channel"] = INVALIDATION_CHANNEL
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
-            return await cur.fetchone()
+            await cur.execute(q, params)
+            return await self.__with_role_name(await cur.fetchone())
 
     @collect_response
     async def delete(self, cmd: models.DeleteUserCommand) -> models.User:
         q = """
-            delete from users where id = %(id)s
-            returning id, username, password, (
-                select role_name from user_roles
-                    where id=users.role_id
-            );
+            with deleted as (
+                delete from users where id = %(id)s
+                returning id, username, password, role_id
+            )
+            select deleted.* from deleted cross join lateral (
+                select pg_notify(%(channel)s, json_build_object(
+                    'topic', 'user',
+                    'keys', json_build_array(deleted.id, deleted.username)
+                )::text)
+            ) notified;
         """
+        params = {**cmd.to_dict(show_secrets=True), "channel": INVALIDATION_CHANNEL}
         async with get_connection() as cur:
-            await cur.execute(q, cmd.to_dict(show_secrets=True))
-            return await cur.fetchone()
+            await cur.execute(q, params)
+            return await self.__with_role_name(await cur.fetchone())
+
+    async def __with_role_id(self, cmd: Model) -> dict:
+        params = cmd.to_dict(show_secrets=True)
+        params["role_id"] = await self.role_cache.get_id(params.pop("role_name"))
+        return params
+
+    async def __with_role_name(self, rows):
+        """Replace ``role_id`` of row or list of rows by ``role_name``."""
+        if not rows:
+            return rows
+
+        for row in rows if isinstance(rows, list) else (rows,):
+            row["role_name"] = await self.role_cache.get_name(row.pop("role_id"))
+        return rows
@@ -1,10 +1,10 @@
 """Global point for collected routers."""
 
 from app.internal.pkg.models import Routes
-from app.internal.routes import auth, user
+from app.internal.routes import auth, debug, user
 
 __all__ = ["__routes__"]
 
 
-__routes__ = Routes(routers=(user.router, auth.router))
+__routes__ = Routes(routers=(user.router, auth.router, debug.router))
 # TODO: Добавить документацию.
@@ -1,10 +1,11 @@
-import datetime
 from datetime import timedelta
+from typing import Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Body, Depends, Security, status
+from fastapi import APIRouter, Body, Depends, Header, Security, status
 from starlette.responses import Response
 
+from app.internal.pkg.middlewares.timing import TimedRoute
 from app.internal.services import Services
 from app.internal.services.auth import AuthService
 from app.pkg.jwt import (
@@ -12,20 +13,20 @@ from app.pkg.jwt import (
     JwtAccessBearer,
     JwtAuthorizationCredentials,
     JwtRefreshBearer,
+    KeySet,
     refresh_security,
 )
 from app.pkg.models.auth import Auth, AuthCommand
-from app.pkg.models.exceptions.auth import IncorrectUsernameOrPassword, TokenExpired
+from app.pkg.models.exceptions.auth import IncorrectUsernameOrPassword
 # from app.pkg.models.otp import Check2FACommand
 from app.pkg.models.refresh_token import (
-    CreateJWTTokenCommand,
+    CreateSessionCommand,
     DeleteJWTTokenCommand,
     ReadJWTTokenQuery,
-    ReadJWTTokenQueryByFingerprint,
-    UpdateJWTTokenCommand,
 )
+from app.pkg.settings import settings
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=TimedRoute)
 
 
 @router.post(
@@ -71,19 +72,6 @@ async def auth_user(
     at = access.create_access_token(
         subject={"user_id": user.id, "role_name": user.role_name},
     )
-
-    if rt := await auth_service.check_user_exist_refresh_token(
-            query=ReadJWTTokenQueryByFingerprint(
-                user_id=user.id,
-                fingerprint=cmd.fingerprint,
-            ),
-    ):
-        return Auth(
-            access_token=at,
-            refresh_token=rt.refresh_token,
-            user_role_name=user.role_name,
-        )
-
     rt = refresh.create_refresh_token(
         subject={
             "user_id": user.id,
@@ -92,13 +80,13 @@ async def auth_user(
         },
     )
 
-    ref_tok = await auth_service.create_refresh_token(
-        cmd=CreateJWTTokenCommand(
+    ref_tok = await auth_service.open_session(
+        cmd=CreateSessionCommand(
+            user_id=user.id,
             refresh_token=rt,
             fingerprint=cmd.fingerprint,
-            user_id=user.id,
+            access_token=at,
         ),
-        access_token=at
     )
     refresh.set_refresh_cookie(response=response, refresh_token=rt,
                                expires_delta=timedelta(seconds=ref_tok.expiresat))
@@ -134,41 +122,27 @@ async def create_new_token_pair(
     # fingerprint = credentials.subject.get("fingerprint")
     user_id = credentials.subject.get("user_id")
 
-    ref_tok = await auth_service.check_refresh_token_exists(
-        query=ReadJWTTokenQuery(
-            user_id=user_id,
-            refresh_token=credentials.raw_token,
-        ),
-    )
-
-    await auth_service.delete_refresh_token(
-        cmd=DeleteJWTTokenCommand(
-            user_id=user_id,
-            refresh_token=credentials.raw_token,
-            fingerprint=fingerprint
-        )
-    )
-
-    if ref_tok.expiresat > datetime.datetime.now().timestamp() or not fingerprint == ref_tok.fingerprint:
-        raise TokenExpired
-
     at = access.create_access_token(subject={"user_id": user_id})
     rt = refresh.create_refresh_token(
         subject={"user_id": user_id, "fingerprint": fingerprint},
     )
 
-    irt = await auth_service.update_refresh_token(
-        cmd=UpdateJWTTokenCommand(
+    ref_tok = await auth_service.rotate_refresh_token(
+        query=ReadJWTTokenQuery(
+            user_id=user_id,
+            refresh_token=credentials.raw_token,
+        ),
+        cmd=CreateSessionCommand(
             user_id=user_id,
             refresh_token=rt,
             fingerprint=fingerprint,
+            access_token=at,
         ),
-        access_token=at
     )
 
     refresh.set_refresh_cookie(response=response, refresh_token=rt,
                                expires_delta=timedelta(seconds=ref_tok.expiresat))
-    return Auth(access_token=at, refresh_token=irt.refresh_token.get_secret_value())
+    return Auth(access_token=at, refresh_token=rt)
 
 
 @router.post(
@@ -203,3 +177,27 @@ async def logout(
             refresh_token=refresh_token,
         ),
     )
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    status_code=status.HTTP_200_OK,
+    description="Public keys for local verification of tokens. "
+                + "Empty key set when tokens are signed with a shared secret.",
+)
+@inject
+async def read_jwks(
+        key_set: Optional[KeySet] = Depends(Provide[JWT.key_set]),
+        if_none_match: Optional[str] = Header(None),
+):
+    if key_set is None:
+        return Response(content=b'{"keys":[]}', media_type="application/json")
+
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWT_JWKS_MAX_AGE}",
+        "ETag": key_set.etag,
+    }
+    if if_none_match == key_set.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=key_set.jwks, media_type="application/json", headers=headers)
@@ -0,0 +1,49 @@
+import os
+import time
+from typing import Literal
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Query, Security, status
+from fastapi.responses import PlainTextResponse
+
+from app.internal.pkg.middlewares.timing import TimedRoute
+from app.internal.pkg.middlewares.x_auth_token import get_profiler_token_key
+from app.internal.services import Services
+from app.pkg.profiler import Profiler
+from app.pkg.settings import settings
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Debug"],
+    route_class=TimedRoute,
+    dependencies=[Security(get_profiler_token_key)],
+)
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    description="Profile the worker which serves the request for ``seconds``. "
+                + "``stacks`` returns collapsed stacks of all threads for "
+                + "flamegraph.pl or speedscope, ``memory`` returns the top "
+                + "allocation sites of tracemalloc.",
+)
+@inject
+async def profile(
+        mode: Literal["stacks", "memory"] = Query("stacks"),
+        seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+        interval: float = Query(0.01, ge=0.001, le=1),
+        limit: int = Query(30, ge=1, le=1000),
+        frames: int = Query(1, ge=1, le=50),
+        profiler: Profiler = Depends(Provide[Services.profiler]),
+):
+    if mode == "memory":
+        return await profiler.trace_allocations(seconds, limit=limit, frames=frames)
+
+    stacks = await profiler.sample_stacks(seconds, interval=interval)
+    filename = f"profile-{os.getpid()}-{int(time.time())}.folded"
+    return PlainTextResponse(
+        stacks,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,14 +1,16 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Security, status
+from fastapi import APIRouter, Depends, Query, Security, status
+from fastapi.responses import StreamingResponse
 
+from app.internal.pkg.middlewares.timing import TimedRoute
 from app.internal.services import Services
 from app.internal.services.user import UserService
 from app.pkg import models
 from app.pkg.jwt import JwtAuthorizationCredentials, access_security
 
-router = APIRouter(prefix="/user", tags=["User"])
+router = APIRouter(prefix="/user", tags=["User"], route_class=TimedRoute)
 
 
 @router.post(
@@ -31,14 +33,37 @@ async def create_user(
     response_model=List[models.User],
     status_code=status.HTTP_200_OK,
     response_model_exclude={"password"},
-    description="Get all users without password field",
+    description="Get page of users ordered by id without password field. "
+    "Pass id of the last user as `after_id` to get next page.",
 )
 @inject
 async def read_all_users(
+    after_id: int = Query(0, ge=0, description="Id of the last user of previous page."),
+    limit: int = Query(100, ge=1, le=1000, description="Max count of users in page."),
     user_service: UserService = Depends(Provide[Services.user_service]),
     jwt_credentials: JwtAuthorizationCredentials = Security(access_security),
 ):
-    return await user_service.read_all_users()
+    return await user_service.read_users_page(
+        query=models.ReadUsersPageQuery(after_id=after_id, limit=limit),
+    )
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    description="Stream all users without password field as NDJSON",
+)
+@inject
+async def stream_all_users(
+    user_service: UserService = Depends(Provide[Services.user_service]),
+    jwt_credentials: JwtAuthorizationCredentials = Security(access_security),
+):
+    async def ndjson() -> AsyncIterator[str]:
+        async for user in user_service.stream_all_users():
+            yield user.json(exclude={"password"}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.get(
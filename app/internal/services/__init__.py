@@ -1,10 +1,19 @@
 from dependency_injector import containers, providers
 
+from app.internal.pkg.password.hasher import PasswordHasher
 from app.internal.repository import Repositories
+from app.internal.repository.cached import (
+    CachedUserRepository,
+    decode_user,
+    encode_user,
+)
 from app.internal.services import auth, user
 from app.internal.services.auth import AuthService
+from app.internal.services.session_reaper import SessionReaper
 from app.internal.services.user import UserService
+from app.pkg.cache import LocalCache, TwoTierCache, get_remote_cache
 from app.pkg.otp.otp import OTPService
+from app.pkg.profiler import Profiler
 from app.pkg.settings import settings
 
 
@@ -20,12 +29,84 @@ class Services(containers.DeclarativeContainer):
     #: OTP service
     otp_service = providers.Factory(OTPService, otp_key=configuration.OTP_KEY)
 
-    user_service = providers.Factory(UserService, repositories.user_repository)
+    #: Executor for bcrypt, shared between all requests of the process.
+    password_hasher = providers.Singleton(
+        PasswordHasher,
+        executor_type=configuration.PASSWORD_HASHER_EXECUTOR,
+        max_workers=configuration.PASSWORD_HASHER_MAX_WORKERS,
+        queue_size=configuration.PASSWORD_HASHER_QUEUE_SIZE,
+    )
+
+    #: Shared tier of caches, redis or its local stand-in.
+    remote_cache = providers.Singleton(
+        get_remote_cache,
+        backend=configuration.USER_CACHE_BACKEND,
+        host=configuration.REDIS_HOST,
+        port=configuration.REDIS_PORT,
+        password=configuration.REDIS_PASSWORD,
+    )
+
+    user_cache = providers.Singleton(
+        TwoTierCache,
+        name="user:id",
+        local=providers.Singleton(
+            LocalCache,
+            maxsize=configuration.USER_CACHE_SIZE,
+            ttl=configuration.USER_CACHE_TTL,
+        ),
+        remote=remote_cache,
+        ttl=configuration.USER_CACHE_TTL,
+        encode=encode_user,
+        decode=decode_user,
+    )
+
+    username_cache = providers.Singleton(
+        TwoTierCache,
+        name="user:username",
+        local=providers.Singleton(
+            LocalCache,
+            maxsize=configuration.USER_CACHE_SIZE,
+            ttl=configuration.USER_CACHE_TTL,
+        ),
+        remote=remote_cache,
+        ttl=configuration.USER_CACHE_TTL,
+        encode=str,
+        decode=int,
+    )
+
+    user_repository = providers.Factory(
+        CachedUserRepository,
+        repository=repositories.user_repository,
+        users=user_cache,
+        usernames=username_cache,
+    )
+
+    user_service = providers.Factory(
+        UserService,
+        user_repository,
+        password_hasher=password_hasher,
+    )
 
     auth_service = providers.Factory(
         AuthService,
         otp_service=otp_service,
         user_service=user_service,
+        password_hasher=password_hasher,
         refresh_token_repository=repositories.refresh_token_repository,
         access_token_repository=repositories.access_token_repository
     )
+
+    #: Background deletion of expired refresh tokens.
+    session_reaper = providers.Singleton(
+        SessionReaper,
+        refresh_token_repository=repositories.refresh_token_repository,
+        interval=configuration.SESSION_REAPER_INTERVAL,
+        batch_size=configuration.SESSION_REAPER_BATCH_SIZE,
+        batch_pause=configuration.SESSION_REAPER_BATCH_PAUSE,
+        max_batches=configuration.SESSION_REAPER_MAX_BATCHES,
+        partitions_ahead=configuration.SESSION_PARTITIONS_AHEAD,
+        enabled=configuration.SESSION_REAPER_ENABLED,
+    )
+
+    #: Sessions of on demand profiler of the worker.
+    profiler = providers.Singleton(Profiler)
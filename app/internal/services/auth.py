@@ -1,25 +1,25 @@
 from typing import Optional
 
-from app.internal.pkg.password import password
+from app.internal.pkg.password.hasher import PasswordHasher
 from app.internal.repository.exceptions import EmptyResult, UniqueViolation
 from app.internal.repository.postgresql import RefreshTokenRepository
 from app.internal.repository.postgresql.access_tokens import AccessTokenRepository
+from app.internal.repository.postgresql.connection import transaction
 from app.internal.services.user import UserService
 from app.pkg.jwt import UnAuthorized, WrongToken
-from app.pkg.models.access_token import AccessToken
 from app.pkg.models.auth import AuthCommand
-from app.pkg.models.exceptions.auth import IncorrectUsernameOrPassword
+from app.pkg.models.exceptions.auth import IncorrectUsernameOrPassword, TokenExpired
 from app.pkg.models.otp import Check2FACommand
 from app.pkg.models.refresh_token import (
-    CreateJWTTokenCommand,
+    CreateSessionCommand,
     DeleteJWTTokenCommand,
     JWTToken,
     ReadJWTTokenQuery,
     ReadJWTTokenQueryByFingerprint,
-    UpdateJWTTokenCommand,
 )
 from app.pkg.models.user import ReadUserByUserNameQuery, User
 from app.pkg.otp.otp import OTPService
+from app.pkg.tracing import traced
 
 __all__ = ["AuthService"]
 
@@ -29,6 +29,7 @@ class AuthService:
     access_token_repository: AccessTokenRepository
     user_service: UserService
     otp_service: OTPService
+    password_hasher: PasswordHasher
 
     def __init__(
         self,
@@ -36,24 +37,31 @@ class AuthService:
         refresh_token_repository: RefreshTokenRepository,
         access_token_repository: AccessTokenRepository,
         otp_service: OTPService,
+        password_hasher: PasswordHasher,
     ):
         self.user_service = user_service
         self.refresh_token_repository = refresh_token_repository
         self.access_token_repository = access_token_repository
         self.otp_service = otp_service
+        self.password_hasher = password_hasher
 
     def check_2fa(self, cmd: Check2FACommand):
         return self.otp_service.verify_2fa_auth(cmd)
 
+    @traced
     async def check_user_password(self, cmd: AuthCommand) -> User:
         user = await self.user_service.read_specific_user_by_username(
             query=ReadUserByUserNameQuery(username=cmd.username),
         )
-        if user is None or not password.check_password(cmd.password, user.password):
+        if user is None or not await self.password_hasher.check_password(
+            cmd.password,
+            user.password,
+        ):
             raise IncorrectUsernameOrPassword
 
         return user
 
+    @traced
     async def check_user_exist_refresh_token(
         self,
         query: ReadJWTTokenQueryByFingerprint,
@@ -65,6 +73,7 @@ class AuthService:
         except EmptyResult:
             return
 
+    @traced
     async def check_refresh_token_exists(self, query: ReadJWTTokenQuery) -> JWTToken:
         try:
             return await self.refresh_token_repository.read(
@@ -75,28 +84,38 @@ class AuthService:
         except EmptyResult:
             raise UnAuthorized
 
-    async def create_refresh_token(self, cmd: CreateJWTTokenCommand, access_token: str) -> JWTToken:
-        try:
-            rt: JWTToken = await self.refresh_token_repository.create(cmd=cmd)
-            at: AccessToken = await self.access_token_repository.create(cmd=AccessToken(refresh_id=rt.id,
-                                                                                        access_token=access_token))
-            return rt
-        except UniqueViolation:
-            return await self.refresh_token_repository.update(
-                cmd=UpdateJWTTokenCommand(
-                    user_id=cmd.user_id,
-                    refresh_token=cmd.refresh_token,
-                    fingerprint=cmd.fingerprint,
-                ),
-            )
+    @traced
+    async def open_session(self, cmd: CreateSessionCommand) -> JWTToken:
+        """Store new refresh and access tokens of device in one round trip."""
+        return await self.refresh_token_repository.create_session(cmd=cmd)
 
-    async def update_refresh_token(self, cmd: UpdateJWTTokenCommand, access_token: str) -> JWTToken:
-        rt: JWTToken = await self.refresh_token_repository.update(cmd)
-        at: AccessToken = await self.access_token_repository.update(
-            cmd=AccessToken(refresh_id=rt.id, access_token=access_token)
-        )
-        return rt
+    @traced
+    async def rotate_refresh_token(
+        self,
+        query: ReadJWTTokenQuery,
+        cmd: CreateSessionCommand,
+    ) -> JWTToken:
+        """Replace refresh token from ``query`` by the one from ``cmd``.
+
+        Check and replacement run in one transaction. The old row is locked, so
+        the same refresh token can not be used twice concurrently.
+
+        Raises:
+            UnAuthorized: when refresh token from ``query`` is not stored.
+            TokenExpired: when stored token belongs to other device.
+        """
+        async with transaction():
+            ref_tok = await self.check_refresh_token_exists(query=query)
+            # Lifetime of the token is checked by its ``exp`` claim on decode.
+            if (
+                cmd.fingerprint.get_secret_value()
+                != ref_tok.fingerprint.get_secret_value()
+            ):
+                raise TokenExpired
+
+            return await self.refresh_token_repository.create_session(cmd=cmd)
 
+    @traced
     async def delete_refresh_token(self, cmd: DeleteJWTTokenCommand) -> JWTToken:
         try:
             return await self.refresh_token_repository.delete(
@@ -0,0 +1,145 @@
+"""Background deletion of expired sessions.
+
+Refresh tokens are removed on logout and refresh only, so tokens of abandoned
+devices are deleted here: whole weekly partitions are dropped after retention
+and, optionally, expired rows of live partitions are deleted in small batches.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from prometheus_client import Counter, Gauge
+
+from app.internal.repository.postgresql import RefreshTokenRepository
+from app.pkg.logger import get_logger
+
+__all__ = ["SessionReaper"]
+
+_reaped_rows = Counter(
+    "session_reaper_deleted_rows_total",
+    "Expired refresh tokens deleted by session reaper.",
+    ["method"],
+)
+_reaped_rows_per_second = Gauge(
+    "session_reaper_rows_per_second",
+    "Expired refresh tokens deleted by batches per second during the last run.",
+    multiprocess_mode="livemax",
+)
+
+
+class SessionReaper:
+    """Periodically delete expired refresh tokens.
+
+    Every ``interval`` seconds partitions for next ``partitions_ahead`` weeks are
+    created and partitions older than retention are dropped. Then batches of
+    ``batch_size`` rows are deleted until a batch comes back incomplete or
+    ``max_batches`` batches are deleted. Each batch is its own short statement,
+    so locks are held only for ``batch_size`` rows, and batches are
+    ``batch_pause`` seconds apart, so a backlog doesn't saturate primary and
+    replication. ``batch_size=0`` disables row deletes, so tables never bloat.
+
+    A run holds an advisory lock, so reapers of other workers skip the same
+    interval instead of deleting the same rows at once.
+
+    With ``enabled=False`` nothing is deleted, but partitions are still created
+    every ``interval`` seconds: without them new tokens can't be inserted.
+    """
+
+    refresh_token_repository: RefreshTokenRepository
+    interval: float
+    batch_size: int
+    batch_pause: float
+    max_batches: int
+    partitions_ahead: int
+    enabled: bool
+
+    def __init__(
+        self,
+        refresh_token_repository: RefreshTokenRepository,
+        interval: float = 60.0,
+        batch_size: int = 500,
+        batch_pause: float = 0.1,
+        max_batches: int = 100,
+        partitions_ahead: int = 4,
+        enabled: bool = True,
+    ):
+        self.refresh_token_repository = refresh_token_repository
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.max_batches = max_batches
+        self.partitions_ahead = partitions_ahead
+        self.enabled = enabled
+        self.logger = get_logger("session_reaper")
+        self.__task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Run reaper in background task of current event loop."""
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run_forever())
+
+    async def stop(self) -> None:
+        """Cancel background task and wait for it."""
+        if self.__task is None:
+            return
+
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    async def ensure_partitions(self) -> None:
+        """Create partitions which will receive new refresh tokens."""
+        await self.refresh_token_repository.ensure_partitions(
+            weeks_ahead=self.partitions_ahead,
+        )
+
+    async def reap(self) -> int:
+        """Drop expired partitions and delete expired rows batch by batch.
+
+        Returns:
+            Count of deleted refresh tokens, estimated for dropped partitions.
+            ``0`` when the reaper of another worker is running.
+        """
+        async with self.refresh_token_repository.reaper_lock() as locked:
+            if not locked:
+                return 0
+
+            await self.ensure_partitions()
+            dropped = await self.refresh_token_repository.drop_expired_partitions()
+            _reaped_rows.labels(method="partition").inc(dropped)
+
+            started_at = time.monotonic()
+            total = 0
+            batches = 0
+            while self.batch_size:
+                if batches:
+                    await asyncio.sleep(self.batch_pause)
+                deleted = await self.refresh_token_repository.delete_expired(
+                    batch_size=self.batch_size,
+                )
+                total += deleted
+                batches += 1
+                _reaped_rows.labels(method="batch").inc(deleted)
+                if deleted < self.batch_size or batches == self.max_batches:
+                    break
+
+            elapsed = time.monotonic() - started_at
+            _reaped_rows_per_second.set(total / elapsed if elapsed > 0 else 0)
+            return dropped + total
+
+    async def __run_forever(self) -> None:
+        while True:
+            try:
+                if not self.enabled:
+                    await self.ensure_partitions()
+                elif deleted := await self.reap():
+                    self.logger.info("Deleted %s expired refresh tokens", deleted)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger.exception("Failed to maintain refresh tokens")
+            await asyncio.sleep(self.interval)
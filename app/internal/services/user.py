@@ -1,21 +1,31 @@
 """User service."""
-from typing import List
+from typing import AsyncIterator, List
 
+from app.internal.pkg.password.hasher import PasswordHasher
 from app.internal.repository.postgresql import UserRepository
 from app.internal.repository.repository import BaseRepository
 from app.pkg import models
 from app.pkg.models.exceptions.repository import UniqueViolation
 from app.pkg.models.exceptions.user import UserAlreadyExist
+from app.pkg.models.types import EncryptedSecretBytes
+from app.pkg.tracing import traced
 
 __all__ = ["UserService"]
 
 
 class UserService:
     repository: UserRepository
+    password_hasher: PasswordHasher
 
-    def __init__(self, user_repository: BaseRepository):
+    def __init__(
+        self,
+        user_repository: BaseRepository,
+        password_hasher: PasswordHasher,
+    ):
         self.repository = user_repository
+        self.password_hasher = password_hasher
 
+    @traced
     async def create_user(self, cmd: models.CreateUserCommand) -> models.User:
         """Function for create user. User password will be encrypted.
 
@@ -26,17 +36,31 @@ class UserService:
 
         Raises:
             UserAlreadyExist: when username of user already taken in repository.
+            PasswordHasherUnavailable: when too many passwords are hashed now.
         """
+        cmd.password = EncryptedSecretBytes(
+            await self.password_hasher.crypt_password(cmd.password.get_secret_value()),
+        )
         try:
-            cmd.password.crypt_password()
             return await self.repository.create(cmd=cmd)
         except UniqueViolation:
             raise UserAlreadyExist
 
+    @traced
     async def read_all_users(self) -> List[models.User]:
         """Read all users from repository."""
         return await self.repository.read_all()
 
+    @traced
+    async def read_users_page(self, query: models.ReadUsersPageQuery) -> List[models.User]:
+        """Read page of users ordered by id from repository."""
+        return await self.repository.read_page(query=query)
+
+    def stream_all_users(self, batch_size: int = 1000) -> AsyncIterator[models.User]:
+        """Iterate over all users without loading them in memory."""
+        return self.repository.stream_all(batch_size=batch_size)
+
+    @traced
     async def read_specific_user_by_username(
         self,
         query: models.ReadUserByUserNameQuery,
@@ -44,6 +68,7 @@ class UserService:
         """Read specific user from repository by username."""
         return await self.repository.read_by_username(query=query)
 
+    @traced
     async def read_specific_user_by_id(
         self,
         query: models.ReadUserByIdQuery,
@@ -51,12 +76,14 @@ class UserService:
         """Read specific user from repository by user id."""
         return await self.repository.read(query=query)
 
+    @traced
     async def change_password(
         self,
         cmd: models.ChangeUserPasswordCommand,
     ) -> models.User:
         ...
 
+    @traced
     async def delete_specific_user(self, cmd: models.DeleteUserCommand) -> models.User:
         """Delete specific user by user id."""
         return await self.repository.delete(cmd=cmd)
@@ -0,0 +1,41 @@
+"""Caches shared by services of the process."""
+
+from typing import Literal, Optional
+
+from pydantic import SecretStr
+
+from aiocache import RedisCache, SimpleMemoryCache
+from aiocache.base import BaseCache
+from aiocache.serializers import StringSerializer
+
+from .local import LocalCache
+from .two_tier import TwoTierCache
+
+__all__ = ["LocalCache", "TwoTierCache", "get_remote_cache"]
+
+
+def get_remote_cache(
+    backend: Literal["none", "memory", "redis"],
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    password: Optional[SecretStr] = None,
+) -> Optional[BaseCache]:
+    """Build shared tier of ``TwoTierCache``.
+
+    Args:
+        backend: ``redis``, ``memory`` as local stand-in of redis for tests
+            or ``none`` to disable the tier.
+        host: Redis host.
+        port: Redis port.
+        password: Redis password.
+    """
+    if backend == "redis":
+        return RedisCache(
+            endpoint=host,
+            port=port,
+            password=password.get_secret_value() if password else None,
+            serializer=StringSerializer(),
+        )
+    if backend == "memory":
+        return SimpleMemoryCache(serializer=StringSerializer())
+    return None
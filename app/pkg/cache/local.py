@@ -0,0 +1,56 @@
+"""In-process LRU with time to live."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+__all__ = ["LocalCache"]
+
+
+class LocalCache:
+    """Bounded LRU of values which expire ``ttl`` seconds after ``set``.
+
+    Not thread safe, it is meant to be used from one event loop.
+    """
+
+    maxsize: int
+    ttl: float
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize: Max count of values.
+            ttl: Seconds after which value is dropped.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value or None if it is missing or expired."""
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.__entries[key] = (value, time.monotonic() + self.ttl)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
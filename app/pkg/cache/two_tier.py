@@ -0,0 +1,145 @@
+"""Read-through cache with in-process and shared tiers."""
+
+from typing import Any, Callable, Optional
+
+from aiocache.base import BaseCache
+from prometheus_client import Counter
+
+from app.pkg.cache.local import LocalCache
+from app.pkg.logger import get_logger
+
+__all__ = ["TwoTierCache"]
+
+_cache_requests = Counter(
+    "cache_requests_total",
+    "Reads of two tier cache by tier and result.",
+    ["cache", "tier", "result"],
+)
+
+
+class TwoTierCache:
+    """Cache with ``LocalCache`` in front of optional ``aiocache`` backend.
+
+    Local tier keeps decoded values. Remote tier keeps values encoded by
+    ``encode`` under ``<name>:<key>`` and is shared between processes, so one
+    backend may serve several caches. Errors of remote tier are
+    logged and treated as a miss, so the cache never fails a request.
+
+    Examples:
+        ::
+
+            cache = TwoTierCache(
+                name="user:id",
+                local=LocalCache(maxsize=10000, ttl=60),
+                remote=RedisCache(endpoint="redis", port=6379),
+                ttl=60,
+                encode=lambda user: user.json(),
+                decode=User.parse_raw,
+            )
+            user = await cache.get("1")
+    """
+
+    name: str
+    local: Optional[LocalCache]
+    remote: Optional[BaseCache]
+    ttl: int
+
+    def __init__(
+        self,
+        name: str,
+        local: Optional[LocalCache],
+        remote: Optional[BaseCache] = None,
+        ttl: int = 60,
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ):
+        """
+        Args:
+            name: Prefix of keys in remote tier and value of ``cache`` label
+                in prometheus metrics.
+            local: In-process tier, None disables it.
+            remote: Shared tier, None disables it.
+            ttl: Seconds values are kept in remote tier.
+            encode: Convert value before it is written to remote tier.
+            decode: Convert value read from remote tier.
+        """
+        self.name = name
+        self.local = local
+        self.remote = remote
+        self.ttl = ttl
+        self.encode = encode
+        self.decode = decode
+        self.logger = get_logger(f"cache.{name}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from the first tier which has it or None."""
+        if self.local is not None:
+            value = self.local.get(key)
+            self.__count("local", value is not None)
+            if value is not None:
+                return value
+
+        if self.remote is None:
+            return None
+
+        try:
+            raw = await self.remote.get(self.__remote_key(key))
+        except Exception:
+            self.logger.exception("Failed to read %s from remote cache", key)
+            raw = None
+        self.__count("remote", raw is not None)
+        if raw is None:
+            return None
+
+        value = self.decode(raw)
+        if self.local is not None:
+            self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        if self.local is not None:
+            self.local.set(key, value)
+        if self.remote is not None:
+            try:
+                await self.remote.set(
+                    self.__remote_key(key),
+                    self.encode(value),
+                    ttl=self.ttl,
+                )
+            except Exception:
+                self.logger.exception("Failed to write %s to remote cache", key)
+
+    async def delete(self, *keys: str) -> None:
+        """Delete keys from both tiers."""
+        self.evict_local(*keys)
+        if self.remote is not None:
+            for key in keys:
+                try:
+                    await self.remote.delete(self.__remote_key(key))
+                except Exception:
+                    self.logger.exception("Failed to delete %s from remote cache", key)
+
+    def evict_local(self, *keys: str) -> None:
+        """Delete keys from in-process tier only."""
+        if self.local is not None:
+            for key in keys:
+                self.local.delete(key)
+
+    def get_local(self, key: str) -> Optional[Any]:
+        """Get value from in-process tier only."""
+        return self.local.get(key) if self.local is not None else None
+
+    def clear_local(self) -> None:
+        """Delete all keys from in-process tier."""
+        if self.local is not None:
+            self.local.clear()
+
+    def __remote_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def __count(self, tier: str, hit: bool) -> None:
+        _cache_requests.labels(
+            cache=self.name,
+            tier=tier,
+            result="hit" if hit else "miss",
+        ).inc()
@@ -6,9 +6,10 @@ from app.pkg.settings import settings
 
 from .mysql import Mysql
 from .postgresql import Postgresql
+from .postgresql_asyncpg import AsyncpgPostgresql
 from .sqlite import SQLite
 
-__all__ = ["Connectors", "SQLite", "Postgresql", "Mysql"]
+__all__ = ["Connectors", "SQLite", "Postgresql", "AsyncpgPostgresql", "Mysql"]
 
 
 class Connectors(containers.DeclarativeContainer):
@@ -19,13 +20,40 @@ class Connectors(containers.DeclarativeContainer):
         pydantic_settings=[settings],
     )
 
-    postgresql = providers.Factory(
-        Postgresql,
-        username=configuration.POSTGRES_USER,
-        password=configuration.POSTGRES_PASSWORD,
-        host=configuration.POSTGRES_HOST,
-        port=configuration.POSTGRES_PORT,
-        database_name=configuration.POSTGRES_DATABASE_NAME,
+    #: Single connector per process, so all repositories share one pool.
+    postgresql = providers.Selector(
+        configuration.POSTGRES_DRIVER,
+        aiopg=providers.Singleton(
+            Postgresql,
+            username=configuration.POSTGRES_USER,
+            password=configuration.POSTGRES_PASSWORD,
+            host=configuration.POSTGRES_HOST,
+            port=configuration.POSTGRES_PORT,
+            database_name=configuration.POSTGRES_DATABASE_NAME,
+            pool_min_size=configuration.POSTGRES_POOL_MIN_SIZE,
+            pool_max_size=configuration.POSTGRES_POOL_MAX_SIZE,
+            pool_acquire_timeout=configuration.POSTGRES_POOL_ACQUIRE_TIMEOUT,
+            pool_recycle=configuration.POSTGRES_POOL_RECYCLE,
+            replicas=configuration.POSTGRES_REPLICAS,
+            sticky_primary_ms=configuration.POSTGRES_STICKY_PRIMARY_MS,
+            replica_backoff=configuration.POSTGRES_REPLICA_BACKOFF,
+        ),
+        asyncpg=providers.Singleton(
+            AsyncpgPostgresql,
+            username=configuration.POSTGRES_USER,
+            password=configuration.POSTGRES_PASSWORD,
+            host=configuration.POSTGRES_HOST,
+            port=configuration.POSTGRES_PORT,
+            database_name=configuration.POSTGRES_DATABASE_NAME,
+            pool_min_size=configuration.POSTGRES_POOL_MIN_SIZE,
+            pool_max_size=configuration.POSTGRES_POOL_MAX_SIZE,
+            pool_acquire_timeout=configuration.POSTGRES_POOL_ACQUIRE_TIMEOUT,
+            pool_recycle=configuration.POSTGRES_POOL_RECYCLE,
+            replicas=configuration.POSTGRES_REPLICAS,
+            sticky_primary_ms=configuration.POSTGRES_STICKY_PRIMARY_MS,
+            replica_backoff=configuration.POSTGRES_REPLICA_BACKOFF,
+            statement_cache_size=configuration.POSTGRES_STATEMENT_CACHE_SIZE,
+        ),
     )
 
     # sqlite = providers.Factory(SQLite, sqlite_path=configuration.SQLITE_PATH)
@@ -0,0 +1,60 @@
+"""Circuit breaker of calls to an upstream."""
+
+import time
+from typing import Literal
+
+__all__ = ["CircuitBreaker"]
+
+
+class CircuitBreaker:
+    """Stop calling upstream after ``failure_threshold`` failures in a row.
+
+    While the circuit is open calls are rejected at once, so a slow upstream
+    does not pile up waiting coroutines. After ``reset_timeout`` seconds one
+    trial call is let through: its success closes the circuit and its failure
+    opens it again.
+    """
+
+    failure_threshold: int
+    reset_timeout: float
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Failures in a row which open the circuit.
+                ``0`` disables the breaker.
+            reset_timeout: Seconds the circuit stays open.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__trial = False
+
+    @property
+    def state(self) -> Literal["closed", "open", "half-open"]:
+        if not self.failure_threshold or self.__failures < self.failure_threshold:
+            return "closed"
+        if time.monotonic() - self.__opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.__trial:
+            self.__trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.__failures = 0
+        self.__trial = False
+
+    def record_failure(self) -> None:
+        self.__failures += 1
+        self.__trial = False
+        if self.failure_threshold and self.__failures >= self.failure_threshold:
+            self.__opened_at = time.monotonic()
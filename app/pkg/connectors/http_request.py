@@ -1,41 +1,179 @@
-from typing import Literal
+import asyncio
+import random
+import weakref
+from typing import ClassVar, Literal, Optional
 
 import httpx
 import pydantic
 
 __all__ = ["HttpRequests"]
 
+from app.pkg.connectors.circuit_breaker import CircuitBreaker
 from app.pkg.models.exceptions.client import ClientException
 from app.pkg.logger import get_logger
 
+#: Methods which may be sent again without changing the result.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+#: Statuses of overloaded or restarting upstream, worth a retry.
+RETRY_STATUSES = frozenset({502, 503, 504})
+
 
 class HttpRequests:
+    """Client of one upstream with a long-lived pool of connections.
+
+    Connections are kept alive between calls and shared by all coroutines of
+    the process. Idempotent requests are retried on transport errors and
+    ``RETRY_STATUSES`` with exponential backoff and full jitter. Calls are
+    rejected at once while ``CircuitBreaker`` is open.
+
+    Call ``close`` or ``close_all`` on shutdown to release connections.
+    """
+
+    #: Every instance of the process, closed by ``close_all``.
+    instances: ClassVar["weakref.WeakSet[HttpRequests]"] = weakref.WeakSet()
+
     client_name: str
     AUTH_X_TOKEN: pydantic.SecretStr
     url: pydantic.AnyUrl
+    retries: int
+    backoff: float
 
-    def __init__(self, x_token: pydantic.SecretStr, url: pydantic.AnyUrl, client_name: str):
+    def __init__(
+        self,
+        x_token: pydantic.SecretStr,
+        url: pydantic.AnyUrl,
+        client_name: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout: float = 5.0,
+        connect_timeout: float = 1.0,
+        http2: bool = False,
+        retries: int = 2,
+        backoff: float = 0.1,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            x_token: Value of ``X-ACCESS-TOKEN`` header.
+            url: Base url of upstream.
+            client_name: Name of upstream in logs and errors.
+            max_connections: Upper bound of opened connections.
+            max_keepalive_connections: Idle connections kept open.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            timeout: Seconds to wait for a free connection, to write request
+                and to read response.
+            connect_timeout: Seconds to open a connection.
+            http2: Use HTTP/2, requires ``h2`` package (``httpx[http2]``).
+            retries: Repeats of failed idempotent request.
+            backoff: Upper bound of delay before the first retry in seconds,
+                doubled on every next retry.
+            failure_threshold: Failed calls in a row which open the circuit.
+            reset_timeout: Seconds the circuit stays open.
+        """
         self.AUTH_X_TOKEN = x_token
         self.url = url
         self.client_name = client_name
+        self.retries = retries
+        self.backoff = backoff
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.http2 = http2
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+        )
         self.logger = get_logger(self.client_name)
+        self.__client: Optional[httpx.AsyncClient] = None
+        self.instances.add(self)
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Client shared by all requests, opened on first use."""
+        if self.__client is None or self.__client.is_closed:
+            self.__client = httpx.AsyncClient(
+                base_url=str(self.url),
+                headers={"X-ACCESS-TOKEN": self.AUTH_X_TOKEN.get_secret_value()},
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+        return self.__client
+
+    async def close(self) -> None:
+        """Close all connections of the pool."""
+        if self.__client is None:
+            return
+
+        client, self.__client = self.__client, None
+        await client.aclose()
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close pools of all instances of the process."""
+        for instance in list(cls.instances):
+            await instance.close()
 
     async def do_request(
-            self, method: Literal["GET", "POST"], path: str = None, **kwargs
+            self,
+            method: Literal["GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"],
+            path: str = None,
+            **kwargs,
     ) -> httpx.Response:
-        async with httpx.AsyncClient(
-                headers={"X-ACCESS-TOKEN": self.AUTH_X_TOKEN.get_secret_value()},
-        ) as client:
-            try:
-                response = await client.request(
-                    method=method, url=f"{self.url}/{path}", **kwargs
+        """Send request to ``path`` of upstream.
+
+        Raises:
+            ClientException: when circuit is open, upstream is unreachable or
+                responded with an unsuccessful status.
+        """
+        if not self.circuit_breaker.allow():
+            self.logger.warning("circuit is open, request is rejected")
+            raise ClientException(message="%s is not available now" % self.client_name)
+
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        succeeded = False
+        try:
+            for attempt in range(attempts):
+                if attempt:
+                    await asyncio.sleep(
+                        random.uniform(0, self.backoff * 2 ** (attempt - 1)),
+                    )
+
+                try:
+                    response = await self.get_client().request(
+                        method=method, url=f"/{path or ''}", **kwargs
+                    )
+                except httpx.TransportError as e:
+                    self.logger.warning("exception: %s" % e)
+                    continue
+                except Exception as e:
+                    self.logger.exception("exception: %s" % e)
+                    raise ClientException(
+                        message="%s is not available now" % self.client_name,
+                    )
+
+                if response.status_code in RETRY_STATUSES:
+                    self.logger.warning("status: %s" % response)
+                    continue
+
+                succeeded = True
+                if response.is_success:
+                    return response
+                self.logger.error("status: %s" % response)
+                raise ClientException(
+                    message="%s is not available now" % self.client_name,
                 )
-            except Exception as e:
-                self.logger.exception("exception: %s" % e)
-                raise ClientException(message="%s is not available now" % self.client_name)
 
-            if response.is_success:
-                return response
+            raise ClientException(message="%s is not available now" % self.client_name)
+        finally:
+            # Also runs on cancellation, so a cancelled trial call of half-open
+            # circuit does not keep it closed for other calls forever.
+            if succeeded:
+                self.circuit_breaker.record_success()
             else:
-                self.logger.exception("status: %s" % response)
-                raise ClientException(message="%s is not available now" % self.client_name)
+                self.circuit_breaker.record_failure()
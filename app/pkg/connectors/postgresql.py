@@ -1,15 +1,34 @@
 """Postgresql connector."""
 
-from contextlib import asynccontextmanager
+import itertools
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import aiopg
 import pydantic
 from aiopg import Connection
+from prometheus_client import Gauge, Histogram
+
+from app.pkg.logger import get_logger
 
 from .base_connector import BaseConnector
 
 __all__ = ["Postgresql"]
 
+_acquire_seconds = Histogram(
+    "postgres_pool_acquire_seconds",
+    "Time spent waiting for a free connection of the pool.",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60),
+)
+_pool_connections = Gauge(
+    "postgres_pool_connections",
+    "Opened connections of the pool by state.",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+
 
 class Postgresql(BaseConnector):
     def __init__(
@@ -19,6 +38,13 @@ class Postgresql(BaseConnector):
         host: pydantic.PositiveInt,
         port: pydantic.PositiveInt,
         database_name: str,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+        pool_acquire_timeout: float = 60.0,
+        pool_recycle: float = -1,
+        replicas: Sequence[str] = (),
+        sticky_primary_ms: int = 500,
+        replica_backoff: float = 30.0,
     ):
         """Settings for create postgresql dsn.
 
@@ -28,34 +54,200 @@ class Postgresql(BaseConnector):
             host: the host where the database is located.
             port: the port of database server.
             database_name: database name.
+            pool_min_size: connections opened when the pool is created.
+            pool_max_size: upper bound of simultaneously opened connections.
+            pool_acquire_timeout: seconds to wait for a free connection.
+            pool_recycle: seconds after which an idle connection is reopened.
+                ``-1`` keeps connections forever.
+            replicas: ``host`` or ``host:port`` of read replicas. They share
+                credentials and database name with primary, each gets its own
+                pool of the same size.
+            sticky_primary_ms: milliseconds reads stay on primary after a write
+                of the same request, see ``get_connection``.
+            replica_backoff: seconds a replica is skipped after it failed to
+                give a connection or lost one.
         """
         self.pool = None
+        self.replica_pools: Dict[Tuple[str, int], aiopg.Pool] = {}
         self.username = username
         self.password = password
         self.host = host
         self.port = port
         self.database_name = database_name
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_acquire_timeout = pool_acquire_timeout
+        self.pool_recycle = pool_recycle
+        self.replicas = [self.__parse_replica(replica) for replica in replicas]
+        self.sticky_primary_ms = sticky_primary_ms
+        self.replica_backoff = replica_backoff
+        self.logger = get_logger("postgresql")
+        self.__next_replica = itertools.cycle(self.replicas)
+        self.__replica_down_until: Dict[Tuple[str, int], float] = {}
 
-    def get_dsn(self):
-        """Description of ``BaseConnector.get_dsn``."""
+    def get_dsn(self, host: Optional[str] = None, port: Optional[int] = None):
+        """Description of ``BaseConnector.get_dsn``.
+
+        Args:
+            host: host of replica, primary by default.
+            port: port of replica, primary by default.
+        """
         return (
             f"postgresql://"
             f"{self.username}:"
             f"{self.password.get_secret_value()}@"
-            f"{self.host}:{self.port}/"
+            f"{host or self.host}:{port or self.port}/"
             f"{self.database_name}"
         )
 
+    async def create_pool(self) -> aiopg.Pool:
+        """Open the process-wide pool of connections to primary.
+
+        Calling this more than once returns the already opened pool.
+
+        Returns:
+            ``aiopg.Pool`` instance.
+        """
+        if self.pool is not None:
+            return self.pool
+
+        pool = await self._open_pool(self.get_dsn())
+        # Another coroutine may have opened the pool while we were connecting.
+        if self.pool is None:
+            self.pool = pool
+        else:
+            await self._close_pool(pool)
+        return self.pool
+
+    async def create_replica_pool(self, host: str, port: int) -> aiopg.Pool:
+        """Open the process-wide pool of connections to replica."""
+        if (pool := self.replica_pools.get((host, port))) is not None:
+            return pool
+
+        pool = await self._open_pool(self.get_dsn(host=host, port=port))
+        if (host, port) not in self.replica_pools:
+            self.replica_pools[(host, port)] = pool
+        else:
+            await self._close_pool(pool)
+        return self.replica_pools[(host, port)]
+
+    async def close_pool(self) -> None:
+        """Close all connections of primary and replica pools and wait until
+        they are released."""
+        pools = list(self.replica_pools.values())
+        self.replica_pools = {}
+        if self.pool is not None:
+            pools.append(self.pool)
+            self.pool = None
+
+        for pool in pools:
+            await self._close_pool(pool)
+
     @asynccontextmanager
-    async def get_connect(self) -> Connection:
-        """Create pool of connectors to a Postgres database.
+    async def get_connect(self, read_only: bool = False) -> Connection:
+        """Acquire connection from the long-lived pool.
+
+        Notes:
+            The pool is opened in ``on_startup``. When the connector is used
+            outside the server (scripts, tests), it is opened lazily on first use.
+
+        Args:
+            read_only: take connection of the next replica in round robin.
+                Primary is used when there are no replicas or none of them is
+                up. A replica which fails to open its pool or to give a
+                connection is skipped for ``replica_backoff`` seconds, and the
+                connection is taken from primary instead. So is a replica whose
+                connection is lost during the query, but that query fails.
 
         Yields:
             ``aiopg.Connection instance`` in asynchronous context manager.
         """
-        if self.pool is None:
-            self.pool = aiopg.create_pool(dsn=self.get_dsn())
+        replica = self.__next_replica_up() if read_only else None
+        pool, name = None, "primary"
+        try:
+            async with AsyncExitStack() as stack:
+                conn = None
+                if replica is not None:
+                    try:
+                        conn, pool, name = await self.__acquire(stack, replica)
+                    except Exception:
+                        self.logger.exception(
+                            "Replica %s:%s is not available",
+                            *replica,
+                        )
+                        self.__mark_replica_down(replica)
+                        replica = None
+                if conn is None:
+                    conn, pool, name = await self.__acquire(stack, None)
+
+                try:
+                    yield conn
+                except BaseException:
+                    if replica is not None and self._is_closed(conn):
+                        self.logger.error("Replica %s:%s lost connection", *replica)
+                        self.__mark_replica_down(replica)
+                    raise
+        finally:
+            if pool is not None:
+                self.__report_pool(pool, name)
+
+    async def _open_pool(self, dsn: str) -> aiopg.Pool:
+        """Open pool of connections to ``dsn``, overridden by other drivers."""
+        return await aiopg.create_pool(
+            dsn=dsn,
+            minsize=self.pool_min_size,
+            maxsize=self.pool_max_size,
+            timeout=self.pool_acquire_timeout,
+            pool_recycle=self.pool_recycle,
+        )
+
+    async def _close_pool(self, pool: aiopg.Pool) -> None:
+        pool.close()
+        await pool.wait_closed()
+
+    def _is_closed(self, conn: Any) -> bool:
+        """Connection is lost and will be dropped by the pool."""
+        return bool(conn.closed)
+
+    def _pool_stats(self, pool: aiopg.Pool) -> Tuple[int, int]:
+        """Count of opened and idle connections of the pool."""
+        return pool.size, pool.freesize
+
+    def __report_pool(self, pool: aiopg.Pool, name: str) -> None:
+        size, idle = self._pool_stats(pool)
+        _pool_connections.labels(pool=name, state="in_use").set(size - idle)
+        _pool_connections.labels(pool=name, state="idle").set(idle)
+
+    async def __acquire(
+        self,
+        stack: AsyncExitStack,
+        replica: Optional[Tuple[str, int]],
+    ) -> Tuple[Connection, aiopg.Pool, str]:
+        """Acquire connection of replica or primary, released with ``stack``."""
+        if replica is None:
+            pool, name = await self.create_pool(), "primary"
+        else:
+            host, port = replica
+            pool, name = await self.create_replica_pool(host, port), f"{host}:{port}"
+
+        started_at = time.perf_counter()
+        conn = await stack.enter_async_context(pool.acquire())
+        _acquire_seconds.labels(pool=name).observe(time.perf_counter() - started_at)
+        self.__report_pool(pool, name)
+        return conn, pool, name
+
+    def __next_replica_up(self) -> Optional[Tuple[str, int]]:
+        """Next replica in round robin which is not backing off."""
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            replica = next(self.__next_replica)
+            if self.__replica_down_until.get(replica, 0) <= now:
+                return replica
+        return None
+
+    def __mark_replica_down(self, replica: Tuple[str, int]) -> None:
+        self.__replica_down_until[replica] = time.monotonic() + self.replica_backoff
 
-        async with self.pool as pool:
-            async with pool.acquire() as conn:
-                yield conn
+    def __parse_replica(self, replica: str) -> Tuple[str, int]:
+        host, _, port = replica.partition(":")
+        return host, int(port) if port else self.port
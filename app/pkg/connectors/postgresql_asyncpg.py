@@ -0,0 +1,192 @@
+"""Postgresql connector on asyncpg.
+
+asyncpg talks binary protocol and runs every query as a prepared statement.
+Repositories are written for aiopg ``RealDictCursor``, so connections are
+wrapped into ``AsyncpgConnection``, whose cursors take the same ``%(name)s``
+queries and return rows as dicts.
+
+Requires ``asyncpg`` package, it is imported only when the connector opens
+its first pool.
+"""
+
+import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .postgresql import Postgresql
+
+__all__ = ["AsyncpgPostgresql", "AsyncpgConnection", "AsyncpgCursor", "convert_query"]
+
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%%")
+_WRITE_WITHOUT_RETURNING = re.compile(
+    r"^\s*(insert|update|delete)\b(?!.*\breturning\b)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=1024)
+def convert_query(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """Replace pyformat placeholders of query by positional ``$n``.
+
+    Examples:
+        ::
+
+            >>> convert_query("select %(id)s, %(name)s, %(id)s")
+            ('select $1, $2, $1', ('id', 'name'))
+
+    Returns:
+        Query for asyncpg and names of parameters in order of their positions.
+    """
+    names: List[str] = []
+
+    def replace(match: "re.Match") -> str:
+        name = match.group(1)
+        if name is None:
+            return "%"
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _PLACEHOLDER.sub(replace, query), tuple(names)
+
+
+class AsyncpgCursor:
+    """Subset of ``aiopg.Cursor`` used by repositories.
+
+    Queries go through the statement cache of asyncpg connection, so each of
+    them is prepared once per connection.
+    """
+
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.rowcount = -1
+        self.__rows: List[Dict[str, Any]] = []
+
+    async def __aenter__(self) -> "AsyncpgCursor":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.__rows = []
+
+    async def execute(self, query: str, params: Optional[Mapping[str, Any]] = None):
+        args: List[Any] = []
+        if params is not None:
+            query, names = convert_query(query)
+            args = [params[name] for name in names]
+
+        # Only the status of writes without ``returning`` holds count of rows.
+        if _WRITE_WITHOUT_RETURNING.match(query):
+            status = await self.connection.execute(query, *args)
+            count = status.rpartition(" ")[2]
+            self.rowcount = int(count) if count.isdigit() else -1
+            self.__rows = []
+            return
+
+        records = await self.connection.fetch(query, *args)
+        self.__rows = [dict(record) for record in records]
+        self.rowcount = len(self.__rows)
+
+    async def fetchone(self) -> Optional[Dict[str, Any]]:
+        return self.__rows.pop(0) if self.__rows else None
+
+    async def fetchall(self) -> List[Dict[str, Any]]:
+        rows, self.__rows = self.__rows, []
+        return rows
+
+
+class AsyncpgConnection:
+    """Wrapper of asyncpg connection with ``cursor`` of aiopg connection."""
+
+    def __init__(self, connection: Any):
+        self.raw = connection
+
+    async def cursor(self, cursor_factory: Any = None) -> AsyncpgCursor:
+        """Rows are always dicts, ``cursor_factory`` is ignored."""
+        return AsyncpgCursor(self.raw)
+
+
+class AsyncpgPostgresql(Postgresql):
+    """``Postgresql`` with pools of asyncpg instead of aiopg.
+
+    Takes the same arguments, plus ``statement_cache_size``: count of prepared
+    statements kept by each connection.
+    """
+
+    def __init__(self, *args, statement_cache_size: int = 256, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statement_cache_size = statement_cache_size
+
+    @asynccontextmanager
+    async def get_connect(self, read_only: bool = False) -> AsyncpgConnection:
+        """Description of ``Postgresql.get_connect``.
+
+        Yields:
+            ``AsyncpgConnection`` in asynchronous context manager.
+        """
+        async with super().get_connect(read_only=read_only) as connection:
+            yield AsyncpgConnection(connection)
+
+    async def _open_pool(self, dsn: str):
+        import asyncpg
+
+        return _AcquireTimeoutPool(
+            await asyncpg.create_pool(
+                dsn=dsn,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                max_inactive_connection_lifetime=max(self.pool_recycle, 0),
+                statement_cache_size=self.statement_cache_size,
+                init=_init_connection,
+                connection_class=_connection_class(),
+            ),
+            timeout=self.pool_acquire_timeout,
+        )
+
+    async def _close_pool(self, pool: "_AcquireTimeoutPool") -> None:
+        await pool.pool.close()
+
+    def _is_closed(self, conn: Any) -> bool:
+        return conn.is_closed()
+
+    def _pool_stats(self, pool: "_AcquireTimeoutPool") -> Tuple[int, int]:
+        return pool.pool.get_size(), pool.pool.get_idle_size()
+
+
+@lru_cache(maxsize=None)
+def _connection_class():
+    """asyncpg connection released to pool without reset query.
+
+    Like aiopg, only an open transaction is rolled back on release. Session
+    state is not changed by repositories, so the extra round trip of
+    ``RESET ALL`` on every release is skipped.
+    """
+    import asyncpg
+
+    class Connection(asyncpg.Connection):
+        def get_reset_query(self) -> str:
+            return ""
+
+    return Connection
+
+
+async def _init_connection(connection: Any) -> None:
+    """Accept ``str`` for ``bytea`` as psycopg2 does for ``%(value)s::bytea``."""
+    await connection.set_type_codec(
+        "bytea",
+        schema="pg_catalog",
+        encoder=lambda value: value.encode() if isinstance(value, str) else bytes(value),
+        decoder=bytes,
+        format="binary",
+    )
+
+
+class _AcquireTimeoutPool:
+    """asyncpg pool which waits for a connection at most ``timeout`` seconds."""
+
+    def __init__(self, pool: Any, timeout: float):
+        self.pool = pool
+        self.timeout = timeout
+
+    def acquire(self):
+        return self.pool.acquire(timeout=self.timeout)
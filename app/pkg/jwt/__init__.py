@@ -1,8 +1,12 @@
+from typing import Optional
+
 from dependency_injector import containers, providers
 
 from app.pkg.settings import settings
 
 from .access import JwtAccessBearer
+from .cache import VerifiedTokenCache
+from .codec import ASYMMETRIC_ALGORITHMS, JwtCodec, KeySet, get_codec
 from .credentionals import JwtAuthorizationCredentials
 from .exceptions import TokenTimeExpired, UnAuthorized, WrongToken
 from .refresh import JwtRefreshBearer
@@ -17,24 +21,64 @@ __all__ = [
     "UnAuthorized",
     "TokenTimeExpired",
     "WrongToken",
+    "VerifiedTokenCache",
+    "JwtCodec",
+    "KeySet",
+    "key_set",
 ]
 
+#: Asymmetric keys, loaded only when ``JWT_ALGORITHM`` is ES256 or EdDSA.
+key_set: Optional[KeySet] = (
+    KeySet(
+        keys_dir=settings.JWT_KEYS_DIR,
+        active_kid=settings.JWT_ACTIVE_KID,
+        reload_interval=settings.JWT_KEYS_RELOAD_INTERVAL,
+    )
+    if settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS
+    else None
+)
+
+#: Codec shared by all jwt handlers, keys are prepared only once.
+codec = get_codec(
+    engine=settings.JWT_CODEC,
+    secret_key=settings.JWT_SECRET_KEY.get_secret_value(),
+    algorithm=settings.JWT_ALGORITHM,
+    key_set=key_set,
+)
+
+
+def _verified_cache(name: str) -> Optional[VerifiedTokenCache]:
+    """Build cache of verified tokens, if it is enabled in settings."""
+    if not settings.JWT_VERIFIED_CACHE_SIZE:
+        return None
+    return VerifiedTokenCache(maxsize=settings.JWT_VERIFIED_CACHE_SIZE, name=name)
+
 
-access_security = JwtAccessBearer(secret_key=settings.JWT_SECRET_KEY.get_secret_value())
+access_security = JwtAccessBearer(
+    secret_key=settings.JWT_SECRET_KEY.get_secret_value(),
+    verified_cache=_verified_cache("access"),
+    codec=codec,
+)
 
 refresh_security = JwtRefreshBearer(
     secret_key=settings.JWT_SECRET_KEY.get_secret_value(),
+    verified_cache=_verified_cache("refresh"),
+    codec=codec,
 )
 
 
 class JWT(containers.DeclarativeContainer):
     """Dependency factory injector for JWT."""
 
+    key_set: Optional[KeySet] = providers.Object(key_set)
+
     access: JwtAccessBearer = providers.Factory(
         JwtAccessBearer,
         secret_key=settings.JWT_SECRET_KEY.get_secret_value(),
+        codec=codec,
     )
     refresh: JwtRefreshBearer = providers.Factory(
         JwtRefreshBearer,
         secret_key=settings.JWT_SECRET_KEY.get_secret_value(),
+        codec=codec,
     )
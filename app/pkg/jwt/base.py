@@ -1,7 +1,6 @@
 import uuid
 from abc import ABC
 from datetime import datetime, timedelta
-from hmac import compare_digest
 from typing import Any, Dict, Optional, Set, Tuple
 from uuid import uuid4
 
@@ -12,14 +11,11 @@ from jose import jwt
 __all__ = ["JwtAuthBase"]
 
 from app.pkg.settings import settings
+from app.pkg.timing import measure
 
-from .exceptions import (
-    CSRFError,
-    JWTDecodeError,
-    TokenTimeExpired,
-    UnAuthorized,
-    WrongToken,
-)
+from .cache import VerifiedTokenCache
+from .codec import CodecError, CodecExpiredError, JwtCodec, get_codec
+from .exceptions import JWTDecodeError, TokenTimeExpired, UnAuthorized, WrongToken
 
 
 class JwtAuthBase(ABC):
@@ -59,23 +55,26 @@ class JwtAuthBase(ABC):
         algorithm: str = jwt.ALGORITHMS.HS256,
         access_expires_delta: Optional[timedelta] = None,
         refresh_expires_delta: Optional[timedelta] = None,
+        verified_cache: Optional[VerifiedTokenCache] = None,
+        codec: Optional[JwtCodec] = None,
     ):
         if places:
             assert places.issubset(
                 {"header", "cookie"},
             ), "only 'header'/'cookie' are supported"
-        algorithm = algorithm.upper()
-        assert (
-            hasattr(jwt.ALGORITHMS, algorithm) is True
-        ), f"{algorithm} algorithm is not supported by python-jose library"
-
         self.secret_key = secret_key
+        self.codec = codec or get_codec(
+            engine=settings.JWT_CODEC,
+            secret_key=secret_key,
+            algorithm=algorithm,
+        )
 
         self.places = places or {"header"}
         self.auto_error = auto_error
-        self.algorithm = algorithm
+        self.algorithm = self.codec.algorithm
         self.access_expires_delta = access_expires_delta or timedelta(days=15)
         self.refresh_expires_delta = refresh_expires_delta or timedelta(days=31)
+        self.verified_cache = verified_cache
 
     @classmethod
     def from_other(
@@ -86,51 +85,52 @@ class JwtAuthBase(ABC):
         algorithm: Optional[str] = None,
         access_expires_delta: Optional[timedelta] = None,
         refresh_expires_delta: Optional[timedelta] = None,
+        verified_cache: Optional[VerifiedTokenCache] = None,
     ) -> "JwtAuthBase":
+        """Copy of ``other`` with some settings replaced.
+
+        The copy shares codec and cache of verified tokens with ``other``.
+        With another ``secret_key`` or ``algorithm`` neither is shared: a token
+        verified by the key of ``other`` must be verified again by the new one,
+        so the copy caches only in ``verified_cache``, if it is given.
+        """
+        rekeyed = bool(secret_key or algorithm)
         return cls(
             secret_key=secret_key or other.secret_key,
             auto_error=auto_error or other.auto_error,
             algorithm=algorithm or other.algorithm,
             access_expires_delta=access_expires_delta or other.access_expires_delta,
             refresh_expires_delta=refresh_expires_delta or other.refresh_expires_delta,
+            verified_cache=verified_cache or (None if rekeyed else other.verified_cache),
+            codec=None if rekeyed else other.codec,
         )
 
     def _decode(self, token: str) -> Optional[Dict[str, Any]]:
+        if self.verified_cache is not None:
+            payload = self.verified_cache.get(token)
+            if payload is not None:
+                return payload
+
         try:
-            payload: Dict[str, Any] = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm],
-                options={"leeway": 10},
-            )
-        except jwt.ExpiredSignatureError as e:
+            with measure("jwt"):
+                payload: Dict[str, Any] = self.codec.decode(token, leeway=10)
+        except CodecExpiredError as e:
             if self.auto_error:
                 raise TokenTimeExpired(e)
             else:
                 return None
-        except jwt.JWTError as e:
+        except CodecError as e:
             if self.auto_error:
                 raise WrongToken(e)
             else:
                 return None
-        else:
-            csrf_value = (
-                jwt.decode(
-                    token,
-                    self.secret_key,
-                    algorithms=[self.algorithm],
-                    options={"leeway": 10, "verify_signature": False},
-                ).get("csrf", None),
-            )
-            if csrf_value:
-                if "csrf" not in payload:
-                    raise JWTDecodeError
-                if not compare_digest(payload["csrf"], csrf_value[0]):
-                    raise CSRFError
-                else:
-                    return payload
-            else:
-                raise JWTDecodeError
+
+        if "csrf" not in payload:
+            raise JWTDecodeError
+
+        if self.verified_cache is not None:
+            self.verified_cache.set(token, payload)
+        return payload
 
     @staticmethod
     def _generate_payload(
@@ -187,11 +187,8 @@ class JwtAuthBase(ABC):
             unique_identifier,
             "access",
         )
-        jwt_encoded: str = jwt.encode(
-            to_encode,
-            self.secret_key,
-            algorithm=self.algorithm,
-        )
+        with measure("jwt"):
+            jwt_encoded: str = self.codec.encode(to_encode)
         return jwt_encoded
 
     def create_refresh_token(
@@ -208,11 +205,8 @@ class JwtAuthBase(ABC):
             unique_identifier,
             "refresh",
         )
-        jwt_encoded: str = jwt.encode(
-            to_encode,
-            self.secret_key,
-            algorithm=self.algorithm,
-        )
+        with measure("jwt"):
+            jwt_encoded: str = self.codec.encode(to_encode)
         return jwt_encoded
 
     @staticmethod
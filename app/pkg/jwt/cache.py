@@ -0,0 +1,92 @@
+"""Bounded LRU of already verified tokens."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+__all__ = ["VerifiedTokenCache", "token_digest"]
+
+_cache_hits = Counter(
+    "jwt_verified_cache_hits_total",
+    "Tokens whose verification was skipped thanks to the cache.",
+    ["cache"],
+)
+_cache_misses = Counter(
+    "jwt_verified_cache_misses_total",
+    "Tokens which had to be verified and decoded.",
+    ["cache"],
+)
+
+
+def token_digest(token: str) -> str:
+    """Key of token in cache.
+
+    Raw tokens are not kept in memory, only their sha256.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """LRU of decoded payloads keyed by token digest.
+
+    Entries are dropped when they are read after ``exp`` claim of the token,
+    so an expired token is always verified again and rejected by codec.
+    """
+
+    maxsize: int
+    name: str
+
+    def __init__(self, maxsize: int, name: str = "default"):
+        """
+        Args:
+            maxsize: Max count of cached tokens.
+            name: Value of ``cache`` label in prometheus metrics.
+        """
+        self.maxsize = maxsize
+        self.name = name
+        self.__entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.__hits = _cache_hits.labels(cache=name)
+        self.__misses = _cache_misses.labels(cache=name)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get payload of verified token or None."""
+        key = token_digest(token)
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses.inc()
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self.__entries[key]
+            self.__misses.inc()
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits.inc()
+        return payload
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        """Remember payload of verified token until its ``exp`` claim."""
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+
+        key = token_digest(token)
+        self.__entries[key] = (payload, float(expires_at))
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+
+    def evict(self, digest: str) -> None:
+        """Forget token by its ``token_digest``."""
+        self.__entries.pop(digest, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
@@ -0,0 +1,58 @@
+"""Pluggable JWT codecs.
+
+``JwtAuthBase`` depends only on ``JwtCodec``. The engine is chosen by
+``JWT_CODEC`` setting.
+"""
+
+from typing import Literal, Optional
+
+from .asymmetric import AsymmetricCodec
+from .base import CodecError, CodecExpiredError, JwtCodec
+from .compact import CompactHmacCodec
+from .keyset import ASYMMETRIC_ALGORITHMS, KeySet
+from .python_jose import JoseCodec
+
+__all__ = [
+    "JwtCodec",
+    "CodecError",
+    "CodecExpiredError",
+    "JoseCodec",
+    "CompactHmacCodec",
+    "AsymmetricCodec",
+    "KeySet",
+    "ASYMMETRIC_ALGORITHMS",
+    "get_codec",
+]
+
+
+def get_codec(
+    engine: Literal["jose", "compact"],
+    secret_key: str,
+    algorithm: str,
+    key_set: Optional[KeySet] = None,
+) -> JwtCodec:
+    """Build codec by its engine name.
+
+    Args:
+        engine: ``jose`` or ``compact``. Ignored for asymmetric algorithms.
+        secret_key: Key for HMAC algorithms.
+        algorithm: JWS algorithm name, e.g. ``HS256``, ``ES256`` or ``EdDSA``.
+        key_set: Signing keys, required for asymmetric algorithms.
+
+    Returns:
+        ``JwtCodec`` instance.
+    """
+    if algorithm in ASYMMETRIC_ALGORITHMS:
+        if key_set is None:
+            raise ValueError(f"{algorithm} requires a key set")
+        if key_set.active.algorithm != algorithm:
+            raise ValueError(
+                f"Active key {key_set.active.kid} is not a {algorithm} key",
+            )
+        return AsymmetricCodec(key_set=key_set)
+    if engine == "compact":
+        return CompactHmacCodec(secret_key=secret_key, algorithm=algorithm)
+    if engine == "jose":
+        return JoseCodec(secret_key=secret_key, algorithm=algorithm)
+
+    raise ValueError(f"Unknown jwt codec engine: {engine}")
@@ -0,0 +1,94 @@
+"""Codec signing tokens with keys of ``KeySet``.
+
+Every token carries ``kid`` header, so resource servers can verify it with
+public keys from ``/auth/.well-known/jwks.json`` without a shared secret.
+"""
+
+import binascii
+import json
+from typing import Any, Dict
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature,
+    encode_dss_signature,
+)
+
+from .base import CodecError, JwtCodec, b64url_decode, b64url_encode, dumps_compact
+from .keyset import KeySet, SigningKey
+
+__all__ = ["AsymmetricCodec"]
+
+_ecdsa = ec.ECDSA(hashes.SHA256())
+
+
+def _sign(key: SigningKey, signing_input: bytes) -> bytes:
+    if key.algorithm == "EdDSA":
+        return key.private_key.sign(signing_input)
+
+    # JWS uses raw r || s instead of DER encoded ECDSA signature.
+    r, s = decode_dss_signature(key.private_key.sign(signing_input, _ecdsa))
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+
+def _verify(key: SigningKey, signing_input: bytes, signature: bytes) -> None:
+    if key.algorithm == "EdDSA":
+        key.public_key.verify(signature, signing_input)
+        return
+
+    if len(signature) != 64:
+        raise InvalidSignature
+    der = encode_dss_signature(
+        int.from_bytes(signature[:32], "big"),
+        int.from_bytes(signature[32:], "big"),
+    )
+    key.public_key.verify(der, signing_input, _ecdsa)
+
+
+class AsymmetricCodec(JwtCodec):
+    """ES256 / EdDSA codec with ``kid`` header and key rotation."""
+
+    key_set: KeySet
+
+    def __init__(self, key_set: KeySet):
+        self.key_set = key_set
+
+    @property
+    def algorithm(self) -> str:
+        return self.key_set.active.algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        key = self.key_set.active
+        header = dumps_compact({"alg": key.algorithm, "kid": key.kid, "typ": "JWT"})
+        payload = dumps_compact(self._normalize_claims(claims))
+        signing_input = (
+            b64url_encode(header.encode()) + b"." + b64url_encode(payload.encode())
+        )
+        signature = b64url_encode(_sign(key, signing_input))
+        return (signing_input + b"." + signature).decode()
+
+    def decode(self, token: str, leeway: int = 0) -> Dict[str, Any]:
+        try:
+            signing_input, signature = token.encode().rsplit(b".", 1)
+            header_segment, payload = signing_input.split(b".")
+            header = json.loads(b64url_decode(header_segment))
+            if not isinstance(header, dict):
+                raise CodecError("Invalid header string: must be a json object")
+
+            key = self.key_set.get(str(header.get("kid")))
+            if header.get("alg") != key.algorithm:
+                raise CodecError("The specified alg value is not allowed")
+
+            _verify(key, signing_input, b64url_decode(signature))
+            claims = json.loads(b64url_decode(payload))
+        except InvalidSignature as e:
+            raise CodecError("Signature verification failed.") from e
+        except (ValueError, binascii.Error) as e:
+            raise CodecError(e) from e
+
+        if not isinstance(claims, dict):
+            raise CodecError("Invalid payload string: must be a json object")
+        self._check_time_claims(claims, leeway)
+        return claims
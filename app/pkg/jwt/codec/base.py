@@ -0,0 +1,84 @@
+"""Interface of JWT encoder/decoder used by ``JwtAuthBase``."""
+
+import base64
+import json
+import time
+from abc import ABC, abstractmethod
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Dict
+
+__all__ = [
+    "JwtCodec",
+    "CodecError",
+    "CodecExpiredError",
+    "b64url_encode",
+    "b64url_decode",
+    "dumps_compact",
+]
+
+#: Same separators as ``python-jose`` uses, so tokens are byte-compatible.
+dumps_compact = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def b64url_encode(data: bytes) -> bytes:
+    """Base64url without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    """Inverse of ``b64url_encode``."""
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class CodecError(Exception):
+    """Token is malformed or its signature is wrong."""
+
+
+class CodecExpiredError(CodecError):
+    """Token signature is valid, but ``exp`` claim is in the past."""
+
+
+class JwtCodec(ABC):
+    """Sign and verify compact JWS tokens.
+
+    Implementations must raise ``CodecExpiredError`` for expired tokens and
+    ``CodecError`` for all other invalid tokens.
+    """
+
+    algorithm: str
+
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Build signed token from ``claims``."""
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    def decode(self, token: str, leeway: int = 0) -> Dict[str, Any]:
+        """Verify signature and time claims of token and return its claims."""
+
+        raise NotImplementedError()
+
+    @staticmethod
+    def _normalize_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert ``datetime`` time claims to unix timestamps."""
+        normalized = dict(claims)
+        for claim in ("exp", "iat", "nbf"):
+            value = normalized.get(claim)
+            if isinstance(value, datetime):
+                normalized[claim] = timegm(value.utctimetuple())
+        return normalized
+
+    @staticmethod
+    def _check_time_claims(claims: Dict[str, Any], leeway: int) -> None:
+        """Validate ``exp``, ``iat`` and ``nbf`` claims like ``python-jose``."""
+        now = time.time()
+        for claim in ("exp", "iat", "nbf"):
+            if claim in claims and not isinstance(claims[claim], (int, float)):
+                raise CodecError(f"Invalid {claim} claim: must be a number")
+
+        if "nbf" in claims and claims["nbf"] > now + leeway:
+            raise CodecError("The token is not yet valid (nbf)")
+        if "exp" in claims and claims["exp"] < now - leeway:
+            raise CodecExpiredError("Signature has expired.")
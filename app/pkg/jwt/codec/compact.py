@@ -0,0 +1,70 @@
+"""Fast HMAC codec.
+
+Compared to ``JoseCodec`` it keeps prepared HMAC objects and encoded header,
+so signing a token is one ``json.dumps``, one base64 and one HMAC copy.
+Tokens are byte-compatible with ``python-jose``.
+"""
+
+import binascii
+import hashlib
+import hmac
+import json
+from typing import Any, Dict
+
+from .base import CodecError, JwtCodec, b64url_decode, b64url_encode, dumps_compact
+
+__all__ = ["CompactHmacCodec"]
+
+_digests = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class CompactHmacCodec(JwtCodec):
+    """HS256/HS384/HS512 codec with precomputed key objects."""
+
+    def __init__(self, secret_key: str, algorithm: str = "HS256"):
+        if algorithm not in _digests:
+            raise ValueError(f"{algorithm} is not supported by CompactHmacCodec")
+
+        self.algorithm = algorithm
+        self.__mac = hmac.new(secret_key.encode(), digestmod=_digests[algorithm])
+        self.__header = b64url_encode(
+            dumps_compact({"alg": algorithm, "typ": "JWT"}).encode(),
+        )
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        payload = b64url_encode(dumps_compact(self._normalize_claims(claims)).encode())
+        signing_input = self.__header + b"." + payload
+        return (signing_input + b"." + b64url_encode(self.__sign(signing_input))).decode()
+
+    def decode(self, token: str, leeway: int = 0) -> Dict[str, Any]:
+        try:
+            signing_input, signature = token.encode().rsplit(b".", 1)
+            header, payload = signing_input.split(b".")
+            if header != self.__header:
+                self.__check_header(header)
+
+            if not hmac.compare_digest(self.__sign(signing_input), b64url_decode(signature)):
+                raise CodecError("Signature verification failed.")
+            claims = json.loads(b64url_decode(payload))
+        except (ValueError, binascii.Error) as e:
+            raise CodecError(e) from e
+
+        if not isinstance(claims, dict):
+            raise CodecError("Invalid payload string: must be a json object")
+        self._check_time_claims(claims, leeway)
+        return claims
+
+    def __sign(self, signing_input: bytes) -> bytes:
+        mac = self.__mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def __check_header(self, header: bytes) -> None:
+        """Header differs from our own only by key order or extra fields."""
+        parsed = json.loads(b64url_decode(header))
+        if not isinstance(parsed, dict) or parsed.get("alg") != self.algorithm:
+            raise CodecError("The specified alg value is not allowed")
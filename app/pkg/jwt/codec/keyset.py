@@ -0,0 +1,185 @@
+"""Rotating set of asymmetric signing keys.
+
+Keys are stored as PEM files in one directory, the file name without
+extension is the ``kid``. Files with a private key can sign tokens, files with
+only a public key are kept to verify tokens issued before rotation::
+
+    keys/
+        2026-09-01.pub.pem   # retired key, verification only
+        2026-10-01.pem       # active key, the last one by name
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from .base import CodecError, b64url_encode
+
+__all__ = ["KeySet", "SigningKey", "ASYMMETRIC_ALGORITHMS"]
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "EdDSA")
+
+PrivateKey = Union[ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey]
+PublicKey = Union[ec.EllipticCurvePublicKey, ed25519.Ed25519PublicKey]
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """Single key of ``KeySet``."""
+
+    kid: str
+    algorithm: str
+    public_key: PublicKey
+    private_key: Optional[PrivateKey] = None
+
+    def to_jwk(self) -> Dict[str, str]:
+        """Public part of key in JWK format."""
+        jwk = {"kid": self.kid, "alg": self.algorithm, "use": "sig"}
+        if isinstance(self.public_key, ed25519.Ed25519PublicKey):
+            raw = self.public_key.public_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PublicFormat.Raw,
+            )
+            jwk.update(kty="OKP", crv="Ed25519", x=b64url_encode(raw).decode())
+        else:
+            numbers = self.public_key.public_numbers()
+            jwk.update(
+                kty="EC",
+                crv="P-256",
+                x=b64url_encode(numbers.x.to_bytes(32, "big")).decode(),
+                y=b64url_encode(numbers.y.to_bytes(32, "big")).decode(),
+            )
+        return jwk
+
+
+def _algorithm_of(key: Union[PrivateKey, PublicKey], path: Path) -> str:
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    if isinstance(
+        key,
+        (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey),
+    ) and isinstance(key.curve, ec.SECP256R1):
+        return "ES256"
+    raise ValueError(f"{path}: only P-256 and Ed25519 keys are supported")
+
+
+def _load_key(path: Path) -> SigningKey:
+    data = path.read_bytes()
+    kid = path.name.split(".", 1)[0]
+    if b"PRIVATE KEY" in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        return SigningKey(
+            kid=kid,
+            algorithm=_algorithm_of(private_key, path),
+            public_key=private_key.public_key(),
+            private_key=private_key,
+        )
+
+    public_key = serialization.load_pem_public_key(data)
+    return SigningKey(kid=kid, algorithm=_algorithm_of(public_key, path), public_key=public_key)
+
+
+class KeySet:
+    """Keys loaded from ``keys_dir``, reloaded when the directory changes."""
+
+    keys_dir: Path
+    active_kid: Optional[str]
+    reload_interval: float
+
+    def __init__(
+        self,
+        keys_dir: Path,
+        active_kid: Optional[str] = None,
+        reload_interval: float = 30.0,
+    ):
+        """
+        Args:
+            keys_dir: Directory with ``*.pem`` files.
+            active_kid: Key used to sign new tokens. By default, the last private
+                key sorted by kid.
+            reload_interval: Seconds between checks of ``keys_dir`` modification.
+        """
+        self.keys_dir = Path(keys_dir)
+        self.active_kid = active_kid
+        self.reload_interval = reload_interval
+        self.__keys: Dict[str, SigningKey] = {}
+        self.__active: Optional[SigningKey] = None
+        self.__jwks = b""
+        self.__etag = ""
+        self.__mtime = None
+        self.__checked_at = 0.0
+        self.reload()
+
+    def reload(self) -> None:
+        """Read all keys from ``keys_dir`` again."""
+        keys = {}
+        for path in sorted(self.keys_dir.glob("*.pem")):
+            key = _load_key(path)
+            keys[key.kid] = key
+
+        signing = [key for key in keys.values() if key.private_key is not None]
+        if self.active_kid:
+            active = keys.get(self.active_kid)
+            if active is None or active.private_key is None:
+                raise ValueError(f"Private key {self.active_kid} not found")
+        elif signing:
+            active = signing[-1]
+        else:
+            raise ValueError(f"No private keys in {self.keys_dir}")
+
+        jwks = json.dumps(
+            {"keys": [key.to_jwk() for key in keys.values()]},
+            separators=(",", ":"),
+        ).encode()
+
+        self.__keys = keys
+        self.__active = active
+        self.__jwks = jwks
+        self.__etag = f'"{hashlib.sha256(jwks).hexdigest()[:32]}"'
+        self.__mtime = os.stat(self.keys_dir).st_mtime_ns
+        self.__checked_at = time.monotonic()
+
+    @property
+    def active(self) -> SigningKey:
+        """Key used to sign new tokens."""
+        self.__maybe_reload()
+        return self.__active
+
+    def get(self, kid: str) -> SigningKey:
+        """Get key by ``kid`` header of token."""
+        self.__maybe_reload()
+        try:
+            return self.__keys[kid]
+        except KeyError:
+            raise CodecError(f"Unknown key id: {kid}")
+
+    @property
+    def jwks(self) -> bytes:
+        """Serialized JWKS document with public keys."""
+        self.__maybe_reload()
+        return self.__jwks
+
+    @property
+    def etag(self) -> str:
+        """Entity tag of ``jwks``."""
+        self.__maybe_reload()
+        return self.__etag
+
+    def kids(self) -> List[str]:
+        return list(self.__keys)
+
+    def __maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self.__checked_at < self.reload_interval:
+            return
+
+        self.__checked_at = now
+        if os.stat(self.keys_dir).st_mtime_ns != self.__mtime:
+            self.reload()
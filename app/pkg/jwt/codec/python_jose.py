@@ -0,0 +1,37 @@
+"""Codec based on ``python-jose``."""
+
+from typing import Any, Dict
+
+from jose import jwt
+
+from .base import CodecError, CodecExpiredError, JwtCodec
+
+__all__ = ["JoseCodec"]
+
+
+class JoseCodec(JwtCodec):
+    """Reference implementation, supports every algorithm of ``python-jose``."""
+
+    def __init__(self, secret_key: str, algorithm: str = jwt.ALGORITHMS.HS256):
+        if algorithm not in jwt.ALGORITHMS.SUPPORTED:
+            raise ValueError(
+                f"{algorithm} algorithm is not supported by python-jose library",
+            )
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str, leeway: int = 0) -> Dict[str, Any]:
+        try:
+            return jwt.decode(
+                token,
+                self.secret_key,
+                algorithms=[self.algorithm],
+                options={"leeway": leeway},
+            )
+        except jwt.ExpiredSignatureError as e:
+            raise CodecExpiredError(e) from e
+        except jwt.JWTError as e:
+            raise CodecError(e) from e
@@ -5,6 +5,8 @@ from fastapi import Security
 from jose import jwt
 
 from app.pkg.jwt.base import JwtAuthBase
+from app.pkg.jwt.cache import VerifiedTokenCache
+from app.pkg.jwt.codec import JwtCodec
 from app.pkg.jwt.credentionals import JwtAuthorizationCredentials
 
 __all__ = ["JwtRefreshBearer"]
@@ -22,6 +24,8 @@ class JwtRefresh(JwtAuthBase):
         algorithm: str = jwt.ALGORITHMS.HS256,
         access_expires_delta: Optional[timedelta] = None,
         refresh_expires_delta: Optional[timedelta] = None,
+        verified_cache: Optional[VerifiedTokenCache] = None,
+        codec: Optional[JwtCodec] = None,
     ):
         super().__init__(
             secret_key,
@@ -30,6 +34,8 @@ class JwtRefresh(JwtAuthBase):
             algorithm=algorithm,
             access_expires_delta=access_expires_delta,
             refresh_expires_delta=refresh_expires_delta,
+            verified_cache=verified_cache,
+            codec=codec,
         )
 
     async def _get_credentials(
@@ -56,6 +62,8 @@ class JwtRefreshBearer(JwtRefresh):
         algorithm: str = jwt.ALGORITHMS.HS256,
         access_expires_delta: Optional[timedelta] = None,
         refresh_expires_delta: Optional[timedelta] = None,
+        verified_cache: Optional[VerifiedTokenCache] = None,
+        codec: Optional[JwtCodec] = None,
     ):
         super().__init__(
             secret_key=secret_key,
@@ -64,6 +72,8 @@ class JwtRefreshBearer(JwtRefresh):
             algorithm=algorithm,
             access_expires_delta=access_expires_delta,
             refresh_expires_delta=refresh_expires_delta,
+            verified_cache=verified_cache,
+            codec=codec,
         )
 
     async def __call__(
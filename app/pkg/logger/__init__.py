@@ -1 +1 @@
-from .logger import get_logger
+from .logger import JsonFormatter, configure_logging, get_logger, shutdown_logging
@@ -1,38 +1,184 @@
-import logging
+"""Loggers of the application writing through a background thread.
+
+Handlers of files and streams are created once per process and owned by a
+``QueueListener`` thread. Loggers only put records into a bounded queue, so
+formatting and disk I/O never run on the event loop. When the queue is full,
+records are dropped and counted in ``log_records_dropped_total`` instead of
+blocking requests.
+"""
 
+import atexit
+import copy
+import json
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+from prometheus_client import Counter
 
-from logging.handlers import RotatingFileHandler
 from app.pkg.settings import settings
 
+__all__ = [
+    "JsonFormatter",
+    "configure_logging",
+    "get_logger",
+    "shutdown_logging",
+]
 
 _log_format = (
     "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s).%("
     "funcName)s(%(lineno)d) - %(message)s "
 )
 
+_dropped_records = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the queue of logging thread was full.",
+)
+
+#: Attributes of every ``LogRecord``, the rest are ``extra`` of the call.
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__,
+) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format record as one line json object.
+
+    Examples:
+        ``logger.info("login", extra={"user_id": 1})`` is written as::
+
+            {"time": "2026-10-18T10:00:00.000000+00:00", "level": "INFO",
+             "logger": "auth", "message": "login", "module": "auth",
+             "function": "login", "line": 42, "user_id": 1}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                document[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            document["exception"] = record.exc_text
+        if record.stack_info:
+            document["stack"] = record.stack_info
+        return json.dumps(document, default=str, ensure_ascii=False)
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """``QueueHandler`` which drops records instead of waiting for the queue."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped_records.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only what can't be done later is done on the calling thread: args
+        # may be changed after the call and traceback holds live frames.
+        # Formatting with the configured formatter is left to the listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-def get_file_handler(file_name):
+
+_lock = threading.Lock()
+_queue_handler: Optional[_BoundedQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def get_file_handler(file_name, formatter: logging.Formatter):
     Path(file_name).absolute().parent.mkdir(exist_ok=True, parents=True)
     file_handler = RotatingFileHandler(
         filename=file_name,
         maxBytes=5242880,
         backupCount=10,
     )
-    file_handler.setFormatter(logging.Formatter(_log_format))
+    file_handler.setFormatter(formatter)
     return file_handler
 
 
-def get_stream_handler():
+def get_stream_handler(formatter: logging.Formatter):
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(logging.Formatter(_log_format))
+    stream_handler.setFormatter(formatter)
     return stream_handler
 
 
+def get_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(_log_format)
+
+
+def configure_logging() -> QueueHandler:
+    """Start logging thread of the process, once.
+
+    Returns:
+        Handler shared by all loggers of ``get_logger``.
+    """
+    global _queue_handler, _listener
+
+    with _lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        formatter = get_formatter(settings.LOGGER_FORMAT)
+        file_path = str(Path(settings.LOGGER_FILE_PATH).absolute())
+        records: queue.Queue = queue.Queue(maxsize=settings.LOGGER_QUEUE_SIZE)
+
+        _listener = QueueListener(
+            records,
+            get_file_handler(file_name=file_path, formatter=formatter),
+            get_stream_handler(formatter=formatter),
+            respect_handler_level=True,
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+        _queue_handler = _BoundedQueueHandler(records)
+        return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Write queued records and stop logging thread."""
+    global _queue_handler, _listener
+
+    with _lock:
+        if _listener is None:
+            return
+
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        for logger in logging.Logger.manager.loggerDict.values():
+            if isinstance(logger, logging.Logger):
+                logger.removeHandler(_queue_handler)
+        _queue_handler = None
+        _listener = None
+
+
 def get_logger(name):
     logger = logging.getLogger(name)
-    file_path = str(Path(settings.LOGGER_FILE_PATH).absolute())
-    logger.addHandler(get_file_handler(file_name=file_path))
-    logger.addHandler(get_stream_handler())
+    # Adding the same handler again is a no-op, so loggers requested many
+    # times, e.g. by every ``HttpRequests`` instance, write each record once.
+    logger.addHandler(configure_logging())
     logger.setLevel(settings.LOGGER_LEVEL)
     return logger
@@ -2,7 +2,7 @@ from pydantic import PositiveInt
 
 from app.pkg.models.base import BaseModel
 
-from app.pkg.models.types import NotEmptySecretStr
+from app.pkg.models.types import NotEmptySecretStr, TokenDigest
 
 
 class BaseAccessToken(BaseModel):
@@ -19,3 +19,9 @@ class AccessToken(BaseAccessToken):
     access_token: NotEmptySecretStr
 
 
+class StoredAccessToken(BaseAccessToken):
+    """
+    Access token from database, only SHA-256 digest of token is stored
+    """
+    refresh_id: PositiveInt
+    access_token: TokenDigest
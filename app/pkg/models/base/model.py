@@ -69,6 +69,7 @@ class BaseModel(pydantic.BaseModel):
             pydantic.SecretStr: lambda v: v.get_secret_value() if v else None,
             pydantic.SecretBytes: lambda v: v.get_secret_value() if v else None,
             types.EncryptedSecretBytes: lambda v: v.get_secret_value() if v else None,
+            types.TokenDigest: lambda v: v.hex(),
             bytes: lambda v: v.decode() if v else None,
             datetime: lambda v: int(v.timestamp()) if v else None,
             date: lambda v: int(time.mktime(v.timetuple())) if v else None,
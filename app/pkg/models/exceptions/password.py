@@ -0,0 +1,10 @@
+from starlette import status
+
+from app.pkg.models.base import BaseException
+
+__all__ = ["PasswordHasherUnavailable"]
+
+
+class PasswordHasherUnavailable(BaseException):
+    message = "Too many concurrent password checks. Try again later."
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
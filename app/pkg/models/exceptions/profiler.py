@@ -0,0 +1,10 @@
+from starlette import status
+
+from app.pkg.models.base import BaseException
+
+__all__ = ["ProfilerBusy"]
+
+
+class ProfilerBusy(BaseException):
+    message = "Profiler is already running in this worker."
+    status_code = status.HTTP_409_CONFLICT
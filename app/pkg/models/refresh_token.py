@@ -11,9 +11,10 @@ __all__ = [
     "ReadJWTTokenQueryByFingerprint",
     "UpdateJWTTokenCommand",
     "DeleteJWTTokenCommand",
+    "CreateSessionCommand",
 ]
 
-from app.pkg.models.types import NotEmptySecretStr
+from app.pkg.models.types import NotEmptySecretStr, TokenDigest
 
 
 class BaseJWTToken(BaseModel):
@@ -21,10 +22,13 @@ class BaseJWTToken(BaseModel):
 
 
 class JWTToken(BaseJWTToken):
-    """RefreshToken from database."""
+    """RefreshToken from database.
+
+    Only SHA-256 digest of ``refresh_token`` is stored.
+    """
     id: PositiveInt
     user_id: PositiveInt
-    refresh_token: NotEmptySecretStr
+    refresh_token: TokenDigest
     fingerprint: NotEmptySecretStr
     expiresat: float = 30*24*60*60  # month in seconds
 
@@ -44,6 +48,15 @@ class UpdateJWTTokenCommand(BaseJWTToken):
     expiresat: float = 30*24*60*60
 
 
+class CreateSessionCommand(BaseJWTToken):
+    """Refresh token of device together with the first access token of it."""
+    user_id: PositiveInt
+    refresh_token: NotEmptySecretStr
+    fingerprint: NotEmptySecretStr
+    access_token: NotEmptySecretStr
+    expiresat: float = 30*24*60*60
+
+
 class DeleteJWTTokenCommand(BaseJWTToken):
     user_id: PositiveInt
     fingerprint: NotEmptySecretStr
@@ -1,2 +1,3 @@
+from .digest import TokenDigest
 from .secret_bytes import EncryptedSecretBytes
 from .secret_str import NotEmptySecretStr
@@ -0,0 +1,30 @@
+from typing import Any
+
+__all__ = ["TokenDigest"]
+
+
+class TokenDigest(bytes):
+    """SHA-256 digest of token as stored in database.
+
+    Raw bytes of a digest are not text, so it is shown and serialized as hex.
+    """
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "TokenDigest":
+        if isinstance(value, memoryview):
+            return cls(value.tobytes())
+        if isinstance(value, (bytes, bytearray)):
+            return cls(value)
+        if isinstance(value, str):
+            return cls(bytes.fromhex(value))
+        raise TypeError("bytes or hex string required")
+
+    def __str__(self) -> str:
+        return self.hex()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.hex()}')"
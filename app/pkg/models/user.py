@@ -1,5 +1,5 @@
 from pydantic.fields import Field
-from pydantic.types import PositiveInt
+from pydantic.types import PositiveInt, conint
 
 from app.pkg.models.base import BaseModel
 from app.pkg.models.types import EncryptedSecretBytes
@@ -11,6 +11,7 @@ __all__ = [
     "CreateUserCommand",
     "ReadUserByIdQuery",
     "ReadUserByUserNameQuery",
+    "ReadUsersPageQuery",
     "UpdateUserCommand",
     "DeleteUserCommand",
     "ChangeUserPasswordCommand",
@@ -39,6 +40,12 @@ class UserFields:
         max_length=256,
     )
     role_name = UserRoleFields.role_name
+    after_id = Field(
+        default=0,
+        description="Id of the last user of previous page.",
+        example=0,
+    )
+    limit = Field(default=100, description="Max count of users in page.", example=100)
 
 
 class BaseUser(BaseModel):
@@ -83,3 +90,8 @@ class ReadUserByUserNameQuery(BaseUser):
 
 class ReadUserByIdQuery(BaseUser):
     id: PositiveInt = UserFields.id
+
+
+class ReadUsersPageQuery(BaseUser):
+    after_id: conint(ge=0) = UserFields.after_id
+    limit: conint(ge=1, le=1000) = UserFields.limit
@@ -0,0 +1,7 @@
+"""Profiling of a live worker on demand."""
+
+from .allocations import trace_allocations
+from .profiler import Profiler
+from .sampler import StackSampler
+
+__all__ = ["Profiler", "StackSampler", "trace_allocations"]
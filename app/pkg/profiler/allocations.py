@@ -0,0 +1,58 @@
+"""Top allocation sites with ``tracemalloc``."""
+
+import asyncio
+import tracemalloc
+
+__all__ = ["trace_allocations"]
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+async def trace_allocations(seconds: float, limit: int = 30, frames: int = 1) -> str:
+    """Trace memory allocated during ``seconds`` and still alive at the end.
+
+    Tracing slows down every allocation of the process, so it is enabled
+    only for the window, unless it was started before, e.g. by
+    ``PYTHONTRACEMALLOC``.
+
+    Args:
+        seconds: Length of the window.
+        limit: Count of sites in the report.
+        frames: Frames kept by traceback of allocation, sites are grouped by
+            the whole traceback when more than one.
+
+    Returns:
+        Report with one site per line, the largest first.
+    """
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+    try:
+        await asyncio.sleep(seconds)
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces(_IGNORED)
+    statistics = snapshot.statistics("traceback" if frames > 1 else "lineno")
+    total = sum(stat.size for stat in statistics)
+
+    lines = [f"# {total / 1024:.1f} KiB in {len(statistics)} sites"]
+    for number, stat in enumerate(statistics[:limit], start=1):
+        # Frames of traceback are ordered from the oldest, the site is last.
+        frame = stat.traceback[-1]
+        lines.append(
+            f"#{number}: {frame.filename}:{frame.lineno}: "
+            f"{stat.size / 1024:.1f} KiB in {stat.count} blocks",
+        )
+        lines.extend(
+            f"    {caller.filename}:{caller.lineno}"
+            for caller in reversed(stat.traceback[:-1])
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,67 @@
+"""Profiling sessions of the worker, one at a time."""
+
+import asyncio
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.pkg.models.exceptions.profiler import ProfilerBusy
+
+from .allocations import trace_allocations
+from .sampler import StackSampler
+
+__all__ = ["Profiler"]
+
+
+class Profiler:
+    """Profile the worker for a window while it keeps serving requests.
+
+    Two sessions would sample each other and double the overhead, so a
+    session started while another one runs is rejected.
+    """
+
+    def __init__(self):
+        self.__running = False
+
+    async def sample_stacks(self, seconds: float, interval: float = 0.01) -> str:
+        """Collapsed stacks of all threads, see ``StackSampler``.
+
+        Raises:
+            ProfilerBusy: when another session runs.
+        """
+        with self.__session():
+            sampler = StackSampler(interval=interval)
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+            return sampler.collapsed()
+
+    async def trace_allocations(
+        self,
+        seconds: float,
+        limit: int = 30,
+        frames: int = 1,
+    ) -> str:
+        """Top allocation sites, see ``trace_allocations``.
+
+        Raises:
+            ProfilerBusy: when another session runs.
+        """
+        with self.__session():
+            return await trace_allocations(seconds, limit=limit, frames=frames)
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    @contextmanager
+    def __session(self) -> Iterator[None]:
+        if self.__running:
+            raise ProfilerBusy
+
+        self.__running = True
+        try:
+            yield
+        finally:
+            self.__running = False
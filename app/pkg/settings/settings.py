@@ -4,6 +4,7 @@ if server running with parameter `dev` from `.env.dev`
 """
 import pathlib
 from functools import lru_cache
+from typing import List, Literal, Optional
 
 import pydantic
 from dotenv import find_dotenv
@@ -32,14 +33,56 @@ class Settings(_Settings):
     POSTGRES_PASSWORD: SecretStr
     POSTGRES_DATABASE_NAME: str
 
+    #: str: driver of postgresql connections, ``asyncpg`` needs asyncpg package.
+    POSTGRES_DRIVER: Literal["aiopg", "asyncpg"] = "aiopg"
+    #: int: prepared statements kept by each asyncpg connection.
+    POSTGRES_STATEMENT_CACHE_SIZE: PositiveInt = 256
+
+    # Postgresql pool
+    POSTGRES_POOL_MIN_SIZE: pydantic.conint(ge=0) = 1
+    POSTGRES_POOL_MAX_SIZE: PositiveInt = 10
+    POSTGRES_POOL_ACQUIRE_TIMEOUT: pydantic.PositiveFloat = 60.0
+    #: float: seconds after which an idle connection is reopened, -1 disables it.
+    POSTGRES_POOL_RECYCLE: float = -1
+
+    # Postgresql replicas
+    #: list: ``host`` or ``host:port`` of read replicas, as json array in env.
+    POSTGRES_REPLICAS: List[str] = []
+    #: int: milliseconds reads of a request stay on primary after its write.
+    POSTGRES_STICKY_PRIMARY_MS: pydantic.conint(ge=0) = 500
+    #: float: seconds a failed replica is skipped before it is tried again.
+    POSTGRES_REPLICA_BACKOFF: pydantic.confloat(ge=0) = 30.0
+
     REDIS_HOST: str
     REDIS_PORT: PositiveInt
     REDIS_PASSWORD: SecretStr
 
+    # User cache
+    #: int: count of users kept in memory of process, 0 disables local tier.
+    USER_CACHE_SIZE: pydantic.conint(ge=0) = 10000
+    #: int: seconds users are cached.
+    USER_CACHE_TTL: PositiveInt = 60
+    #: str: shared tier, ``memory`` is a local stand-in of redis for tests.
+    #: It never holds password hashes, so logins are cached by local tier only.
+    USER_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    #: bool: evict in-process caches on changes made by other workers.
+    CACHE_INVALIDATION_ENABLED: bool = True
+
     # JWT
     JWT_SECRET_KEY: SecretStr
     JWT_ACCESS_TOKEN_NAME: str
     JWT_REFRESH_TOKEN_NAME: str
+    JWT_CODEC: Literal["jose", "compact"] = "jose"
+    JWT_ALGORITHM: Literal["HS256", "HS384", "HS512", "ES256", "EdDSA"] = "HS256"
+    #: Optional[Path]: directory with ``<kid>.pem`` keys for ES256/EdDSA.
+    JWT_KEYS_DIR: Optional[pathlib.Path] = None
+    #: Optional[str]: kid of signing key, the last private key by name if empty.
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_KEYS_RELOAD_INTERVAL: pydantic.PositiveFloat = 30.0
+    #: int: seconds resource servers may cache ``/auth/.well-known/jwks.json``.
+    JWT_JWKS_MAX_AGE: pydantic.conint(ge=0) = 300
+    #: int: count of verified tokens kept in memory, 0 disables the cache.
+    JWT_VERIFIED_CACHE_SIZE: pydantic.conint(ge=0) = 0
 
     RABBITMQ_HOST: str
     RABBITMQ_PORT: PositiveInt
@@ -48,9 +91,63 @@ class Settings(_Settings):
 
     OTP_KEY: SecretStr
 
+    # Password hashing
+    PASSWORD_HASHER_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASHER_MAX_WORKERS: PositiveInt = 4
+    PASSWORD_HASHER_QUEUE_SIZE: pydantic.conint(ge=0) = 64
+
+    # Expired sessions
+    #: bool: delete expired refresh tokens, partitions are created anyway.
+    SESSION_REAPER_ENABLED: bool = True
+    #: float: seconds between runs of session reaper.
+    SESSION_REAPER_INTERVAL: pydantic.PositiveFloat = 60.0
+    #: int: max count of refresh tokens deleted by one statement, 0 leaves
+    #: deletion to dropping of expired partitions.
+    SESSION_REAPER_BATCH_SIZE: pydantic.conint(ge=0) = 500
+    #: float: seconds between batches of one run.
+    SESSION_REAPER_BATCH_PAUSE: pydantic.confloat(ge=0) = 0.1
+    #: int: max count of batches of one run, 0 deletes until no expired rows
+    #: are left.
+    SESSION_REAPER_MAX_BATCHES: pydantic.conint(ge=0) = 100
+    #: int: days after which partition of refresh tokens is dropped, must be
+    #: greater than lifetime of refresh token.
+    SESSION_RETENTION_DAYS: PositiveInt = 32
+    #: int: count of weekly partitions created in advance.
+    SESSION_PARTITIONS_AHEAD: PositiveInt = 4
+
+    # Request timings
+    #: bool: add ``Server-Timing`` header with phases of request to responses.
+    SERVER_TIMING_HEADER: bool = False
+
+    # Profiler
+    #: Optional[str]: ``X-ACCESS-TOKEN`` of ``/debug/profile``, unset disables it.
+    PROFILER_X_TOKEN: Optional[SecretStr] = None
+    #: int: upper bound of profiling window in seconds.
+    PROFILER_MAX_SECONDS: PositiveInt = 60
+
+    # Tracing
+    #: str: ``otlp_file`` appends spans in OTLP/JSON to ``TRACING_FILE_PATH``.
+    TRACING_EXPORTER: Literal["none", "memory", "otlp_file"] = "none"
+    TRACING_FILE_PATH: pathlib.Path = pathlib.Path("traces/spans.jsonl")
+    TRACING_SERVICE_NAME: str = "auth"
+
     # logger
     LOGGER_LEVEL: pydantic.StrictStr
     LOGGER_FILE_PATH: pathlib.Path
+    #: str: ``json`` writes every record as one line json object.
+    LOGGER_FORMAT: Literal["text", "json"] = "text"
+    #: int: records waiting for logging thread, new ones are dropped when full.
+    LOGGER_QUEUE_SIZE: PositiveInt = 10000
+
+    @pydantic.validator("JWT_KEYS_DIR", always=True)
+    def check_keys_dir_for_asymmetric_algorithm(
+        cls,
+        v: Optional[pathlib.Path],
+        values: dict,
+    ) -> Optional[pathlib.Path]:
+        if values.get("JWT_ALGORITHM") in ("ES256", "EdDSA") and v is None:
+            raise ValueError("JWT_KEYS_DIR is required for asymmetric JWT_ALGORITHM")
+        return v
 
     @pydantic.validator("LOGGER_FILE_PATH")
     def check_secrets_dir_exists(cls, v: pathlib.Path) -> pathlib.Path:
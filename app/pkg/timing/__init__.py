@@ -0,0 +1,17 @@
+"""Breakdown of request latency by phases."""
+
+from .timings import (
+    RequestTimings,
+    current_timings,
+    measure,
+    record,
+    start_timings,
+)
+
+__all__ = [
+    "RequestTimings",
+    "current_timings",
+    "measure",
+    "record",
+    "start_timings",
+]
@@ -0,0 +1,106 @@
+"""Request-scoped timings carried in a context variable.
+
+Middleware starts ``RequestTimings`` for every request, and the code of hot
+phases reports its time into them with ``measure`` or ``record``. Outside of a
+request, e.g. in scripts and background tasks, both are no-ops.
+
+Phases may overlap: ``db`` is the whole repository call and includes
+``db_acquire``, waiting for a connection of the pool.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+__all__ = [
+    "RequestTimings",
+    "current_timings",
+    "measure",
+    "record",
+    "start_timings",
+]
+
+
+class RequestTimings:
+    """Seconds spent by one request in each phase.
+
+    Time of repeated phases is summed, so two queries of a request are
+    reported as one ``db`` phase.
+    """
+
+    #: Path template of matched route.
+    route: Optional[str]
+    started_at: float
+    #: ``time.perf_counter`` when endpoint returned, start of serialization.
+    endpoint_returned_at: Optional[float]
+
+    def __init__(self):
+        self.route = None
+        self.started_at = time.perf_counter()
+        self.endpoint_returned_at = None
+        self.__phases: Dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.__phases[phase] = self.__phases.get(phase, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since start of request."""
+        return time.perf_counter() - self.started_at
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        return iter(self.__phases.items())
+
+    def server_timing(self) -> str:
+        """Value of ``Server-Timing`` header with durations in milliseconds.
+
+        Examples:
+            ::
+
+                >>> timings.server_timing()
+                'db;dur=1.250, hash;dur=212.004, total;dur=215.731'
+        """
+        phases = [*self.items(), ("total", self.elapsed())]
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in phases
+        )
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings",
+    default=None,
+)
+
+
+def start_timings() -> RequestTimings:
+    """Start timings of request running in the current context."""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _request_timings.get()
+
+
+def record(phase: str, started_at: float) -> None:
+    """Add time since ``started_at`` of ``time.perf_counter`` to ``phase``."""
+    if (timings := _request_timings.get()) is not None:
+        timings.add(phase, time.perf_counter() - started_at)
+
+
+@contextmanager
+def measure(phase: str) -> Iterator[None]:
+    """Add time of the block to ``phase`` of the current request.
+
+    Examples:
+        ::
+
+            with measure("jwt"):
+                token = codec.encode(payload)
+    """
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, started_at)
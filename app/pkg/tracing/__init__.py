@@ -0,0 +1,28 @@
+"""Lightweight tracing of requests through services and repositories."""
+
+from .exporters import InMemoryExporter, OtlpJsonFileExporter, SpanExporter
+from .span import Span, SpanKind, StatusCode, parse_traceparent
+from .tracer import (
+    configure_tracing,
+    current_span,
+    get_exporter,
+    shutdown_tracing,
+    start_span,
+    traced,
+)
+
+__all__ = [
+    "InMemoryExporter",
+    "OtlpJsonFileExporter",
+    "Span",
+    "SpanExporter",
+    "SpanKind",
+    "StatusCode",
+    "configure_tracing",
+    "current_span",
+    "get_exporter",
+    "parse_traceparent",
+    "shutdown_tracing",
+    "start_span",
+    "traced",
+]
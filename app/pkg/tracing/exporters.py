@@ -0,0 +1,180 @@
+"""Destinations of finished spans."""
+
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Counter
+
+from .span import Span, StatusCode
+
+__all__ = [
+    "InMemoryExporter",
+    "OtlpJsonFileExporter",
+    "SpanExporter",
+    "to_otlp_json",
+]
+
+_dropped_spans = Counter(
+    "tracing_spans_dropped_total",
+    "Finished spans dropped because the queue of exporter was full.",
+)
+
+
+class SpanExporter(ABC):
+    """Receives every finished span, must not block the event loop."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        ...
+
+    def shutdown(self) -> None:
+        """Deliver spans accepted so far and release resources."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep finished spans in a list, for tests.
+
+    Examples:
+        ::
+
+            exporter = InMemoryExporter()
+            configure_tracing(exporter)
+            await auth_service.check_user_password(cmd=cmd)
+            assert [span.name for span in exporter.spans] == [...]
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class OtlpJsonFileExporter(SpanExporter):
+    """Write spans to a file in OTLP/JSON, one ``TracesData`` per line.
+
+    The format of OpenTelemetry file exporter, accepted by ``filelog`` and
+    ``otlpjsonfile`` receivers of OpenTelemetry collector. Spans are written
+    by a background thread in batches; when the queue is full, new spans are
+    dropped and counted in ``tracing_spans_dropped_total``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        service_name: str,
+        max_queue_size: int = 2048,
+        batch_size: int = 512,
+        interval: float = 1.0,
+    ):
+        """
+        Args:
+            path: File which lines are appended to.
+            service_name: ``service.name`` attribute of resource.
+            max_queue_size: Spans waiting for the thread.
+            batch_size: Spans written by one line at most.
+            interval: Seconds a span may wait for its batch.
+        """
+        self.path = Path(path)
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.__queue: "queue.Queue[Optional[Span]]" = queue.Queue(
+            maxsize=max_queue_size,
+        )
+        self.__thread = threading.Thread(
+            target=self.__run,
+            name="otlp-json-file-exporter",
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self.__queue.put_nowait(span)
+        except queue.Full:
+            _dropped_spans.inc()
+
+    def shutdown(self) -> None:
+        if self.__thread.is_alive():
+            self.__queue.put(None)
+            self.__thread.join()
+
+    def __run(self) -> None:
+        self.path.absolute().parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            stopped = False
+            while not stopped:
+                batch: List[Span] = []
+                try:
+                    while len(batch) < self.batch_size:
+                        span = self.__queue.get(timeout=self.interval)
+                        if span is None:
+                            stopped = True
+                            break
+                        batch.append(span)
+                except queue.Empty:
+                    pass
+                if batch:
+                    file.write(json.dumps(to_otlp_json(batch, self.service_name)))
+                    file.write("\n")
+                    file.flush()
+
+
+def to_otlp_json(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """``TracesData`` message of OTLP in its JSON encoding."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _attributes({"service.name": service_name}),
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app"},
+                        "spans": [_span(span) for span in spans],
+                    },
+                ],
+            },
+        ],
+    }
+
+
+def _span(span: Span) -> Dict[str, Any]:
+    document = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        # 64 bit integers are strings in OTLP/JSON.
+        "startTimeUnixNano": str(span.start_time_unix_nano),
+        "endTimeUnixNano": str(span.end_time_unix_nano),
+        "attributes": _attributes(span.attributes),
+        "status": {"code": int(span.status_code)},
+    }
+    if span.parent_span_id:
+        document["parentSpanId"] = span.parent_span_id
+    if span.status_code == StatusCode.ERROR and span.status_message:
+        document["status"]["message"] = span.status_message
+    return document
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _value(value)} for key, value in attributes.items()]
+
+
+def _value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
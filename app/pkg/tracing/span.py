@@ -0,0 +1,128 @@
+"""Span of a trace in terms of OTLP."""
+
+import enum
+import random
+import time
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = ["Span", "SpanKind", "StatusCode", "parse_traceparent"]
+
+AttributeValue = Any
+
+
+class SpanKind(enum.IntEnum):
+    """Values of ``Span.kind`` in OTLP."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class StatusCode(enum.IntEnum):
+    """Values of ``Status.code`` in OTLP."""
+
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+class Span:
+    """Timed operation with a parent in the same trace.
+
+    Ids are hex strings, as in OTLP/JSON and in ``traceparent`` header.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "start_time_unix_nano",
+        "end_time_unix_nano",
+        "attributes",
+        "status_code",
+        "status_message",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        trace_id: Optional[str] = None,
+        parent_span_id: Optional[str] = None,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+    ):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id or f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: Optional[int] = None
+        self.attributes: Dict[str, AttributeValue] = dict(attributes or {})
+        self.status_code = StatusCode.UNSET
+        self.status_message = ""
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds from start to end, None while the span is open."""
+        if self.end_time_unix_nano is None:
+            return None
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e9
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status_code = StatusCode.ERROR
+        self.status_message = str(exception)
+        self.attributes["exception.type"] = type(exception).__name__
+
+    def end(self) -> None:
+        if self.end_time_unix_nano is None:
+            self.end_time_unix_nano = time.time_ns()
+
+    def __repr__(self) -> str:
+        return f"<Span {self.name} {self.trace_id}/{self.span_id}>"
+
+
+class _NoopSpan:
+    """Span given to code while tracing is disabled, records nothing."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Trace id and parent span id of W3C ``traceparent`` header.
+
+    Examples:
+        ::
+
+            >>> parse_traceparent(
+            ...     "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+            ... )
+            ('4bf92f3577b34da6a3ce929d0e0e4736', '00f067aa0ba902b7')
+
+    Returns:
+        None when header is missing or malformed.
+    """
+    parts = (header or "").strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        trace_id, span_id = int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if not trace_id or not span_id:
+        return None
+    return parts[1].lower(), parts[2].lower()
@@ -0,0 +1,166 @@
+"""Spans of the current task carried in a context variable.
+
+The innermost open span is kept in a context variable, so a span started in
+a coroutine becomes the parent of spans of everything it awaits, including
+tasks it creates: they copy the context on creation.
+
+While no exporter is configured, ``start_span`` and ``traced`` cost a global
+lookup and give out a span which records nothing.
+"""
+
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Literal, Optional, Tuple, Union
+
+from .exporters import InMemoryExporter, OtlpJsonFileExporter, SpanExporter
+from .span import NOOP_SPAN, Span, SpanKind
+
+__all__ = [
+    "configure_tracing",
+    "current_span",
+    "get_exporter",
+    "shutdown_tracing",
+    "start_span",
+    "traced",
+]
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_exporter: Optional[SpanExporter] = None
+
+
+def get_exporter(
+    exporter: Literal["none", "memory", "otlp_file"],
+    file_path: Optional[Path] = None,
+    service_name: str = "auth",
+) -> Optional[SpanExporter]:
+    """Build exporter of finished spans.
+
+    Args:
+        exporter: ``otlp_file`` appends OTLP/JSON lines to ``file_path``,
+            ``memory`` keeps spans in a list, ``none`` disables tracing.
+        file_path: File of ``otlp_file`` exporter.
+        service_name: ``service.name`` of exported resource.
+    """
+    if exporter == "otlp_file":
+        return OtlpJsonFileExporter(path=file_path, service_name=service_name)
+    if exporter == "memory":
+        return InMemoryExporter()
+    return None
+
+
+def configure_tracing(exporter: Optional[SpanExporter]) -> None:
+    """Send spans of the process to ``exporter``, None disables tracing.
+
+    The previous exporter is shut down.
+    """
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+
+
+def shutdown_tracing() -> None:
+    """Deliver spans finished so far and disable tracing."""
+    global _exporter
+    exporter, _exporter = _exporter, None
+    if exporter is not None:
+        exporter.shutdown()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: Optional[Dict[str, Any]] = None,
+    parent: Optional[Tuple[str, str]] = None,
+) -> Iterator[Union[Span, Any]]:
+    """Open span as a child of the current one for the block.
+
+    An exception leaving the block is recorded on the span and re-raised.
+
+    Args:
+        name: Name of the operation.
+        kind: ``SERVER`` for handling of incoming requests, ``CLIENT`` for
+            calls of database and upstreams.
+        attributes: Initial attributes.
+        parent: Trace id and span id of remote parent, e.g. from
+            ``parse_traceparent``, used when there is no current span.
+
+    Examples:
+        ::
+
+            with start_span("UserRepository.read", kind=SpanKind.CLIENT) as span:
+                rows = await cur.fetchall()
+                span.set_attribute("db.rows", len(rows))
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield NOOP_SPAN
+        return
+
+    if (current := _current_span.get()) is not None:
+        parent = current.trace_id, current.span_id
+    trace_id, parent_span_id = parent or (None, None)
+    span = Span(
+        name,
+        kind=kind,
+        trace_id=trace_id,
+        parent_span_id=parent_span_id,
+        attributes=attributes,
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+        exporter.export(span)
+
+
+def traced(
+    fn: Optional[Callable] = None,
+    name: Optional[str] = None,
+    kind: SpanKind = SpanKind.INTERNAL,
+):
+    """Run every call of coroutine function ``fn`` in its own span.
+
+    Examples:
+        ::
+
+            class UserService:
+                @traced
+                async def create_user(self, cmd):
+                    ...
+
+    Args:
+        fn: Coroutine function.
+        name: Name of span, qualified name of ``fn`` by default.
+        kind: Kind of span.
+    """
+    # fn is None when params for decorator are provided
+    if fn is None:
+        return functools.partial(traced, name=name, kind=kind)
+
+    if not asyncio.iscoroutinefunction(fn):
+        raise TypeError(f"traced expects a coroutine function, got {fn!r}")
+
+    span_name = name or fn.__qualname__
+
+    @functools.wraps(fn)
+    async def inner(*args: Any, **kwargs: Any) -> Any:
+        if _exporter is None:
+            return await fn(*args, **kwargs)
+        with start_span(span_name, kind=kind):
+            return await fn(*args, **kwargs)
+
+    return inner
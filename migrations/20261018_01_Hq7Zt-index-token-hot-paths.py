@@ -0,0 +1,27 @@
+"""
+index token hot paths
+
+refresh_tokens is looked up and deleted by (user_id, fingerprint), which no
+existing index covers. access_tokens.refresh_id is served by the leading column
+of ``all_values_in_access_are_unique`` and users.username by its unique
+constraint, so they get no extra index.
+
+Indexes are built concurrently, so the migration runs outside a transaction.
+"""
+
+from yoyo import step
+
+__depends__ = {"20221122_01_bRcic-create-table-if-not-exists-access-tokens"}
+__transactional__ = False
+
+steps = [
+    step(
+        """
+            create index concurrently if not exists refresh_tokens_user_id_fingerprint_idx
+                on refresh_tokens(user_id, fingerprint);
+        """,
+        """
+            drop index concurrently if exists refresh_tokens_user_id_fingerprint_idx;
+        """
+    )
+]
@@ -0,0 +1,21 @@
+"""
+add users password_updated_at
+
+``UserRepository.update`` sets this column, but it was never created.
+"""
+
+from yoyo import step
+
+__depends__ = {"20220227_01_DJhOA-create-users-table"}
+
+steps = [
+    step(
+        """
+            alter table users
+                add column if not exists password_updated_at timestamp with time zone;
+        """,
+        """
+            alter table users drop column if exists password_updated_at;
+        """
+    )
+]
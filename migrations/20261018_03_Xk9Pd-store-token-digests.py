@@ -0,0 +1,33 @@
+"""
+store token digests
+
+refresh_tokens.refresh_token and access_tokens.access_token hold SHA-256 of
+the token instead of its text. Existing rows are converted in place.
+
+Rollback can't restore tokens from digests, so it removes all sessions.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261018_01_Hq7Zt-index-token-hot-paths"}
+
+steps = [
+    step(
+        """
+            alter table refresh_tokens
+                alter column refresh_token type bytea
+                using sha256(convert_to(refresh_token, 'UTF8'));
+            alter table access_tokens
+                alter column access_token type bytea
+                using sha256(convert_to(access_token, 'UTF8'));
+        """,
+        """
+            delete from refresh_tokens;
+            delete from access_tokens;
+            alter table refresh_tokens
+                alter column refresh_token type text using encode(refresh_token, 'hex');
+            alter table access_tokens
+                alter column access_token type text using encode(access_token, 'hex');
+        """
+    )
+]
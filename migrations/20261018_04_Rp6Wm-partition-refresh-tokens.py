@@ -0,0 +1,231 @@
+"""
+partition refresh tokens
+
+refresh_tokens is range partitioned by createdat into weekly partitions and
+access_tokens by createdat of its refresh token, so expired sessions are
+removed by dropping whole partitions instead of deleting rows.
+
+Unique constraints of partitioned tables must contain the partition key, so
+createdat is added to them. Existing rows are copied into the new tables.
+
+create_token_partitions(since, until) creates partitions of both tables for
+every week in range. drop_expired_token_partitions(retention, lock_wait) drops
+partitions which ended more than ``retention`` ago and returns estimated count
+of dropped refresh tokens. Partitions whose locks are not granted within
+``lock_wait`` are skipped until the next call.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261018_03_Xk9Pd-store-token-digests"}
+
+steps = [
+    step(
+        """
+            alter table access_tokens rename to access_tokens_unpartitioned;
+            alter table refresh_tokens rename to refresh_tokens_unpartitioned;
+            alter sequence access_tokens_id_seq rename to access_tokens_unpartitioned_id_seq;
+            alter sequence refresh_tokens_id_seq rename to refresh_tokens_unpartitioned_id_seq;
+
+            create table refresh_tokens(
+                id serial,
+                user_id int references users(id) on delete cascade,
+                refresh_token bytea not null,
+                fingerprint text not null,
+                expiresat bigint not null,
+                createdat timestamp with time zone not null default now(),
+                constraint refresh_tokens_pk primary key (id, createdat),
+                constraint refresh_tokens_refresh_token_uq unique (refresh_token, createdat)
+            ) partition by range (createdat);
+
+            create table access_tokens(
+                id serial,
+                refresh_id int not null,
+                refresh_createdat timestamp with time zone not null,
+                access_token bytea not null,
+                constraint access_tokens_pk primary key (id, refresh_createdat),
+                constraint access_tokens_access_token_uq unique (
+                    access_token, refresh_createdat
+                ),
+                constraint access_tokens_refresh_fk foreign key (
+                    refresh_id, refresh_createdat
+                ) references refresh_tokens(id, createdat) on delete cascade
+            ) partition by range (refresh_createdat);
+        """,
+        """
+            drop table if exists access_tokens;
+            drop table if exists refresh_tokens;
+            alter sequence access_tokens_unpartitioned_id_seq rename to access_tokens_id_seq;
+            alter sequence refresh_tokens_unpartitioned_id_seq rename to refresh_tokens_id_seq;
+            alter table refresh_tokens_unpartitioned rename to refresh_tokens;
+            alter table access_tokens_unpartitioned rename to access_tokens;
+        """
+    ),
+    step(
+        """
+            create or replace function create_token_partitions(
+                since timestamp with time zone,
+                until timestamp with time zone
+            ) returns void language plpgsql as $$
+            declare
+                week_start timestamp with time zone :=
+                    date_trunc('week', since at time zone 'UTC') at time zone 'UTC';
+                suffix text;
+            begin
+                while week_start < until loop
+                    suffix := to_char(week_start at time zone 'UTC', 'YYYYMMDD');
+                    execute format(
+                        'create table if not exists %I partition of refresh_tokens '
+                        'for values from (%L) to (%L)',
+                        'refresh_tokens_p' || suffix,
+                        week_start,
+                        week_start + interval '1 week'
+                    );
+                    execute format(
+                        'create table if not exists %I partition of access_tokens '
+                        'for values from (%L) to (%L)',
+                        'access_tokens_p' || suffix,
+                        week_start,
+                        week_start + interval '1 week'
+                    );
+                    week_start := week_start + interval '1 week';
+                end loop;
+            end;
+            $$;
+
+            create or replace function drop_expired_token_partitions(
+                retention interval,
+                lock_wait interval default interval '1 second'
+            ) returns bigint language plpgsql as $$
+            declare
+                partition record;
+                dropped bigint := 0;
+                previous_lock_timeout text := current_setting('lock_timeout');
+            begin
+                -- Detach and drop wait for access exclusive locks on parents.
+                -- A queued request blocks every later query of the table, so
+                -- it gives up after lock_wait and the partition is retried by
+                -- the next call.
+                perform set_config(
+                    'lock_timeout',
+                    (extract(epoch from lock_wait) * 1000)::bigint::text,
+                    true
+                );
+                for partition in
+                    select
+                        child.relname as name,
+                        right(child.relname, 8) as suffix,
+                        greatest(child.reltuples, 0)::bigint as rows
+                    from pg_inherits
+                        join pg_class child on child.oid = pg_inherits.inhrelid
+                    where pg_inherits.inhparent = 'refresh_tokens'::regclass
+                        -- Planner may check the week before the name, so only
+                        -- names of create_token_partitions reach to_date.
+                        and case
+                            when child.relname ~ '^refresh_tokens_p[0-9]{8}$' then (
+                                to_date(right(child.relname, 8), 'YYYYMMDD') + 7
+                            )::timestamp at time zone 'UTC' < now() - retention
+                        end
+                loop
+                    begin
+                        execute format('drop table if exists %I', 'access_tokens_p' || partition.suffix);
+                        execute format('alter table refresh_tokens detach partition %I', partition.name);
+                        execute format('drop table %I', partition.name);
+                        dropped := dropped + partition.rows;
+                    exception when lock_not_available then
+                        raise notice 'partition % is busy, skipped', partition.name;
+                    end;
+                end loop;
+                perform set_config('lock_timeout', previous_lock_timeout, true);
+                return dropped;
+            end;
+            $$;
+        """,
+        """
+            drop function if exists drop_expired_token_partitions(interval, interval);
+            drop function if exists create_token_partitions(
+                timestamp with time zone, timestamp with time zone
+            );
+        """
+    ),
+    step(
+        """
+            select create_token_partitions(
+                coalesce(
+                    (select min(createdat) from refresh_tokens_unpartitioned),
+                    now()
+                ),
+                now() + interval '4 weeks'
+            );
+
+            insert into refresh_tokens(
+                id, user_id, refresh_token, fingerprint, expiresat, createdat
+            )
+                select id, user_id, refresh_token, fingerprint, expiresat, coalesce(createdat, now())
+                from refresh_tokens_unpartitioned;
+            insert into access_tokens(id, refresh_id, refresh_createdat, access_token)
+                select at.id, at.refresh_id, rt.createdat, at.access_token
+                from access_tokens_unpartitioned at
+                    join refresh_tokens rt on rt.id = at.refresh_id;
+            select setval(
+                pg_get_serial_sequence('refresh_tokens', 'id'),
+                coalesce((select max(id) from refresh_tokens), 0) + 1,
+                false
+            );
+            select setval(
+                pg_get_serial_sequence('access_tokens', 'id'),
+                coalesce((select max(id) from access_tokens), 0) + 1,
+                false
+            );
+
+            drop table access_tokens_unpartitioned;
+            drop table refresh_tokens_unpartitioned;
+
+            create index refresh_tokens_user_id_fingerprint_idx
+                on refresh_tokens(user_id, fingerprint);
+            create index access_tokens_refresh_idx
+                on access_tokens(refresh_id, refresh_createdat);
+        """,
+        """
+            create table refresh_tokens_unpartitioned(
+                id serial primary key,
+                user_id int references users(id) ON DELETE CASCADE,
+                refresh_token bytea not null unique,
+                fingerprint text not null,
+                expiresat bigint not null,
+                createdat timestamp with time zone default now(),
+                constraint all_value_in_row_must_be_unique unique (
+                    user_id, refresh_token, fingerprint
+                )
+            );
+            create table access_tokens_unpartitioned(
+                id serial primary key,
+                refresh_id int references refresh_tokens_unpartitioned(id) ON DELETE CASCADE,
+                access_token bytea not null unique,
+                constraint all_values_in_access_are_unique unique (
+                    refresh_id, access_token
+                )
+            );
+
+            insert into refresh_tokens_unpartitioned
+                select id, user_id, refresh_token, fingerprint, expiresat, createdat
+                from refresh_tokens;
+            insert into access_tokens_unpartitioned
+                select id, refresh_id, access_token from access_tokens;
+            select setval(
+                pg_get_serial_sequence('refresh_tokens_unpartitioned', 'id'),
+                coalesce((select max(id) from refresh_tokens_unpartitioned), 0) + 1,
+                false
+            );
+            select setval(
+                pg_get_serial_sequence('access_tokens_unpartitioned', 'id'),
+                coalesce((select max(id) from access_tokens_unpartitioned), 0) + 1,
+                false
+            );
+
+            drop index refresh_tokens_user_id_fingerprint_idx;
+            create index refresh_tokens_user_id_fingerprint_idx
+                on refresh_tokens_unpartitioned(user_id, fingerprint);
+        """
+    ),
+]
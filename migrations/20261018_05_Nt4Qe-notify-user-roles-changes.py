@@ -0,0 +1,36 @@
+"""
+notify user roles changes
+
+user_roles is changed by migrations and by hand, not by the application, so
+a statement trigger sends ``{"topic": "role", "keys": []}`` to channel
+``cache_invalidation`` and every worker reloads its ``RoleCache``.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261018_04_Rp6Wm-partition-refresh-tokens"}
+
+steps = [
+    step(
+        """
+            create or replace function notify_user_roles_changed()
+                returns trigger language plpgsql as $$
+            begin
+                perform pg_notify(
+                    'cache_invalidation',
+                    json_build_object('topic', 'role', 'keys', json_build_array())::text
+                );
+                return null;
+            end;
+            $$;
+
+            create trigger user_roles_changed
+                after insert or update or delete or truncate on user_roles
+                for each statement execute function notify_user_roles_changed();
+        """,
+        """
+            drop trigger if exists user_roles_changed on user_roles;
+            drop function if exists notify_user_roles_changed();
+        """
+    ),
+]
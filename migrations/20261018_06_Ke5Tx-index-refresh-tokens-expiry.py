@@ -0,0 +1,29 @@
+"""
+index refresh tokens expiry
+
+expiresat holds lifetime of the token in seconds, so expired rows could be
+found only by computing ``createdat + expiresat`` for every row. expires_at
+holds the moment itself and is indexed, so batches of ``delete_expired`` read
+only expired rows of each partition.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261018_05_Nt4Qe-notify-user-roles-changes"}
+
+steps = [
+    step(
+        """
+            alter table refresh_tokens add column expires_at timestamp with time zone;
+            update refresh_tokens
+                set expires_at = createdat + make_interval(secs => expiresat);
+            alter table refresh_tokens alter column expires_at set not null;
+
+            create index refresh_tokens_expires_at_idx on refresh_tokens(expires_at);
+        """,
+        """
+            drop index if exists refresh_tokens_expires_at_idx;
+            alter table refresh_tokens drop column if exists expires_at;
+        """
+    ),
+]
@@ -0,0 +1,189 @@
+"""
+serialise token partition maintenance
+
+Every worker creates partitions on startup and runs its own session reaper,
+so create_token_partitions and drop_expired_token_partitions are called
+concurrently. Both now take a transaction advisory lock: creation waits for
+the holder, dropping returns 0 at once. A partition dropped by somebody else
+between the lookup and the drop is skipped instead of failing the call.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261018_06_Ke5Tx-index-refresh-tokens-expiry"}
+
+steps = [
+    step(
+        """
+            create or replace function create_token_partitions(
+                since timestamp with time zone,
+                until timestamp with time zone
+            ) returns void language plpgsql as $$
+            declare
+                week_start timestamp with time zone :=
+                    date_trunc('week', since at time zone 'UTC') at time zone 'UTC';
+                suffix text;
+            begin
+                -- Every worker creates partitions on startup. Concurrent
+                -- creation of the same table fails even with "if not exists",
+                -- so workers wait for each other.
+                perform pg_advisory_xact_lock(hashtext('token_partitions'));
+                while week_start < until loop
+                    suffix := to_char(week_start at time zone 'UTC', 'YYYYMMDD');
+                    execute format(
+                        'create table if not exists %I partition of refresh_tokens '
+                        'for values from (%L) to (%L)',
+                        'refresh_tokens_p' || suffix,
+                        week_start,
+                        week_start + interval '1 week'
+                    );
+                    execute format(
+                        'create table if not exists %I partition of access_tokens '
+                        'for values from (%L) to (%L)',
+                        'access_tokens_p' || suffix,
+                        week_start,
+                        week_start + interval '1 week'
+                    );
+                    week_start := week_start + interval '1 week';
+                end loop;
+            end;
+            $$;
+
+            create or replace function drop_expired_token_partitions(
+                retention interval,
+                lock_wait interval default interval '1 second'
+            ) returns bigint language plpgsql as $$
+            declare
+                partition record;
+                dropped bigint := 0;
+                previous_lock_timeout text := current_setting('lock_timeout');
+            begin
+                -- Reapers of all workers run at the same time. One of them
+                -- drops the partitions, the others return at once.
+                if not pg_try_advisory_xact_lock(hashtext('token_partitions')) then
+                    return 0;
+                end if;
+
+                -- Detach and drop wait for access exclusive locks on parents.
+                -- A queued request blocks every later query of the table, so
+                -- it gives up after lock_wait and the partition is retried by
+                -- the next call.
+                perform set_config(
+                    'lock_timeout',
+                    (extract(epoch from lock_wait) * 1000)::bigint::text,
+                    true
+                );
+                for partition in
+                    select
+                        child.relname as name,
+                        right(child.relname, 8) as suffix,
+                        greatest(child.reltuples, 0)::bigint as rows
+                    from pg_inherits
+                        join pg_class child on child.oid = pg_inherits.inhrelid
+                    where pg_inherits.inhparent = 'refresh_tokens'::regclass
+                        -- Planner may check the week before the name, so only
+                        -- names of create_token_partitions reach to_date.
+                        and case
+                            when child.relname ~ '^refresh_tokens_p[0-9]{8}$' then (
+                                to_date(right(child.relname, 8), 'YYYYMMDD') + 7
+                            )::timestamp at time zone 'UTC' < now() - retention
+                        end
+                loop
+                    begin
+                        execute format('drop table if exists %I', 'access_tokens_p' || partition.suffix);
+                        execute format('alter table refresh_tokens detach partition %I', partition.name);
+                        execute format('drop table %I', partition.name);
+                        dropped := dropped + partition.rows;
+                    exception
+                        when lock_not_available then
+                            raise notice 'partition % is busy, skipped', partition.name;
+                        when undefined_table then
+                            raise notice 'partition % is already dropped', partition.name;
+                    end;
+                end loop;
+                perform set_config('lock_timeout', previous_lock_timeout, true);
+                return dropped;
+            end;
+            $$;
+        """,
+        """
+            create or replace function create_token_partitions(
+                since timestamp with time zone,
+                until timestamp with time zone
+            ) returns void language plpgsql as $$
+            declare
+                week_start timestamp with time zone :=
+                    date_trunc('week', since at time zone 'UTC') at time zone 'UTC';
+                suffix text;
+            begin
+                while week_start < until loop
+                    suffix := to_char(week_start at time zone 'UTC', 'YYYYMMDD');
+                    execute format(
+                        'create table if not exists %I partition of refresh_tokens '
+                        'for values from (%L) to (%L)',
+                        'refresh_tokens_p' || suffix,
+                        week_start,
+                        week_start + interval '1 week'
+                    );
+                    execute format(
+                        'create table if not exists %I partition of access_tokens '
+                        'for values from (%L) to (%L)',
+                        'access_tokens_p' || suffix,
+                        week_start,
+                        week_start + interval '1 week'
+                    );
+                    week_start := week_start + interval '1 week';
+                end loop;
+            end;
+            $$;
+
+            create or replace function drop_expired_token_partitions(
+                retention interval,
+                lock_wait interval default interval '1 second'
+            ) returns bigint language plpgsql as $$
+            declare
+                partition record;
+                dropped bigint := 0;
+                previous_lock_timeout text := current_setting('lock_timeout');
+            begin
+                -- Detach and drop wait for access exclusive locks on parents.
+                -- A queued request blocks every later query of the table, so
+                -- it gives up after lock_wait and the partition is retried by
+                -- the next call.
+                perform set_config(
+                    'lock_timeout',
+                    (extract(epoch from lock_wait) * 1000)::bigint::text,
+                    true
+                );
+                for partition in
+                    select
+                        child.relname as name,
+                        right(child.relname, 8) as suffix,
+                        greatest(child.reltuples, 0)::bigint as rows
+                    from pg_inherits
+                        join pg_class child on child.oid = pg_inherits.inhrelid
+                    where pg_inherits.inhparent = 'refresh_tokens'::regclass
+                        -- Planner may check the week before the name, so only
+                        -- names of create_token_partitions reach to_date.
+                        and case
+                            when child.relname ~ '^refresh_tokens_p[0-9]{8}$' then (
+                                to_date(right(child.relname, 8), 'YYYYMMDD') + 7
+                            )::timestamp at time zone 'UTC' < now() - retention
+                        end
+                loop
+                    begin
+                        execute format('drop table if exists %I', 'access_tokens_p' || partition.suffix);
+                        execute format('alter table refresh_tokens detach partition %I', partition.name);
+                        execute format('drop table %I', partition.name);
+                        dropped := dropped + partition.rows;
+                    exception when lock_not_available then
+                        raise notice 'partition % is busy, skipped', partition.name;
+                    end;
+                end loop;
+                perform set_config('lock_timeout', previous_lock_timeout, true);
+                return dropped;
+            end;
+            $$;
+        """
+    ),
+]
@@ -0,0 +1,4 @@
+"""Benchmarks for hot paths of the api server.
+
+Each module is runnable with ``python -m scripts.benchmarks.<name> --help``.
+"""
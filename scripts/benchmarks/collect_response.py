@@ -0,0 +1,79 @@
+"""Microbenchmark of row conversion in ``collect_response``.
+
+Reports microseconds spent per row on ``User`` and ``JWTToken`` by the previous
+``parse_obj_as`` conversion and by converters compiled at decoration time::
+
+    python -m scripts.benchmarks.collect_response --rows 1000 --number 20
+"""
+
+import timeit
+from argparse import ArgumentParser
+from typing import List
+
+import pydantic
+from psycopg2.extras import RealDictRow
+
+from app.internal.repository.postgresql.handlers.collect_response import (
+    _convert_memory_viewer,
+    compile_converter,
+)
+from app.pkg.models import User
+from app.pkg.models.refresh_token import JWTToken
+
+ROWS = {
+    User: {
+        "id": 1,
+        "username": "TestTest",
+        "password": memoryview(b"$2b$12$0123456789012345678901234567890123456789012345678"),
+        "role_name": "user",
+    },
+    JWTToken: {
+        "id": 1,
+        "user_id": 1,
+        "refresh_token": memoryview(bytes(32)),
+        "fingerprint": "fingerprint",
+        "expiresat": 2592000,
+    },
+}
+
+
+def _make_rows(values: dict, count: int) -> List[RealDictRow]:
+    rows = []
+    for i in range(count):
+        row = RealDictRow()
+        row.update(values, id=i + 1)
+        rows.append(row)
+    return rows
+
+
+def run(rows: int, number: int):
+    print(f"{'model':<12}{'parse_obj_as':>16}{'validated':>16}{'trusted':>16}  us/row")
+    for model, values in ROWS.items():
+        batch = _make_rows(values, rows)
+        annotation = List[model]
+        candidates = {
+            "parse_obj_as": lambda: pydantic.parse_obj_as(
+                annotation,
+                _convert_memory_viewer(batch),
+            ),
+            "validated": lambda c=compile_converter(annotation, trusted_rows=False): c(batch),
+            "trusted": lambda c=compile_converter(annotation): c(batch),
+        }
+        results = [
+            timeit.timeit(fn, number=number) / (number * rows) * 1e6
+            for fn in candidates.values()
+        ]
+        print(f"{model.__name__:<12}" + "".join(f"{r:>16.2f}" for r in results))
+
+
+def parse_cli_args():
+    """Parse cli arguments."""
+    parser = ArgumentParser(description="Benchmark conversion of rows to models")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_cli_args()
+    run(rows=args.rows, number=args.number)
@@ -0,0 +1,49 @@
+"""Microbenchmark of jwt codecs.
+
+Reports encode and decode operations per second of every engine which can be
+selected by ``JWT_CODEC`` setting::
+
+    python -m scripts.benchmarks.jwt_codecs --number 20000
+"""
+
+import timeit
+from argparse import ArgumentParser
+from datetime import timedelta
+from typing import get_args
+from uuid import uuid4
+
+from app.pkg.jwt.base import JwtAuthBase
+from app.pkg.jwt.codec import get_codec
+from app.pkg.settings.settings import Settings
+
+
+def run(number: int, algorithm: str):
+    claims = JwtAuthBase._generate_payload(
+        subject={"user_id": 1, "role_name": "user"},
+        expires_delta=timedelta(days=15),
+        unique_identifier=str(uuid4()),
+        token_type="access",
+    )
+
+    engines = get_args(Settings.__fields__["JWT_CODEC"].outer_type_)
+    print(f"{'engine':<10}{'encode ops/s':>16}{'decode ops/s':>16}")
+    for engine in engines:
+        codec = get_codec(engine=engine, secret_key="benchmark-secret", algorithm=algorithm)
+        token = codec.encode(claims)
+
+        encode = timeit.timeit(lambda: codec.encode(claims), number=number)
+        decode = timeit.timeit(lambda: codec.decode(token, leeway=10), number=number)
+        print(f"{engine:<10}{number / encode:>16.0f}{number / decode:>16.0f}")
+
+
+def parse_cli_args():
+    """Parse cli arguments."""
+    parser = ArgumentParser(description="Benchmark jwt codecs")
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--algorithm", default="HS256")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_cli_args()
+    run(number=args.number, algorithm=args.algorithm)
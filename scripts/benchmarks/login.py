@@ -0,0 +1,107 @@
+"""Load benchmark of ``POST /auth/login``.
+
+Run it against a started server to compare latency before and after a change::
+
+    python -m scripts.benchmarks.login --url http://localhost:5000 \
+        --username admin --password password --requests 2000 --concurrency 50
+"""
+
+import asyncio
+import time
+from argparse import ArgumentParser
+from typing import List
+
+import httpx
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted ``values``."""
+    if not values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    queue: "asyncio.Queue[int]",
+    body: dict,
+    latencies: List[float],
+    errors: List[int],
+):
+    while True:
+        try:
+            number = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+
+        payload = {**body, "fingerprint": f"{body['fingerprint']}-{number}"}
+        started = time.perf_counter()
+        response = await client.post("/auth/login", json=payload)
+        latencies.append(time.perf_counter() - started)
+        if not response.is_success:
+            errors.append(response.status_code)
+
+
+async def run(
+    url: str,
+    username: str,
+    password: str,
+    requests: int,
+    concurrency: int,
+    fingerprints: int,
+):
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for number in range(requests):
+        queue.put_nowait(number % fingerprints)
+
+    body = {"username": username, "password": password, "fingerprint": "benchmark"}
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _worker(client, queue, body, latencies, errors)
+                for _ in range(concurrency)
+            ),
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests:    {len(latencies)} ({len(errors)} failed)")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    for percent in (50, 90, 99):
+        print(f"p{percent}:         {percentile(latencies, percent) * 1000:.2f} ms")
+
+
+def parse_cli_args():
+    """Parse cli arguments."""
+    parser = ArgumentParser(description="Benchmark POST /auth/login")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--fingerprints",
+        type=int,
+        default=100,
+        help="Number of distinct devices used by the benchmark",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_cli_args()
+    asyncio.run(
+        run(
+            url=args.url,
+            username=args.username,
+            password=args.password,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            fingerprints=args.fingerprints,
+        ),
+    )
@@ -0,0 +1,156 @@
+"""Per-request overhead of http metrics middlewares.
+
+Calls an ASGI application with routes shaped like the ones of the API
+directly, without server and sockets, so the difference between rows is the
+cost of middleware itself::
+
+    python -m scripts.benchmarks.metrics --number 20000
+
+Both middlewares register metrics of the same names, so each one is measured
+in its own process.
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Callable, Dict
+
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+PATHS = ["/user/", "/user/42", "/auth/login", "/auth/.well-known/jwks.json", "/nope"]
+
+
+async def _endpoint(request):
+    return Response(b"{}", media_type="application/json")
+
+
+def _application() -> Starlette:
+    return Starlette(
+        routes=[
+            Route("/user/", _endpoint, methods=["GET", "POST"]),
+            Route("/user/stream", _endpoint),
+            Route("/user/{user_id:int}", _endpoint, methods=["GET", "DELETE"]),
+            Route("/auth/login", _endpoint),
+            Route("/auth/refresh", _endpoint, methods=["PATCH"]),
+            Route("/auth/logout", _endpoint, methods=["POST"]),
+            Route("/auth/.well-known/jwks.json", _endpoint),
+            Route("/debug/profile", _endpoint),
+        ],
+    )
+
+
+def _add_metrics_middleware(app: Starlette) -> None:
+    from app.internal.pkg.middlewares.metrics import MetricsMiddleware
+
+    app.add_middleware(MetricsMiddleware)
+
+
+def _add_starlette_prometheus(app: Starlette) -> None:
+    from starlette_prometheus import PrometheusMiddleware
+
+    app.add_middleware(PrometheusMiddleware)
+
+
+MIDDLEWARES: Dict[str, Callable[[Starlette], None]] = {
+    "none": lambda app: None,
+    "MetricsMiddleware": _add_metrics_middleware,
+    "starlette_prometheus": _add_starlette_prometheus,
+}
+
+
+class _Connection:
+    """Server side of one request with empty body.
+
+    Like a server, ``receive`` reports disconnect once the response is sent,
+    which ends ``listen_for_disconnect`` of streaming responses.
+    """
+
+    def __init__(self):
+        self.requested = False
+        self.completed = asyncio.Event()
+
+    async def receive(self) -> Message:
+        if not self.requested:
+            self.requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.completed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            self.completed.set()
+
+
+async def _measure(app: ASGIApp, number: int) -> float:
+    """Microseconds per request to ``app``."""
+    scopes = [
+        {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", 1),
+            "server": ("127.0.0.1", 80),
+        }
+        for path in PATHS
+    ]
+    started = time.perf_counter()
+    for call in range(number):
+        connection = _Connection()
+        await app(dict(scopes[call % len(scopes)]), connection.receive, connection.send)
+    return (time.perf_counter() - started) / number * 1e6
+
+
+async def measure_middleware(name: str, number: int) -> float:
+    app = _application()
+    MIDDLEWARES[name](app)
+    await _measure(app, number=number // 10)  # warm up
+    return await _measure(app, number=number)
+
+
+def run(number: int):
+    results = {}
+    for name in MIDDLEWARES:
+        output = subprocess.run(
+            [
+                sys.executable, "-m", __spec__.name,
+                "--only", name, "--number", str(number),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if output.returncode:
+            print(f"{name}: failed\n{output.stderr}", file=sys.stderr)
+            continue
+        results[name] = float(output.stdout.strip().splitlines()[-1])
+
+    print(f"{'middleware':<24}{'us/request':>12}{'overhead':>12}")
+    for name, micros in results.items():
+        print(f"{name:<24}{micros:>12.1f}{micros - results['none']:>12.1f}")
+
+
+def parse_cli_args():
+    """Parse cli arguments."""
+    parser = ArgumentParser(description="Benchmark overhead of metrics middlewares")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--only", choices=list(MIDDLEWARES), help="run in this process")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_cli_args()
+    if args.only:
+        print(asyncio.run(measure_middleware(args.only, number=args.number)))
+    else:
+        run(number=args.number)
@@ -0,0 +1,135 @@
+"""Side by side benchmark of aiopg and asyncpg connectors.
+
+Runs hot repository methods against the database from settings and reports
+microseconds per call for each driver::
+
+    python -m scripts.benchmarks.repositories --number 2000 --concurrency 10
+
+The benchmark creates a user and sessions of its own and deletes them at exit.
+"""
+
+import asyncio
+import time
+from argparse import ArgumentParser
+from typing import Awaitable, Callable, Dict
+
+from dependency_injector import providers
+
+from app import create_app
+from app.internal.repository.postgresql import RefreshTokenRepository, UserRepository
+from app.pkg import models
+from app.pkg.connectors import AsyncpgPostgresql, Postgresql
+from app.pkg.models.refresh_token import (
+    CreateSessionCommand,
+    ReadJWTTokenQueryByFingerprint,
+)
+from app.pkg.settings import settings
+
+DRIVERS = {"aiopg": Postgresql, "asyncpg": AsyncpgPostgresql}
+
+
+def _connector(driver: str, pool_size: int) -> Postgresql:
+    return DRIVERS[driver](
+        username=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        database_name=settings.POSTGRES_DATABASE_NAME,
+        pool_min_size=pool_size,
+        pool_max_size=pool_size,
+    )
+
+
+async def _measure(
+    fn: Callable[[int], Awaitable[object]],
+    number: int,
+    concurrency: int,
+) -> float:
+    """Microseconds of wall time per call of ``fn`` by ``concurrency`` workers."""
+    calls = iter(range(number))
+
+    async def worker():
+        for call in calls:
+            await fn(call)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return (time.perf_counter() - started) / number * 1e6
+
+
+async def _run_driver(number: int, concurrency: int) -> Dict[str, float]:
+    users = UserRepository()
+    tokens = RefreshTokenRepository()
+    user = await users.create(
+        cmd=models.CreateUserCommand(
+            username=f"benchmark_{time.time_ns()}",
+            password=b"benchmark-password",
+            role_name="user",
+        ),
+    )
+
+    def session(call: int) -> CreateSessionCommand:
+        return CreateSessionCommand(
+            user_id=user.id,
+            refresh_token=f"refresh-{time.time_ns()}-{call}",
+            fingerprint=f"benchmark-{call % concurrency}",
+            access_token=f"access-{time.time_ns()}-{call}",
+        )
+
+    cases = {
+        "user.read": lambda call: users.read(
+            query=models.ReadUserByIdQuery(id=user.id),
+        ),
+        "user.read_by_username": lambda call: users.read_by_username(
+            query=models.ReadUserByUserNameQuery(username=user.username),
+        ),
+        "user.read_page": lambda call: users.read_page(
+            query=models.ReadUsersPageQuery(limit=100),
+        ),
+        "token.create_session": lambda call: tokens.create_session(cmd=session(call)),
+        "token.read_by_fingerprint": lambda call: tokens.read_by_fingerprint(
+            query=ReadJWTTokenQueryByFingerprint(
+                user_id=user.id,
+                fingerprint=f"benchmark-{call % concurrency}",
+            ),
+        ),
+    }
+    try:
+        return {
+            name: await _measure(fn, number=number, concurrency=concurrency)
+            for name, fn in cases.items()
+        }
+    finally:
+        # Sessions of the user are deleted with it by ``on delete cascade``.
+        await users.delete(cmd=models.DeleteUserCommand(id=user.id))
+
+
+async def run(number: int, concurrency: int):
+    app = create_app()
+    results: Dict[str, Dict[str, float]] = {}
+    for driver in DRIVERS:
+        connector = _connector(driver, pool_size=concurrency)
+        app.connectors.postgresql.override(providers.Object(connector))
+        try:
+            await connector.create_pool()
+            results[driver] = await _run_driver(number=number, concurrency=concurrency)
+        finally:
+            app.connectors.postgresql.reset_override()
+            await connector.close_pool()
+
+    print(f"{'method':<28}" + "".join(f"{driver:>12}" for driver in DRIVERS) + "  us/call")
+    for name in results["aiopg"]:
+        print(f"{name:<28}" + "".join(f"{results[d][name]:>12.1f}" for d in DRIVERS))
+
+
+def parse_cli_args():
+    """Parse cli arguments."""
+    parser = ArgumentParser(description="Benchmark repositories on aiopg and asyncpg")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_cli_args()
+    asyncio.run(run(number=args.number, concurrency=args.concurrency))
@@ -0,0 +1,35 @@
+import httpx
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from app.internal.pkg.middlewares.metrics import MetricsMiddleware, metrics
+
+
+def _responses(path_template: str, status_code: str) -> float:
+    return REGISTRY.get_sample_value(
+        "starlette_responses_total",
+        {"method": "GET", "path_template": path_template, "status_code": status_code},
+    ) or 0.0
+
+
+async def test_requests_are_labelled_by_route_template():
+    app = FastAPI()
+
+    @app.get("/orders/{order_id}")
+    async def read_order(order_id: int):
+        return {"id": order_id}
+
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics)
+    before = _responses("/orders/{order_id}", "200"), _responses("<unmatched>", "404")
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        for order_id in range(3):
+            await client.get(f"/orders/{order_id}")
+        await client.get("/wp-login.php")
+        exposed = (await client.get("/metrics")).text
+
+    assert _responses("/orders/{order_id}", "200") - before[0] == 3
+    assert _responses("<unmatched>", "404") - before[1] == 1
+    assert 'path_template="/orders/0"' not in exposed
+    assert 'path_template="/wp-login.php"' not in exposed
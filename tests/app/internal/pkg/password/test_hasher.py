@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+from pydantic import SecretBytes
+
+from app.internal.pkg.password.hasher import PasswordHasher
+from app.pkg.models.exceptions.password import PasswordHasherUnavailable
+
+
+async def test_crypt_and_check():
+    hasher = PasswordHasher(max_workers=2, queue_size=2)
+    hashed = await hasher.crypt_password(b"supeR_%$tr0ng-pa$$worD")
+
+    assert await hasher.check_password(
+        SecretBytes(b"supeR_%$tr0ng-pa$$worD"),
+        SecretBytes(hashed),
+    )
+    assert not await hasher.check_password(SecretBytes(b"wrong"), SecretBytes(hashed))
+    hasher.shutdown()
+
+
+async def test_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, queue_size=1)
+    running = [
+        asyncio.create_task(hasher.crypt_password(b"password")) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherUnavailable):
+        await hasher.crypt_password(b"password")
+
+    await asyncio.gather(*running)
+    assert hasher.pending == 0
+    hasher.shutdown()
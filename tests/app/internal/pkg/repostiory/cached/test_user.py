@@ -0,0 +1,71 @@
+from aiocache import SimpleMemoryCache
+from aiocache.serializers import StringSerializer
+
+from app.internal.repository.cached import CachedUserRepository, decode_user, encode_user
+from app.pkg import models
+from app.pkg.cache import LocalCache, TwoTierCache
+
+
+class _UserRepository:
+    def __init__(self):
+        self.user = models.User(
+            id=1,
+            username="TestTest",
+            password=b"hashed password",
+            role_name="user",
+        )
+        self.calls = []
+
+    async def read(self, query: models.ReadUserByIdQuery) -> models.User:
+        self.calls.append("read")
+        return self.user
+
+    async def read_by_username(
+        self,
+        query: models.ReadUserByUserNameQuery,
+    ) -> models.User:
+        self.calls.append("read_by_username")
+        return self.user
+
+
+def make_repository(repository, remote) -> CachedUserRepository:
+    """Repository of one worker: own local tiers, shared remote tier."""
+    return CachedUserRepository(
+        repository=repository,
+        users=TwoTierCache(
+            name="user:id",
+            local=LocalCache(maxsize=10, ttl=60),
+            remote=remote,
+            encode=encode_user,
+            decode=decode_user,
+        ),
+        usernames=TwoTierCache(
+            name="user:username",
+            local=LocalCache(maxsize=10, ttl=60),
+            remote=remote,
+            encode=str,
+            decode=int,
+        ),
+    )
+
+
+async def test_password_hash_stays_in_process():
+    remote = SimpleMemoryCache(serializer=StringSerializer())
+    repository = _UserRepository()
+    first = make_repository(repository, remote)
+    second = make_repository(repository, remote)
+    by_username = models.ReadUserByUserNameQuery(username="TestTest")
+
+    user = await first.read_by_username(query=by_username)
+    assert "password" not in await remote.get("user:id:1")
+    assert await first.read_by_username(query=by_username) is user
+
+    shared = await second.read(query=models.ReadUserByIdQuery(id=1))
+    assert shared.username == "TestTest"
+    assert shared.password is None
+    assert repository.calls == ["read_by_username"]
+
+    # Login needs the hash, so it is read from repository again.
+    user = await second.read_by_username(query=by_username)
+    assert user.password.get_secret_value() == b"hashed password"
+    assert repository.calls == ["read_by_username", "read_by_username"]
@@ -0,0 +1,169 @@
+from typing import List
+
+import psycopg2
+import pydantic
+import pytest
+from prometheus_client import REGISTRY
+from psycopg2.extras import RealDictRow
+
+from app.internal.repository.exceptions import EmptyResult
+from app.internal.repository.postgresql.handlers.collect_response import (
+    collect_response,
+    collect_stream,
+    compile_converter,
+)
+from app.pkg.models import User
+from app.pkg.models.refresh_token import JWTToken
+from app.pkg.tracing import InMemoryExporter, SpanKind, configure_tracing
+
+
+def _user_row(**values) -> RealDictRow:
+    row = RealDictRow()
+    row.update(
+        {
+            "id": 1,
+            "username": "TestTest",
+            "password": memoryview(b"hashed password"),
+            "role_name": "user",
+            **values,
+        },
+    )
+    return row
+
+
+@pytest.mark.parametrize("trusted_rows", [True, False])
+def test_converter_matches_validation(trusted_rows):
+    row = _user_row()
+    expected = User.parse_obj({**row, "password": b"hashed password"})
+
+    user = compile_converter(User, trusted_rows=trusted_rows)(row)
+
+    assert user == expected
+    assert user.password.get_secret_value() == b"hashed password"
+    assert user.role_name == "user"
+
+
+def test_list_converter():
+    rows = [_user_row(id=1), _user_row(id=2)]
+    users = compile_converter(List[User])(rows)
+    assert [user.id for user in users] == [1, 2]
+
+
+def test_float_field_is_coerced():
+    row = RealDictRow()
+    row.update(
+        {
+            "id": 1,
+            "user_id": 1,
+            "refresh_token": memoryview(bytes(32)),
+            "fingerprint": "fingerprint",
+            "expiresat": 60,
+        },
+    )
+    token = compile_converter(JWTToken)(row)
+    assert token == JWTToken.parse_obj({**row, "refresh_token": bytes(32)})
+    assert isinstance(token.expiresat, float)
+
+
+def test_row_without_required_field_is_rejected():
+    row = _user_row()
+    del row["id"]
+
+    with pytest.raises(pydantic.ValidationError):
+        compile_converter(User, trusted_rows=True)(row)
+
+
+async def test_empty_response():
+    @collect_response
+    async def read_all() -> List[User]:
+        return []
+
+    @collect_response(nullable=True)
+    async def read_nullable() -> User:
+        return None
+
+    @collect_response
+    async def read() -> User:
+        return None
+
+    assert await read_all() == []
+    assert await read_nullable() is None
+    with pytest.raises(EmptyResult):
+        await read()
+
+
+
+class _MetricsRepository:
+    @collect_response
+    async def read_all(self) -> List[User]:
+        return [_user_row(id=1), _user_row(id=2)]
+
+
+async def test_latency_and_rows_are_observed():
+    labels = {"repository": "_MetricsRepository", "method": "read_all"}
+    await _MetricsRepository().read_all()
+
+    assert REGISTRY.get_sample_value("repository_query_seconds_count", labels) == 1
+    assert REGISTRY.get_sample_value("repository_query_rows_sum", labels) == 2
+
+
+async def test_call_runs_in_client_span():
+    exporter = InMemoryExporter()
+    configure_tracing(exporter)
+    try:
+        await _MetricsRepository().read_all()
+    finally:
+        configure_tracing(None)
+
+    (span,) = exporter.spans
+    assert span.name == "_MetricsRepository.read_all"
+    assert span.kind == SpanKind.CLIENT
+    assert span.attributes["db.rows"] == 2
+
+
+class _StreamRepository:
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.closed = False
+
+    @collect_stream
+    async def stream_all(self):
+        try:
+            for n in range(1, 4):
+                if n == self.fail_after:
+                    raise psycopg2.OperationalError("connection lost")
+                yield compile_converter(User)(_user_row(id=n))
+        finally:
+            self.closed = True
+
+
+async def test_stream_is_observed_and_traced():
+    labels = {"repository": "_StreamRepository", "method": "stream_all"}
+    before = REGISTRY.get_sample_value("repository_query_rows_sum", labels) or 0
+    exporter = InMemoryExporter()
+    configure_tracing(exporter)
+    try:
+        users = [user.id async for user in _StreamRepository().stream_all()]
+    finally:
+        configure_tracing(None)
+
+    assert users == [1, 2, 3]
+    assert REGISTRY.get_sample_value("repository_query_rows_sum", labels) == before + 3
+    (span,) = exporter.spans
+    assert span.kind == SpanKind.CLIENT
+    assert span.attributes["db.rows"] == 3
+
+
+async def test_stream_ends_on_database_error():
+    users = [user.id async for user in _StreamRepository(fail_after=3).stream_all()]
+
+    assert users == [1, 2]
+
+
+async def test_stream_is_closed_when_consumer_stops():
+    repository = _StreamRepository()
+    stream = repository.stream_all()
+    await stream.__anext__()
+    await stream.aclose()
+
+    assert repository.closed
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.internal.repository.postgresql import UserRepository
+from app.internal.repository.postgresql.invalidation import InvalidationBus
+from app.pkg import models
+
+
+async def _wait_for(messages, count):
+    for _ in range(100):
+        if len(messages) >= count:
+            return
+        await asyncio.sleep(0.05)
+
+
+async def test_user_changes_are_received():
+    bus = InvalidationBus()
+    received = []
+    bus.subscribe("user", received.append)
+    bus.start()
+    await asyncio.sleep(0.2)
+
+    repository = UserRepository()
+    user = await repository.create(
+        cmd=models.CreateUserCommand(
+            username="invalidation_test",
+            password=b"password",
+            role_name="user",
+        ),
+    )
+    try:
+        await repository.update(
+            cmd=models.UpdateUserCommand(
+                id=user.id,
+                username="invalidation_test_renamed",
+                password=b"password",
+                role_name="user",
+            ),
+        )
+    finally:
+        await repository.delete(cmd=models.DeleteUserCommand(id=user.id))
+
+    await _wait_for(received, 2)
+    await bus.stop()
+
+    assert received == [
+        [str(user.id), "invalidation_test_renamed", "invalidation_test"],
+        [str(user.id), "invalidation_test_renamed"],
+    ]
+
+
+def test_malformed_message_is_ignored():
+    bus = InvalidationBus(postgresql=None)
+    received = []
+    bus.subscribe("user", received.append)
+
+    bus.dispatch("not json")
+    bus.dispatch('{"topic": "user"}')
+    bus.reset()
+
+    assert received == [None]
@@ -0,0 +1,138 @@
+"""Every repository query must be served by an index.
+
+Queries are run inside one rolled back transaction with sequential scans
+disabled, so planner falls back to a ``Seq Scan`` only when no index matches
+the query shape.
+"""
+
+import pytest
+
+from app.internal.repository.postgresql import (
+    AccessTokenRepository,
+    RefreshTokenRepository,
+    UserRepository,
+)
+from app.internal.repository.postgresql.connection import (
+    _transaction_cursor,
+    transaction,
+)
+from app.pkg import models
+from app.pkg.models.access_token import AccessToken
+from app.pkg.models.refresh_token import (
+    CreateSessionCommand,
+    DeleteJWTTokenCommand,
+    ReadJWTTokenQuery,
+    ReadJWTTokenQueryByFingerprint,
+    UpdateJWTTokenCommand,
+)
+
+_EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+
+class _ExplainingCursor:
+    """Cursor which stores plan of every statement before executing it."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.plans = {}
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    async def execute(self, operation, parameters=None):
+        if operation.lstrip().lower().startswith(_EXPLAINABLE):
+            await self._cursor.execute(f"explain {operation}", parameters)
+            rows = await self._cursor.fetchall()
+            self.plans[operation] = "\n".join(row["QUERY PLAN"] for row in rows)
+        return await self._cursor.execute(operation, parameters)
+
+
+class _Rollback(Exception):
+    pass
+
+
+async def test_repository_queries_use_indexes():
+    users = UserRepository()
+    refresh_tokens = RefreshTokenRepository()
+    access_tokens = AccessTokenRepository()
+
+    # Roles are read once as a whole table, see ``RoleCache``.
+    await users.role_cache.load()
+
+    with pytest.raises(_Rollback):
+        async with transaction() as cursor:
+            await cursor.execute("set local enable_seqscan = off;")
+            explaining = _ExplainingCursor(cursor)
+            token = _transaction_cursor.set(explaining)
+            try:
+                user = await users.create(
+                    cmd=models.CreateUserCommand(
+                        username="query_plans_test",
+                        password=b"password",
+                        role_name="user",
+                    ),
+                )
+                await users.read(query=models.ReadUserByIdQuery(id=user.id))
+                await users.read_by_username(
+                    query=models.ReadUserByUserNameQuery(username=user.username),
+                )
+                await users.read_page(query=models.ReadUsersPageQuery(after_id=0, limit=10))
+                await users.update(
+                    cmd=models.UpdateUserCommand(
+                        id=user.id,
+                        username=user.username,
+                        password=b"password",
+                        role_name="user",
+                    ),
+                )
+
+                session = await refresh_tokens.create_session(
+                    cmd=CreateSessionCommand(
+                        user_id=user.id,
+                        refresh_token="refresh",
+                        fingerprint="fingerprint",
+                        access_token="access",
+                    ),
+                )
+                await refresh_tokens.read(
+                    query=ReadJWTTokenQuery(user_id=user.id, refresh_token="refresh"),
+                )
+                await refresh_tokens.read_by_fingerprint(
+                    query=ReadJWTTokenQueryByFingerprint(
+                        user_id=user.id,
+                        fingerprint="fingerprint",
+                    ),
+                )
+                await refresh_tokens.update(
+                    cmd=UpdateJWTTokenCommand(
+                        user_id=user.id,
+                        refresh_token="refresh-2",
+                        fingerprint="fingerprint",
+                    ),
+                )
+
+                access = AccessToken(refresh_id=session.id, access_token="access-2")
+                await access_tokens.update(cmd=access)
+                await access_tokens.read(query=access)
+                await access_tokens.delete(cmd=access)
+                await access_tokens.create(cmd=access)
+
+                await refresh_tokens.delete(
+                    cmd=DeleteJWTTokenCommand(
+                        user_id=user.id,
+                        fingerprint="fingerprint",
+                        refresh_token="refresh-2",
+                    ),
+                )
+                await users.delete(cmd=models.DeleteUserCommand(id=user.id))
+
+                await refresh_tokens.delete_expired(batch_size=10)
+                await refresh_tokens.ensure_partitions(weeks_ahead=1)
+                await refresh_tokens.drop_expired_partitions()
+            finally:
+                _transaction_cursor.reset(token)
+            raise _Rollback
+
+    assert explaining.plans
+    sequential = {q: plan for q, plan in explaining.plans.items() if "Seq Scan" in plan}
+    assert not sequential, sequential
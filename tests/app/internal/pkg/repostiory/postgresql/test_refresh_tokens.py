@@ -0,0 +1,172 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.internal.repository.postgresql import RefreshTokenRepository, UserRepository
+from app.internal.repository.postgresql.connection import get_connection
+from app.pkg import models
+from app.pkg.models.refresh_token import CreateSessionCommand
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """One loop for the module, the pool of connector is bound to it."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture()
+async def user():
+    users = UserRepository()
+    await users.role_cache.load()
+    user = await users.create(
+        cmd=models.CreateUserCommand(
+            username="refresh_tokens_test",
+            password=b"password",
+            role_name="user",
+        ),
+    )
+    yield user
+    await users.delete(cmd=models.DeleteUserCommand(id=user.id))
+
+
+async def test_delete_expired(user):
+    refresh_tokens = RefreshTokenRepository()
+    for fingerprint in ("expired", "live"):
+        await refresh_tokens.create_session(
+            cmd=CreateSessionCommand(
+                user_id=user.id,
+                refresh_token=f"refresh-{fingerprint}",
+                fingerprint=fingerprint,
+                access_token=f"access-{fingerprint}",
+            ),
+        )
+    async with get_connection() as cur:
+        await cur.execute(
+            """
+                update refresh_tokens set expires_at = now() - interval '1 second'
+                where user_id = %(user_id)s and fingerprint = 'expired';
+            """,
+            {"user_id": user.id},
+        )
+
+    assert await refresh_tokens.delete_expired(batch_size=10) == 1
+
+    async with get_connection() as cur:
+        await cur.execute(
+            "select fingerprint from refresh_tokens where user_id = %(user_id)s;",
+            {"user_id": user.id},
+        )
+        assert [row["fingerprint"] for row in await cur.fetchall()] == ["live"]
+
+
+async def _partitions(cur, table: str) -> List[str]:
+    await cur.execute(
+        """
+            select relname from pg_inherits
+                join pg_class on pg_class.oid = pg_inherits.inhrelid
+            where inhparent = %(table)s::regclass and relname like '%%_p2001%%'
+            order by relname;
+        """,
+        {"table": table},
+    )
+    return [row["relname"] for row in await cur.fetchall()]
+
+
+@pytest.fixture()
+async def old_partitions():
+    """Weekly partitions of January 2001 and one partition named by hand."""
+    async with get_connection() as cur:
+        await cur.execute(
+            """
+                select create_token_partitions('2001-01-01', '2001-01-10');
+                create table refresh_tokens_manual partition of refresh_tokens
+                    for values from ('2000-01-01') to ('2000-02-01');
+            """,
+        )
+    yield
+    async with get_connection() as cur:
+        await cur.execute(
+            """
+                drop table if exists access_tokens_p20010101, access_tokens_p20010108;
+                drop table if exists refresh_tokens_p20010101, refresh_tokens_p20010108;
+                alter table refresh_tokens detach partition refresh_tokens_manual;
+                drop table refresh_tokens_manual;
+            """,
+        )
+
+
+async def test_create_and_drop_token_partitions(old_partitions):
+    refresh_tokens = RefreshTokenRepository(retention_days=3650)
+
+    async with get_connection() as cur:
+        assert await _partitions(cur, "refresh_tokens") == [
+            "refresh_tokens_p20010101",
+            "refresh_tokens_p20010108",
+        ]
+        assert await _partitions(cur, "access_tokens") == [
+            "access_tokens_p20010101",
+            "access_tokens_p20010108",
+        ]
+
+    # Name of refresh_tokens_manual is not parsed as a week.
+    assert await refresh_tokens.drop_expired_partitions() == 0
+
+    async with get_connection() as cur:
+        assert await _partitions(cur, "refresh_tokens") == []
+        assert await _partitions(cur, "access_tokens") == []
+        await cur.execute("select to_regclass('refresh_tokens_manual') as name;")
+        assert (await cur.fetchone())["name"] == "refresh_tokens_manual"
+
+
+async def test_busy_partition_is_skipped(old_partitions):
+    drop = "select drop_expired_token_partitions('3650 days', '50 milliseconds');"
+
+    async with get_connection() as reader:
+        await reader.execute("begin;")
+        await reader.execute("select count(*) from refresh_tokens_p20010101;")
+        try:
+            async with get_connection() as cur:
+                await cur.execute(drop)
+                assert await _partitions(cur, "refresh_tokens") == [
+                    "refresh_tokens_p20010101",
+                ]
+        finally:
+            await reader.execute("rollback;")
+
+    async with get_connection() as cur:
+        await cur.execute(drop)
+        assert await _partitions(cur, "refresh_tokens") == []
+
+
+async def test_drop_is_skipped_while_partitions_are_maintained(old_partitions):
+    refresh_tokens = RefreshTokenRepository(retention_days=3650)
+
+    async with get_connection() as other:
+        await other.execute("begin;")
+        await other.execute(
+            "select pg_advisory_xact_lock(hashtext('token_partitions'));",
+        )
+        try:
+            assert await refresh_tokens.drop_expired_partitions() == 0
+            async with get_connection() as cur:
+                assert len(await _partitions(cur, "refresh_tokens")) == 2
+        finally:
+            await other.execute("rollback;")
+
+    await refresh_tokens.drop_expired_partitions()
+    async with get_connection() as cur:
+        assert await _partitions(cur, "refresh_tokens") == []
+
+
+async def test_reaper_lock_is_held_by_one_worker():
+    refresh_tokens = RefreshTokenRepository()
+
+    async with refresh_tokens.reaper_lock() as first:
+        async with refresh_tokens.reaper_lock() as second:
+            assert (first, second) == (True, False)
+
+    async with refresh_tokens.reaper_lock() as again:
+        assert again
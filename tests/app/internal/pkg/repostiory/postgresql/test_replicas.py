@@ -0,0 +1,114 @@
+import asyncio
+
+import psycopg2
+import pytest
+
+from app.internal.repository.postgresql.connection import get_connection
+from app.pkg.connectors.postgresql import Postgresql
+from app.pkg.settings import settings
+
+
+def make_connector() -> Postgresql:
+    """Primary by name and replica by address of the same local server."""
+    return Postgresql(
+        username=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host="localhost",
+        port=settings.POSTGRES_PORT,
+        database_name=settings.POSTGRES_DATABASE_NAME,
+        replicas=["127.0.0.1"],
+        sticky_primary_ms=60000,
+    )
+
+
+async def test_reads_go_to_replica():
+    postgresql = make_connector()
+    try:
+        async with postgresql.get_connect(read_only=True) as connection:
+            assert "host=127.0.0.1" in connection.dsn
+        async with postgresql.get_connect() as connection:
+            assert "host=localhost" in connection.dsn
+    finally:
+        await postgresql.close_pool()
+
+
+async def test_reads_stick_to_primary_after_write():
+    postgresql = make_connector()
+    try:
+        async with get_connection(read_only=True, postgresql=postgresql) as cur:
+            assert "host=127.0.0.1" in cur.connection.dsn
+        async with get_connection(postgresql=postgresql) as cur:
+            await cur.execute("select 1")
+        async with get_connection(read_only=True, postgresql=postgresql) as cur:
+            assert "host=localhost" in cur.connection.dsn
+    finally:
+        await postgresql.close_pool()
+
+
+class _Proxy:
+    """TCP proxy to the local server, which plays a replica that can die."""
+
+    def __init__(self):
+        self.server = None
+        self.writers = []
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.__handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def kill(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        for writer in self.writers:
+            writer.transport.abort()
+
+    async def __handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(
+            "localhost",
+            settings.POSTGRES_PORT,
+        )
+        self.writers += [client_writer, server_writer]
+        await asyncio.gather(
+            self.__pipe(client_reader, server_writer),
+            self.__pipe(server_reader, client_writer),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    async def __pipe(reader, writer):
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+
+@pytest.mark.parametrize("replica_backoff", [60, 0])
+async def test_reads_fall_back_to_primary_when_replica_dies(replica_backoff):
+    proxy = _Proxy()
+    replica = f"127.0.0.1:{await proxy.start()}"
+    postgresql = Postgresql(
+        username=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host="localhost",
+        port=settings.POSTGRES_PORT,
+        database_name=settings.POSTGRES_DATABASE_NAME,
+        pool_acquire_timeout=5,
+        replicas=[replica],
+        replica_backoff=replica_backoff,
+    )
+    try:
+        async with postgresql.get_connect(read_only=True) as connection:
+            assert replica.replace(":", " port=") in connection.dsn
+        await proxy.kill()
+
+        # Pooled connection of the dead replica fails its query.
+        with pytest.raises(psycopg2.OperationalError):
+            async with postgresql.get_connect(read_only=True) as connection:
+                async with connection.cursor() as cur:
+                    await cur.execute("select 1")
+
+        # The replica is backing off, or, without backoff, can't connect.
+        async with postgresql.get_connect(read_only=True) as connection:
+            assert "host=localhost" in connection.dsn
+    finally:
+        await postgresql.close_pool()
@@ -0,0 +1,28 @@
+from app.internal.repository.postgresql.role_cache import RoleCache
+
+
+async def test_roles_are_loaded_once():
+    role_cache = RoleCache()
+
+    role_id = await role_cache.get_id("user")
+    assert await role_cache.get_name(role_id) == "user"
+    assert await role_cache.get_id(None) is None
+
+
+async def test_reload_on_miss(monkeypatch):
+    role_cache = RoleCache()
+    await role_cache.load()
+
+    loads = []
+    load = role_cache.load
+
+    async def counted_load():
+        loads.append(1)
+        await load()
+
+    monkeypatch.setattr(role_cache, "load", counted_load)
+
+    await role_cache.get_id("user")
+    assert loads == []
+    assert await role_cache.get_id("unknown role") is None
+    assert loads == [1]
@@ -0,0 +1,35 @@
+import pytest
+
+from app.internal.repository.postgresql.connection import get_connection, transaction
+
+
+async def test_repositories_share_connection():
+    async with transaction() as tx_cursor:
+        async with get_connection() as cursor:
+            assert cursor is tx_cursor
+
+
+async def test_commit():
+    async with transaction():
+        async with get_connection() as cursor:
+            await cursor.execute("create temporary table tx_test(id int)")
+            await cursor.execute("insert into tx_test values (1)")
+        async with get_connection() as cursor:
+            await cursor.execute("select count(*) as count from tx_test")
+            assert (await cursor.fetchone())["count"] == 1
+
+
+async def test_rollback():
+    with pytest.raises(RuntimeError):
+        async with transaction():
+            async with get_connection() as cursor:
+                await cursor.execute(
+                    "insert into user_roles(role_name) values ('tx_rollback_test')",
+                )
+            raise RuntimeError
+
+    async with get_connection() as cursor:
+        await cursor.execute(
+            "select count(*) as count from user_roles where role_name = 'tx_rollback_test'",
+        )
+        assert (await cursor.fetchone())["count"] == 0
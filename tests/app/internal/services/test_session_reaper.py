@@ -0,0 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.internal.services.session_reaper import SessionReaper
+
+
+class _Repository:
+    def __init__(self, batches, dropped=0, locked=True):
+        self.batches = list(batches)
+        self.dropped = dropped
+        self.locked = locked
+        self.calls = []
+        self.drops = 0
+        self.weeks_ahead = None
+
+    @asynccontextmanager
+    async def reaper_lock(self):
+        yield self.locked
+
+    async def ensure_partitions(self, weeks_ahead: int) -> None:
+        self.weeks_ahead = weeks_ahead
+
+    async def drop_expired_partitions(self) -> int:
+        self.drops += 1
+        return self.dropped
+
+    async def delete_expired(self, batch_size: int) -> int:
+        self.calls.append(batch_size)
+        return self.batches.pop(0) if self.batches else 0
+
+
+async def test_reap_until_incomplete_batch():
+    repository = _Repository([2, 2, 1])
+    reaper = SessionReaper(
+        refresh_token_repository=repository,
+        batch_size=2,
+        batch_pause=0,
+    )
+
+    assert await reaper.reap() == 5
+    assert repository.calls == [2, 2, 2]
+
+
+async def test_reap_stops_after_max_batches():
+    repository = _Repository([2, 2, 2, 2])
+    reaper = SessionReaper(
+        refresh_token_repository=repository,
+        batch_size=2,
+        batch_pause=0,
+        max_batches=2,
+    )
+
+    assert await reaper.reap() == 4
+    assert repository.calls == [2, 2]
+
+
+async def test_reap_pauses_between_batches(monkeypatch):
+    pauses = []
+
+    async def sleep(delay):
+        pauses.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    repository = _Repository([2, 2, 1])
+    reaper = SessionReaper(
+        refresh_token_repository=repository,
+        batch_size=2,
+        batch_pause=0.5,
+    )
+
+    await reaper.reap()
+
+    assert pauses == [0.5, 0.5]
+
+
+async def test_reap_is_skipped_while_other_worker_reaps():
+    repository = _Repository([2], dropped=10, locked=False)
+    reaper = SessionReaper(refresh_token_repository=repository, batch_size=2)
+
+    assert await reaper.reap() == 0
+    assert repository.drops == 0
+    assert repository.calls == []
+
+
+async def test_reap_drops_partitions_without_batches():
+    repository = _Repository([2], dropped=10)
+    reaper = SessionReaper(
+        refresh_token_repository=repository,
+        batch_size=0,
+        partitions_ahead=2,
+    )
+
+    assert await reaper.reap() == 10
+    assert repository.weeks_ahead == 2
+    assert repository.calls == []
+
+
+async def test_start_and_stop():
+    repository = _Repository([1])
+    reaper = SessionReaper(refresh_token_repository=repository, interval=60)
+
+    reaper.start()
+    await asyncio.sleep(0.01)
+    await reaper.stop()
+
+    assert repository.calls == [500]
+
+
+async def test_disabled_reaper_still_creates_partitions():
+    repository = _Repository([1])
+    reaper = SessionReaper(
+        refresh_token_repository=repository,
+        interval=60,
+        partitions_ahead=3,
+        enabled=False,
+    )
+
+    reaper.start()
+    await asyncio.sleep(0.01)
+    await reaper.stop()
+
+    assert repository.weeks_ahead == 3
+    assert repository.drops == 0
+    assert repository.calls == []
@@ -0,0 +1,32 @@
+import time
+
+from app.pkg.cache import LocalCache
+
+
+def test_least_recently_used_is_evicted():
+    cache = LocalCache(maxsize=2, ttl=60)
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+    cache.set("third", 3)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+    assert cache.get("third") == 3
+
+
+def test_expired_value_is_dropped(monkeypatch):
+    cache = LocalCache(maxsize=2, ttl=60)
+    cache.set("key", 1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_zero_size_keeps_nothing():
+    cache = LocalCache(maxsize=0, ttl=60)
+    cache.set("key", 1)
+
+    assert cache.get("key") is None
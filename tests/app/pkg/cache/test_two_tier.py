@@ -0,0 +1,53 @@
+from aiocache import SimpleMemoryCache
+from aiocache.serializers import StringSerializer
+
+from app.pkg.cache import LocalCache, TwoTierCache
+
+
+def make_cache(remote=None) -> TwoTierCache:
+    return TwoTierCache(
+        name="test",
+        local=LocalCache(maxsize=10, ttl=60),
+        remote=remote,
+        encode=str,
+        decode=int,
+    )
+
+
+async def test_remote_tier_is_shared():
+    remote = SimpleMemoryCache(serializer=StringSerializer())
+    first, second = make_cache(remote), make_cache(remote)
+
+    await first.set("key", 1)
+
+    assert await remote.get("test:key") == "1"
+    assert await second.get("key") == 1
+    assert second.local.get("key") == 1
+
+
+async def test_delete_evicts_both_tiers():
+    remote = SimpleMemoryCache(serializer=StringSerializer())
+    first, second = make_cache(remote), make_cache(remote)
+    await first.set("key", 1)
+    await second.get("key")
+
+    await first.delete("key")
+    second.evict_local("key")
+
+    assert await first.get("key") is None
+    assert await second.get("key") is None
+
+
+async def test_failing_remote_is_a_miss():
+    class FailingCache(SimpleMemoryCache):
+        async def get(self, *args, **kwargs):
+            raise ConnectionError
+
+        async def set(self, *args, **kwargs):
+            raise ConnectionError
+
+    cache = make_cache(FailingCache())
+    await cache.set("key", 1)
+    cache.evict_local("key")
+
+    assert await cache.get("key") is None
@@ -0,0 +1,26 @@
+import time
+
+from app.pkg.connectors.circuit_breaker import CircuitBreaker
+
+
+def test_half_open_lets_one_trial_through(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_zero_threshold_never_opens():
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+
+    assert breaker.allow()
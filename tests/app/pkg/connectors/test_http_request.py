@@ -0,0 +1,146 @@
+import asyncio
+
+import pydantic
+import pytest
+
+from app.pkg.connectors.http_request import HttpRequests
+from app.pkg.models.exceptions.client import ClientException
+
+
+class StubServer:
+    """HTTP/1.1 server which answers with queued statuses, 200 when empty."""
+
+    def __init__(self):
+        self.statuses = []
+        self.delay = 0.0
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+        self.handlers = set()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+        for handler in self.handlers:
+            handler.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.handlers.add(asyncio.current_task())
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                status = self.statuses.pop(0) if self.statuses else 200
+                writer.write(
+                    b"HTTP/1.1 %d Stub\r\nContent-Length: 2\r\n\r\nok" % status,
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def make_client(url: str, **kwargs) -> HttpRequests:
+    return HttpRequests(
+        x_token=pydantic.SecretStr("token"),
+        url=url,
+        client_name="stub",
+        backoff=0,
+        **kwargs,
+    )
+
+
+async def test_connection_is_reused():
+    async with StubServer() as server:
+        client = make_client(server.url)
+        for _ in range(5):
+            response = await client.do_request("GET", "ping")
+            assert response.text == "ok"
+        await client.close()
+
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+async def test_idempotent_request_is_retried():
+    async with StubServer() as server:
+        server.statuses = [503, 502]
+        client = make_client(server.url, retries=2)
+        response = await client.do_request("GET", "ping")
+        await client.close()
+
+    assert response.status_code == 200
+    assert server.requests == 3
+
+
+async def test_post_is_not_retried():
+    async with StubServer() as server:
+        server.statuses = [503]
+        client = make_client(server.url, retries=2)
+        with pytest.raises(ClientException):
+            await client.do_request("POST", "ping")
+        await client.close()
+
+    assert server.requests == 1
+
+
+async def test_open_circuit_rejects_requests():
+    async with StubServer() as server:
+        server.statuses = [503, 503]
+        client = make_client(server.url, retries=0, failure_threshold=2)
+        for _ in range(3):
+            with pytest.raises(ClientException):
+                await client.do_request("GET", "ping")
+        await client.close()
+
+    assert server.requests == 2
+    assert client.circuit_breaker.state == "open"
+
+
+async def test_cancelled_trial_does_not_block_circuit():
+    async with StubServer() as server:
+        server.statuses = [503]
+        client = make_client(
+            server.url, retries=0, failure_threshold=1, reset_timeout=0.05,
+        )
+        with pytest.raises(ClientException):
+            await client.do_request("GET", "ping")
+
+        await asyncio.sleep(0.06)
+        server.delay = 0.2
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.do_request("GET", "ping"), 0.05)
+        assert client.circuit_breaker.state == "open"
+
+        await asyncio.sleep(0.06)
+        server.delay = 0
+        response = await client.do_request("GET", "ping")
+        await client.close()
+
+    assert response.status_code == 200
+    assert client.circuit_breaker.state == "closed"
+
+
+async def test_close_all_closes_every_client():
+    async with StubServer() as server:
+        clients = [make_client(server.url) for _ in range(2)]
+        pools = []
+        for client in clients:
+            await client.do_request("GET", "ping")
+            pools.append(client.get_client())
+
+        await HttpRequests.close_all()
+
+    assert all(pool.is_closed for pool in pools)
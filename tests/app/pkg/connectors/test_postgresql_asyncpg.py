@@ -0,0 +1,42 @@
+from app.pkg.connectors.postgresql_asyncpg import AsyncpgCursor, convert_query
+
+
+class _Connection:
+    def __init__(self, records=(), status="SELECT 0"):
+        self.records = list(records)
+        self.status = status
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append(("fetch", query, args))
+        return self.records
+
+    async def execute(self, query, *args):
+        self.calls.append(("execute", query, args))
+        return self.status
+
+
+def test_convert_query():
+    assert convert_query("select %(id)s, %(name)s, %(id)s, '100%%'") == (
+        "select $1, $2, $1, '100%'",
+        ("id", "name"),
+    )
+
+
+async def test_rows_are_dicts():
+    connection = _Connection(records=[{"id": 1}, {"id": 2}])
+    async with AsyncpgCursor(connection) as cur:
+        await cur.execute("select id from users where id > %(id)s", {"id": 0, "x": 1})
+        assert await cur.fetchone() == {"id": 1}
+        assert await cur.fetchall() == [{"id": 2}]
+
+    assert connection.calls == [("fetch", "select id from users where id > $1", (0,))]
+
+
+async def test_rowcount_of_write_without_returning():
+    connection = _Connection(status="DELETE 3")
+    cur = AsyncpgCursor(connection)
+    await cur.execute("delete from refresh_tokens where id = %(id)s", {"id": 1})
+
+    assert cur.rowcount == 3
+    assert connection.calls[0][0] == "execute"
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from app.pkg.jwt import JwtAccessBearer, WrongToken
+from app.pkg.jwt.cache import VerifiedTokenCache, token_digest
+
+
+def test_hit_and_miss():
+    cache = VerifiedTokenCache(maxsize=2, name="test")
+    payload = {"exp": time.time() + 60, "subject": {"user_id": 1}}
+
+    assert cache.get("token") is None
+    cache.set("token", payload)
+    assert cache.get("token") is payload
+
+
+def test_expired_token_is_evicted():
+    cache = VerifiedTokenCache(maxsize=2, name="test")
+    cache.set("token", {"exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = VerifiedTokenCache(maxsize=2, name="test")
+    exp = time.time() + 60
+    cache.set("first", {"exp": exp})
+    cache.set("second", {"exp": exp})
+    cache.get("first")
+    cache.set("third", {"exp": exp})
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+
+def test_evict_by_digest():
+    cache = VerifiedTokenCache(maxsize=2, name="test")
+    cache.set("token", {"exp": time.time() + 60})
+    cache.evict(token_digest("token"))
+
+    assert cache.get("token") is None
+
+
+def test_copy_shares_cache_only_with_the_same_key():
+    cache = VerifiedTokenCache(maxsize=2, name="test")
+    security = JwtAccessBearer(secret_key="secret", verified_cache=cache)
+    token = security.codec.encode({"exp": int(time.time()) + 60, "csrf": "x"})
+
+    JwtAccessBearer.from_other(security)._decode(token)
+    assert cache.get(token) is not None
+
+    rekeyed = JwtAccessBearer.from_other(security, secret_key="other")
+    assert rekeyed.verified_cache is None
+    with pytest.raises(WrongToken):
+        rekeyed._decode(token)
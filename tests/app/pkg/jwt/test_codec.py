@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from app.pkg.jwt.codec import (
+    CodecError,
+    CodecExpiredError,
+    CompactHmacCodec,
+    JoseCodec,
+)
+
+SECRET = "test-secret"
+
+
+@pytest.mark.parametrize(
+    ("encoder", "decoder"),
+    [
+        (CompactHmacCodec(SECRET), JoseCodec(SECRET)),
+        (JoseCodec(SECRET), CompactHmacCodec(SECRET)),
+    ],
+)
+def test_tokens_are_compatible(encoder, decoder):
+    claims = {"subject": {"user_id": 1}, "exp": int(time.time()) + 60, "csrf": "x"}
+
+    assert decoder.decode(encoder.encode(claims)) == claims
+
+
+@pytest.mark.parametrize("codec", [CompactHmacCodec(SECRET), JoseCodec(SECRET)])
+def test_expired(codec):
+    token = codec.encode({"exp": int(time.time()) - 60})
+
+    with pytest.raises(CodecExpiredError):
+        codec.decode(token, leeway=10)
+    assert codec.decode(token, leeway=120)
+
+
+@pytest.mark.parametrize("codec", [CompactHmacCodec(SECRET), JoseCodec(SECRET)])
+def test_wrong_signature(codec):
+    token = CompactHmacCodec("other-secret").encode({"exp": int(time.time()) + 60})
+
+    with pytest.raises(CodecError):
+        codec.decode(token)
+
+
+@pytest.mark.parametrize("token", ["", "a.b", "a.b.c", "...."])
+def test_malformed(token):
+    with pytest.raises(CodecError):
+        CompactHmacCodec(SECRET).decode(token)
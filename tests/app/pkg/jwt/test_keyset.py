@@ -0,0 +1,76 @@
+import json
+import os
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from app.pkg.jwt.codec import AsymmetricCodec, CodecError, KeySet
+
+
+def _write_private_key(path, key):
+    path.write_bytes(
+        key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ),
+    )
+
+
+def _write_public_key(path, key):
+    path.write_bytes(
+        key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("key", "algorithm"),
+    [
+        (ec.generate_private_key(ec.SECP256R1()), "ES256"),
+        (ed25519.Ed25519PrivateKey.generate(), "EdDSA"),
+    ],
+)
+def test_sign_and_verify(tmp_path, key, algorithm):
+    _write_private_key(tmp_path / "2026-10-01.pem", key)
+    codec = AsymmetricCodec(KeySet(keys_dir=tmp_path))
+    claims = {"subject": {"user_id": 1}, "exp": int(time.time()) + 60}
+
+    assert codec.algorithm == algorithm
+    assert codec.decode(codec.encode(claims)) == claims
+
+
+def test_rotation_keeps_old_tokens_valid(tmp_path):
+    old_key = ec.generate_private_key(ec.SECP256R1())
+    _write_private_key(tmp_path / "2026-09-01.pem", old_key)
+    key_set = KeySet(keys_dir=tmp_path)
+    codec = AsymmetricCodec(key_set)
+    old_token = codec.encode({"exp": int(time.time()) + 60})
+
+    (tmp_path / "2026-09-01.pem").unlink()
+    _write_public_key(tmp_path / "2026-09-01.pub.pem", old_key)
+    _write_private_key(tmp_path / "2026-10-01.pem", ed25519.Ed25519PrivateKey.generate())
+    key_set.reload()
+
+    assert key_set.active.kid == "2026-10-01"
+    assert codec.decode(old_token)
+    assert sorted(jwk["kid"] for jwk in json.loads(key_set.jwks)["keys"]) == [
+        "2026-09-01",
+        "2026-10-01",
+    ]
+
+
+def test_unknown_kid(tmp_path):
+    _write_private_key(tmp_path / "first.pem", ed25519.Ed25519PrivateKey.generate())
+    token = AsymmetricCodec(KeySet(keys_dir=tmp_path)).encode({})
+
+    other = tmp_path / "other"
+    os.mkdir(other)
+    _write_private_key(other / "second.pem", ed25519.Ed25519PrivateKey.generate())
+
+    with pytest.raises(CodecError):
+        AsymmetricCodec(KeySet(keys_dir=other)).decode(token)
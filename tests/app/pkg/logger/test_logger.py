@@ -0,0 +1,48 @@
+import json
+import logging
+import queue
+
+from app.pkg.logger import JsonFormatter, get_logger
+from app.pkg.logger.logger import _BoundedQueueHandler
+
+
+def test_handlers_are_not_multiplied():
+    logger = get_logger("test_logger")
+    get_logger("test_logger")
+
+    assert len(logger.handlers) == 1
+    assert logger.handlers[0] is get_logger("other_test_logger").handlers[0]
+
+
+def test_record_is_dropped_when_queue_is_full():
+    records = queue.Queue(maxsize=1)
+    handler = _BoundedQueueHandler(records)
+    logger = logging.getLogger("test_logger.bounded")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    logger.warning("first %s", "record")
+    logger.warning("second")
+
+    assert records.qsize() == 1
+    record = records.get_nowait()
+    assert record.msg == "first record" and record.args is None
+
+
+def test_json_formatter_keeps_extra_and_exception():
+    records = queue.Queue()
+    logger = logging.getLogger("test_logger.json")
+    logger.propagate = False
+    logger.addHandler(_BoundedQueueHandler(records))
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed for %s", "admin", extra={"user_id": 1})
+
+    document = json.loads(JsonFormatter().format(records.get_nowait()))
+
+    assert document["message"] == "failed for admin"
+    assert document["level"] == "ERROR"
+    assert document["user_id"] == 1
+    assert "ValueError: boom" in document["exception"]
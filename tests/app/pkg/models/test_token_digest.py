@@ -0,0 +1,32 @@
+import hashlib
+import json
+
+from app.pkg.models.refresh_token import JWTToken
+from app.pkg.models.types import TokenDigest
+
+# Digest which is not valid UTF-8.
+DIGEST = hashlib.sha256(b"token").digest()
+
+
+def _token() -> JWTToken:
+    return JWTToken(
+        id=1,
+        user_id=1,
+        refresh_token=memoryview(DIGEST),
+        fingerprint="fingerprint",
+    )
+
+
+def test_digest_is_serialized_as_hex():
+    token = _token()
+
+    assert isinstance(token.refresh_token, TokenDigest)
+    assert token.to_dict(show_secrets=True)["refresh_token"] == DIGEST
+    assert json.loads(token.json())["refresh_token"] == DIGEST.hex()
+    assert str(token.refresh_token) == DIGEST.hex()
+
+
+def test_digest_is_parsed_from_hex():
+    token = JWTToken.parse_raw(_token().json())
+
+    assert token.refresh_token == DIGEST
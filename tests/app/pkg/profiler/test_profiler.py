@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.pkg.models.exceptions.profiler import ProfilerBusy
+from app.pkg.profiler import Profiler, StackSampler, trace_allocations
+
+
+def _spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(100))
+
+
+def test_sampler_collapses_stacks_of_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="spinner")
+    worker.start()
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    try:
+        stop.wait(0.1)
+    finally:
+        sampler.stop()
+        stop.set()
+        worker.join()
+
+    lines = sampler.collapsed().splitlines()
+    spinner = next(line for line in lines if line.startswith("spinner;"))
+    stack, count = spinner.rsplit(" ", 1)
+
+    assert sampler.samples > 0
+    assert int(count) > 0
+    assert f"{__name__}:_spin" in stack.split(";")
+    assert not any(line.startswith("stack-sampler;") for line in lines)
+
+
+async def test_allocations_report_site_alive_after_window():
+    kept = []
+
+    async def allocate():
+        await asyncio.sleep(0.01)
+        kept.append(bytearray(1024 * 1024))
+
+    task = asyncio.create_task(allocate())
+    report = await trace_allocations(0.05, limit=5)
+    await task
+
+    assert report.startswith("# ")
+    assert __file__ in report.splitlines()[1]
+
+
+async def test_second_session_is_rejected():
+    profiler = Profiler()
+    session = asyncio.create_task(profiler.sample_stacks(0.05))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ProfilerBusy):
+        await profiler.trace_allocations(0.01)
+    await session
+    assert not profiler.running
@@ -0,0 +1,55 @@
+import contextvars
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from app.internal.pkg.middlewares.timing import TimedRoute, TimingMiddleware
+from app.pkg.timing import current_timings, measure, start_timings
+
+
+def test_measure_is_noop_outside_of_request():
+    def run():
+        with measure("db"):
+            pass
+        return current_timings()
+
+    assert contextvars.Context().run(run) is None
+
+
+def test_repeated_phase_is_summed():
+    def run():
+        timings = start_timings()
+        timings.add("db", 0.001)
+        timings.add("db", 0.002)
+        with measure("jwt"):
+            pass
+        return timings
+
+    timings = contextvars.Context().run(run)
+    phases = dict(timings.items())
+
+    assert phases["db"] == 0.003
+    assert set(phases) == {"db", "jwt"}
+    assert timings.server_timing().startswith("db;dur=3.000, jwt;dur=")
+    assert timings.server_timing().rsplit(", ", 1)[1].startswith("total;dur=")
+
+
+async def test_server_timing_header_has_phases_of_route():
+    router = APIRouter(prefix="/items", route_class=TimedRoute)
+
+    @router.get("/{item_id}")
+    async def read_item(item_id: int):
+        with measure("db"):
+            return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(TimingMiddleware, server_timing_header=True)
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/items/1")
+    header = response.headers["server-timing"]
+    phases = [item.split(";")[0] for item in header.split(", ")]
+
+    assert response.json() == {"id": 1}
+    assert phases == ["db", "serialize", "total"]
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+
+from app.pkg.tracing import (
+    InMemoryExporter,
+    OtlpJsonFileExporter,
+    SpanKind,
+    StatusCode,
+    configure_tracing,
+    parse_traceparent,
+    start_span,
+    traced,
+)
+
+
+@pytest.fixture()
+def exporter():
+    exporter = InMemoryExporter()
+    configure_tracing(exporter)
+    yield exporter
+    configure_tracing(None)
+
+
+@traced
+async def _child(delay: float) -> float:
+    await asyncio.sleep(delay)
+    return delay
+
+
+async def test_spans_of_awaited_calls_and_tasks_are_children(exporter):
+    with start_span("request", kind=SpanKind.SERVER) as root:
+        await asyncio.gather(_child(0), _child(0))
+
+    children = exporter.spans[:2]
+    assert exporter.spans[2] is root
+    assert root.parent_span_id is None
+    for child in children:
+        assert child.name == "_child"
+        assert child.trace_id == root.trace_id
+        assert child.parent_span_id == root.span_id
+    assert children[0].span_id != children[1].span_id
+
+
+async def test_exception_is_recorded(exporter):
+    @traced(name="failing")
+    async def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await failing()
+
+    (span,) = exporter.spans
+    assert span.name == "failing"
+    assert span.status_code == StatusCode.ERROR
+    assert span.attributes["exception.type"] == "ValueError"
+
+
+def test_remote_parent_is_used_for_root_span(exporter):
+    parent = ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+    with start_span("request", parent=parent):
+        pass
+
+    (span,) = exporter.spans
+    assert (span.trace_id, span.parent_span_id) == parent
+
+
+def test_disabled_tracing_records_nothing():
+    configure_tracing(None)
+    with start_span("request") as span:
+        span.set_attribute("db.rows", 1)
+    assert not hasattr(span, "trace_id")
+
+
+def test_traced_rejects_plain_functions():
+    with pytest.raises(TypeError):
+        traced(lambda: None)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        None,
+        "",
+        "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7",
+        "00-4bf92f3577b34da6a3ce929d0e0e473z-00f067aa0ba902b7-01",
+        "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+    ],
+)
+def test_malformed_traceparent_is_ignored(header):
+    assert parse_traceparent(header) is None
+
+
+def test_otlp_file_exporter_writes_traces_data(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    configure_tracing(OtlpJsonFileExporter(path=path, service_name="auth"))
+    try:
+        with start_span("request", kind=SpanKind.SERVER):
+            with start_span("query", kind=SpanKind.CLIENT) as query:
+                query.set_attribute("db.rows", 3)
+    finally:
+        configure_tracing(None)
+
+    spans = [
+        span
+        for line in path.read_text().splitlines()
+        for resource in json.loads(line)["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    ]
+    query, request = spans
+    assert query["parentSpanId"] == request["spanId"]
+    assert query["kind"] == SpanKind.CLIENT
+    assert query["attributes"] == [{"key": "db.rows", "value": {"intValue": "3"}}]
+    assert int(request["endTimeUnixNano"]) >= int(request["startTimeUnixNano"])